@@ -0,0 +1,84 @@
+"""Benchmark batch tailoring against N sequential /api/tailor-resume calls.
+
+Uses a fake chat model that sleeps for a random, latency-injected amount of
+time instead of calling Gemini, so it runs offline:
+
+    python -m benchmarks.batch_tailoring --jobs 20 --concurrency 4
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from resumegpt.app import create_app
+from resumegpt.services.llm_backends import FakeChatBackend
+from resumegpt.services.llm_client import LLMClientRegistry
+
+RESUME = {
+    "name": "Jane Doe",
+    "skills": ["Python", "Flask", "SQL"],
+    "experience": [
+        {"title": "Engineer", "company": "Acme", "description": "Built APIs"},
+        {"title": "Intern", "company": "Initech", "description": "Wrote tests"},
+    ],
+    "education": [
+        {"degree": "BS Computer Science", "school": "State University", "description": "Graduated 2020"}
+    ],
+}
+
+
+def run_sequential(client, postings):
+    for posting in postings:
+        client.post("/api/tailor-resume", json={"jobHtml": posting, "resumeData": RESUME})
+
+
+def run_batch(client, postings, concurrency):
+    response = client.post("/api/tailor-resume/batch", json={
+        "jobHtml": postings,
+        "resumeData": RESUME,
+        "concurrency": concurrency,
+    })
+    response.get_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.25, help="mean model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="latency standard deviation")
+    parser.add_argument("--tokens-per-sec", type=float, default=5000.0, help="fake model output speed")
+    args = parser.parse_args()
+
+    from resumegpt.config.config import Config
+    Config.BATCH_CONCURRENCY = max(Config.BATCH_CONCURRENCY, args.concurrency)
+    Config.BATCH_MAX_JOBS = max(Config.BATCH_MAX_JOBS, args.jobs)
+
+    postings = [f"<p>Posting {i}: Python developer</p>" for i in range(args.jobs)]
+    model = FakeChatBackend(latency=args.latency, latency_distribution="normal",
+                            jitter=args.jitter / args.latency, tokens_per_sec=args.tokens_per_sec)
+    app = create_app()
+    app.extensions["llm_clients"] = LLMClientRegistry(
+        max_connections=args.concurrency, factory=lambda name, temperature: model
+    )
+    app.extensions["result_cache"] = None
+    client = app.test_client()
+
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run_sequential(client, postings)
+        timings["sequential"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_batch(client, postings, args.concurrency)
+        timings["batch"] = time.perf_counter() - start
+
+    print(f"{args.jobs} postings, mean model latency {args.latency * 1000:.0f} ms, concurrency {args.concurrency}")
+    for name, seconds in timings.items():
+        print(f"  {name:<10} {seconds:7.2f} s  ({args.jobs / seconds:5.1f} postings/s)")
+    print(f"  speedup    {timings['sequential'] / timings['batch']:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
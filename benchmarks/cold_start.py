@@ -0,0 +1,97 @@
+"""Measure cold start of the WSGI app and guard its budget.
+
+Starts fresh interpreters that import ``wsgi`` and serve one request, and
+reports the slowest imports (``python -X importtime``), the time to the first
+response, and whether any of the ML or document stacks was imported. Exits
+non-zero if the median time to first request is over ``--budget`` seconds or a
+heavy module was loaded:
+
+    python -m benchmarks.cold_start --runs 5 --budget 2.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by the NLP helpers and document parsing, never to serve tailoring requests
+HEAVY_MODULES = ["torch", "transformers", "sklearn", "PyPDF2", "docx", "textract", "reportlab"]
+
+FIRST_REQUEST = """
+import json, sys, time
+start = time.perf_counter()
+import wsgi
+imported = time.perf_counter()
+response = wsgi.app.test_client().get('/api/stats')
+served = time.perf_counter()
+print(json.dumps({
+    'status': response.status_code,
+    'import_s': imported - start,
+    'first_request_s': served - start,
+    'heavy': [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_python(*args):
+    # The fake backend keeps the run offline and free of API keys
+    env = dict(os.environ, LLM_BACKEND="fake", LLM_WARMUP="false")
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def first_request():
+    start = time.perf_counter()
+    result = json.loads(run_python("-c", FIRST_REQUEST).stdout.strip().splitlines()[-1])
+    result["process_s"] = time.perf_counter() - start
+    return result
+
+
+def slowest_imports(top):
+    """``(self_us, cumulative_us, module)`` of the imports under ``import wsgi`` with most own time."""
+    rows = []
+    for line in run_python("-X", "importtime", "-c", "import wsgi").stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|")
+        rows.append((int(own), int(cumulative), module.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds to the first response")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    print(f"{'self ms':>9}{'cumulative ms':>15}  slowest imports under 'import wsgi'")
+    for own, cumulative, module in slowest_imports(args.top):
+        print(f"{own / 1000:>9.1f}{cumulative / 1000:>15.1f}  {module}")
+
+    runs = [first_request() for _ in range(args.runs)]
+    print(f"\n{'run':>3}{'import s':>10}{'first req s':>13}{'process s':>11}")
+    for i, run in enumerate(runs, 1):
+        print(f"{i:>3}{run['import_s']:>10.2f}{run['first_request_s']:>13.2f}{run['process_s']:>11.2f}")
+
+    median = statistics.median(run["first_request_s"] for run in runs)
+    heavy = sorted({name for run in runs for name in run["heavy"]})
+    print(f"\nmedian time to first request {median:.2f}s (budget {args.budget:.2f}s)")
+    failures = []
+    if median > args.budget:
+        failures.append(f"over budget by {median - args.budget:.2f}s")
+    if heavy:
+        failures.append("heavy modules imported: " + ", ".join(heavy))
+    if any(run["status"] != 200 for run in runs):
+        failures.append("first request failed")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
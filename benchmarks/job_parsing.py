@@ -0,0 +1,45 @@
+"""Benchmark the three JobPost.parse_job_post extraction modes.
+
+Runs serial (seven blocking calls), concurrent (the same seven calls through
+the async chat API) and structured (one structured-output call) against the
+fake LLM backend, whose latency grows with the tokens it writes:
+
+    python -m benchmarks.job_parsing --runs 3
+"""
+import argparse
+import time
+
+from resumegpt.models.job_post import JobPost
+from resumegpt.services.llm_backends import FakeChatBackend
+from resumegpt.services.prompt_compactor import estimate_tokens
+from resumegpt.utils.single_flight import SingleFlight
+
+POSTING = "<div><h2>Backend Engineer at Initech</h2>" + "".join(
+    f"<p>You will build Python service {i} on PostgreSQL and Docker with a collaborative team.</p>"
+    for i in range(40)
+) + "</div>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--base-latency", type=float, default=0.15, help="fixed seconds per call")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0, help="output tokens per second")
+    args = parser.parse_args()
+
+    print(f"Posting: {estimate_tokens(POSTING)} tokens, {args.runs} runs per mode")
+    print(f"{'mode':<12}{'calls':>7}{'in tokens':>11}{'out tokens':>12}{'wall ms':>10}")
+    for mode in ("serial", "concurrent", "structured"):
+        model = FakeChatBackend(latency=args.base_latency, latency_distribution="constant",
+                                tokens_per_sec=args.tokens_per_sec)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            JobPost(POSTING, llm=model, flights=SingleFlight()).parse_job_post(mode=mode)
+        elapsed = (time.perf_counter() - start) / args.runs
+        usage = model.usage()
+        print(f"{mode:<12}{usage['calls'] / args.runs:>7.0f}{usage['input_tokens'] / args.runs:>11.0f}"
+              f"{usage['output_tokens'] / args.runs:>12.0f}{elapsed * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
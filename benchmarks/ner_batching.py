@@ -0,0 +1,110 @@
+"""Benchmark batched NER in ``JobAnalyzer.extract_skills``.
+
+Compares one NER call per candidate sentence (the old behaviour) with the
+batched ``extract_skills`` on a long posting, counting model forward passes.
+The real CoNLL-03 checkpoint needs a download, so the NER pipeline is built
+from a randomly initialised BERT of the same architecture; timings depend on
+the model shape, not on the weights:
+
+    python -m benchmarks.ner_batching --sentences 200 --batch-size 16
+"""
+import argparse
+import os
+import tempfile
+import time
+from unittest import mock
+
+from resumegpt.config.config import Config
+from resumegpt.models.job_post import JobAnalyzer, TECHNICAL_ENTITY_LABELS, SOFT_ENTITY_LABELS, _entity_label
+
+LABELS = ["O", "B-MISC", "I-MISC", "B-PER", "I-PER", "B-ORG", "I-ORG", "B-LOC", "I-LOC"]
+
+SENTENCES = [
+    "Strong programming skills in Python, Go and TypeScript are required",
+    "You will own software services running on Kubernetes and AWS",
+    "Excellent communication skills with product and design partners",
+    "Experience with data technology such as Kafka, Spark and PostgreSQL",
+    "Leadership of small teams and mentoring junior engineers",
+    "We offer flexible hours, a home office budget and a yearly offsite",
+    "Technical depth in distributed systems and observability tooling",
+    "Good interpersonal skills and a calm attitude during incidents",
+]
+
+
+def make_posting(count):
+    return ". ".join(SENTENCES[i % len(SENTENCES)] for i in range(count)) + "."
+
+
+def make_pipeline(text, layers, hidden):
+    """Token classification pipeline with the CoNLL-03 labels and random weights."""
+    from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast, pipeline
+
+    words = sorted(set(text.replace(",", " , ").replace(".", " . ").split()))
+    vocab_dir = tempfile.mkdtemp()
+    vocab_file = os.path.join(vocab_dir, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+    config = BertConfig(
+        vocab_size=len(words) + 5, hidden_size=hidden, num_hidden_layers=layers,
+        num_attention_heads=hidden // 64, intermediate_size=hidden * 4, num_labels=len(LABELS),
+        id2label=dict(enumerate(LABELS)), label2id={label: i for i, label in enumerate(LABELS)},
+    )
+    model = BertForTokenClassification(config).eval()
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file, do_lower_case=False)
+    return pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy=Config.NER_AGGREGATION)
+
+
+def per_sentence(ner, text):
+    """The old extract_skills loop: one NER call per matching sentence."""
+    skills = {'technical': [], 'soft': []}
+    for sent in text.split('.'):
+        sent_lower = sent.lower()
+        if any(ind in sent_lower for ind in ['programming', 'software', 'technical', 'technology']):
+            skills['technical'].extend(e['word'].strip() for e in ner(sent)
+                                       if _entity_label(e) in TECHNICAL_ENTITY_LABELS)
+        elif any(ind in sent_lower for ind in ['communication', 'interpersonal', 'leadership']):
+            skills['soft'].extend(e['word'].strip() for e in ner(sent)
+                                  if _entity_label(e) in SOFT_ENTITY_LABELS)
+    return skills
+
+
+def measure(ner, fn, text):
+    passes = [0]
+    hook = ner.model.register_forward_hook(lambda *_: passes.__setitem__(0, passes[0] + 1))
+    try:
+        start = time.perf_counter()
+        skills = fn(text)
+        elapsed = time.perf_counter() - start
+    finally:
+        hook.remove()
+    return elapsed, passes[0], skills
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=Config.NER_BATCH_SIZE)
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--hidden", type=int, default=768)
+    args = parser.parse_args()
+
+    text = make_posting(args.sentences)
+    ner = make_pipeline(text, args.layers, args.hidden)
+    analyzer = JobAnalyzer(ner_pipeline=ner)
+    ner(SENTENCES[0])  # warm up
+
+    with mock.patch.object(Config, "NER_BATCH_SIZE", args.batch_size):
+        results = {
+            "per-sentence": measure(ner, lambda t: per_sentence(ner, t), text),
+            "batched": measure(ner, analyzer.extract_skills, text),
+        }
+
+    print(f"{'mode':<14}{'forward passes':>15}{'wall s':>9}")
+    for mode, (elapsed, passes, _) in results.items():
+        print(f"{mode:<14}{passes:>15}{elapsed:>9.2f}")
+    assert results["per-sentence"][2] == results["batched"][2], "batched skills differ"
+    print(f"speedup {results['per-sentence'][0] / results['batched'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare fp32 and int8 (dynamic quantization) CPU inference.
+
+For the MiniLM embedding model and the NER model, reports weight memory,
+throughput and parity with fp32: cosine drift of the embeddings and entity F1
+of the NER output. By default both models are randomly initialised with the
+real architectures so the script runs offline; memory and throughput are
+representative, but parity is only meaningful with ``--pretrained``, which
+loads the real checkpoints with the model registry's loaders:
+
+    python -m benchmarks.quantization --texts 256
+    python -m benchmarks.quantization --pretrained
+"""
+import argparse
+import os
+import tempfile
+import time
+import warnings
+
+from resumegpt.config.config import Config
+from resumegpt.utils.embeddings import mean_pooled
+from resumegpt.utils.model_cache import EMBEDDING_MODEL, load_ner_pipeline, load_transformer, model_bytes
+from resumegpt.utils.quantization import embedding_drift, entity_f1, quantize
+
+SENTENCES = [
+    "Acme Corp in Berlin is hiring a senior Python engineer to build data pipelines",
+    "You will work with Kubernetes, Kafka and PostgreSQL alongside the platform team",
+    "Jane Doe led the migration of billing services at Initech from Java to Go",
+    "Experience with AWS or Google Cloud and strong communication skills required",
+    "The role reports to the VP of Engineering in our London office",
+    "Built recommendation models in PyTorch that raised conversion by twelve percent",
+]
+
+LABELS = ["O", "B-MISC", "I-MISC", "B-PER", "I-PER", "B-ORG", "I-ORG", "B-LOC", "I-LOC"]
+
+
+def make_texts(count):
+    return [f"{SENTENCES[i % len(SENTENCES)]} ({i})" for i in range(count)]
+
+
+def random_tokenizer(texts):
+    """Word-level BERT tokenizer covering ``texts``."""
+    from transformers import BertTokenizerFast
+
+    spaced = (text.replace(",", " , ").replace("(", " ( ").replace(")", " ) ") for text in texts)
+    words = sorted({word for text in spaced for word in text.split()})
+    vocab_file = os.path.join(tempfile.mkdtemp(), "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+    return BertTokenizerFast(vocab_file=vocab_file, do_lower_case=False)
+
+
+def random_minilm(tokenizer):
+    """MiniLM-shaped encoder with random weights, as ``(tokenizer, model)``."""
+    from transformers import BertConfig, BertModel
+
+    model = BertModel(BertConfig(vocab_size=tokenizer.vocab_size, hidden_size=384, num_hidden_layers=6,
+                                 num_attention_heads=12, intermediate_size=1536)).eval()
+    return tokenizer, model
+
+
+def random_ner(tokenizer, layers, hidden):
+    """BERT token classification pipeline with the CoNLL-03 labels and random weights."""
+    from transformers import BertConfig, BertForTokenClassification, pipeline
+
+    model = BertForTokenClassification(BertConfig(
+        vocab_size=tokenizer.vocab_size, hidden_size=hidden, num_hidden_layers=layers,
+        num_attention_heads=hidden // 64, intermediate_size=hidden * 4, num_labels=len(LABELS),
+        id2label=dict(enumerate(LABELS)), label2id={label: i for i, label in enumerate(LABELS)},
+    )).eval()
+    return pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy=Config.NER_AGGREGATION)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--ner-layers", type=int, default=12)
+    parser.add_argument("--ner-hidden", type=int, default=768)
+    parser.add_argument("--pretrained", action="store_true", help="download and use the real checkpoints")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    texts = make_texts(args.texts)
+    if args.pretrained:
+        (tokenizer, minilm), ner = load_transformer(EMBEDDING_MODEL), load_ner_pipeline()
+    else:
+        tokenizer = random_tokenizer(texts)
+        (_, minilm), ner = random_minilm(tokenizer), random_ner(tokenizer, args.ner_layers, args.ner_hidden)
+
+    embed = lambda model: mean_pooled(tokenizer, model, texts, args.batch_size)
+    tag = lambda: ner(texts, batch_size=args.batch_size)
+    embed(minilm)  # warm up
+    tag()
+    fp32_embeddings, fp32_embed_s = timed(lambda: embed(minilm))
+    fp32_entities, fp32_tag_s = timed(tag)
+    fp32_sizes = model_bytes(minilm), model_bytes(ner)
+
+    int8_minilm = quantize(minilm)
+    quantize(ner)
+    int8_embeddings, int8_embed_s = timed(lambda: embed(int8_minilm))
+    int8_entities, int8_tag_s = timed(tag)
+
+    drift = embedding_drift(fp32_embeddings, int8_embeddings)
+    f1 = entity_f1(fp32_entities, int8_entities)
+    print(f"{'model':<8}{'mode':<6}{'MiB':>8}{'texts/s':>10}  parity vs fp32")
+    print(f"{'minilm':<8}{'fp32':<6}{fp32_sizes[0] / 2 ** 20:>8.1f}{len(texts) / fp32_embed_s:>10.1f}")
+    print(f"{'minilm':<8}{'int8':<6}{model_bytes(int8_minilm) / 2 ** 20:>8.1f}{len(texts) / int8_embed_s:>10.1f}"
+          f"  cosine mean {drift['mean_cosine']:.4f} min {drift['min_cosine']:.4f}")
+    print(f"{'ner':<8}{'fp32':<6}{fp32_sizes[1] / 2 ** 20:>8.1f}{len(texts) / fp32_tag_s:>10.1f}")
+    print(f"{'ner':<8}{'int8':<6}{model_bytes(ner) / 2 ** 20:>8.1f}{len(texts) / int8_tag_s:>10.1f}"
+          f"  entity F1 {f1['f1']:.3f} (P {f1['precision']:.3f} R {f1['recall']:.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure bulk ranking of many resumes against many jobs.
+
+Ranks ``--resumes`` resumes for each of ``--jobs`` postings with
+``ResumeScorer.rank``: section scores as matrix products over chunks of
+``--chunk-size`` jobs with top-k by partial selection, against the same
+scores computed for all jobs in one block and fully sorted. Reports wall
+time and peak memory traced by ``tracemalloc``.
+
+Embeddings come from a hashing stand-in for MiniLM (384 dimensions) and are
+computed before timing, so the numbers are for scoring and selection only.
+With the real model, embedding each corpus once dominates the first call,
+and the embedding store makes it a one-off cost:
+
+    python -m benchmarks.ranking --resumes 10000 --jobs 1000 --top-k 10
+"""
+import argparse
+import time
+import tracemalloc
+
+from unittest import mock
+
+import numpy as np
+
+from resumegpt.config.config import Config
+from resumegpt.services import resume_scorer
+from resumegpt.services.resume_scorer import ResumeScorer
+from resumegpt.utils.model_cache import ModelCache
+
+DIM = 384
+
+
+class HashedScorer(ResumeScorer):
+    """ResumeScorer with deterministic pseudo-random unit vectors instead of the model."""
+
+    def __init__(self):
+        super().__init__(models=ModelCache())
+        self.memo = {}
+
+    def embed_many(self, texts, batch_size=None):
+        for text in texts:
+            if text not in self.memo:
+                vector = np.random.default_rng(abs(hash(text))).standard_normal(DIM).astype(np.float32)
+                self.memo[text] = vector / np.linalg.norm(vector)
+        return np.stack([self.memo[text] for text in texts])
+
+
+def make_corpora(resume_count, job_count):
+    resumes = [
+        {
+            "skills": [f"skill {i % 97}", f"tool {i % 53}", f"language {i % 11}"],
+            "experiences": [{"highlights": [f"built system {i}", f"led project {i % 211}"]}],
+            "education": [{"school": f"school {i % 31}", "degrees": [{"names": ["BSc"]}]}],
+        }
+        for i in range(resume_count)
+    ]
+    jobs = [
+        {
+            "skills": {"technical_skills": [f"skill {j % 97}", f"tool {j % 53}"], "non_technical_skills": ["mentoring"]},
+            "requirements": [f"requirement {j}", f"experience with system {j % 89}"],
+        }
+        for j in range(job_count)
+    ]
+    return resumes, jobs
+
+
+def full_sort(scores, k):
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+
+    # The hashed vectors must not end up in the on-disk store
+    Config.EMBEDDING_STORE_PATH = ""
+
+    resumes, jobs = make_corpora(args.resumes, args.jobs)
+    scorer = HashedScorer()
+    # Embed both corpora up front
+    scorer.rank(resumes, jobs[:1])
+    scorer.rank(resumes[:1], jobs)
+
+    chunked = lambda: scorer.rank(resumes, jobs, top_k=args.top_k, chunk_size=args.chunk_size)
+    with mock.patch.object(resume_scorer, "_top_k", full_sort):
+        whole = measure(lambda: scorer.rank(resumes, jobs, top_k=args.top_k, chunk_size=len(jobs)))
+    rows = [("chunked", measure(chunked)), ("one block", whole)]
+    print(f"{args.resumes} resumes x {args.jobs} jobs, top {args.top_k} per job")
+    print(f"{'mode':<11}{'seconds':>9}{'peak MiB':>10}")
+    for name, (seconds, peak) in rows:
+        print(f"{name:<11}{seconds:>9.2f}{peak:>10.0f}")
+    print("\nchunked: top-k by argpartition per chunk; one block: every score, then a full sort")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark section-parallel tailoring against the monolithic prompt.
+
+Tailors resumes with a growing number of experience entries in both
+``ResumeImprover`` modes, using the fake LLM backend whose latency is a fixed
+time-to-first-token plus one step per output token:
+
+    python -m benchmarks.section_tailoring --entries 2 4 8 16
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from resumegpt.services.llm_backends import FakeChatBackend
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.single_flight import SingleFlight
+
+POSTING = ("<h2>Backend Engineer at Initech</h2><p>You will design Python APIs, tune PostgreSQL "
+           "queries and run services on Kubernetes.</p><p>Experience with Kafka is a plus.</p>")
+
+
+def make_resume(entries):
+    return {
+        "name": "Jane Doe",
+        "skills": ["Python", "Go", "PostgreSQL", "Kubernetes", "Kafka", "React"],
+        "experience": [
+            {
+                "title": f"Software Engineer {i + 1}",
+                "company": f"Company {i + 1}",
+                "description": "Built Python services and REST APIs, tuned PostgreSQL queries, "
+                               "ran deployments on Kubernetes and mentored two junior engineers.",
+            }
+            for i in range(entries)
+        ],
+        "education": [
+            {"degree": "BS Computer Science", "school": "State University", "description": "Graduated 2018"}
+        ],
+    }
+
+
+def run(mode, resume, args):
+    model = FakeChatBackend(latency=args.latency, latency_distribution="constant",
+                            tokens_per_sec=args.tokens_per_sec)
+    improver = ResumeImprover(model=model, flights=SingleFlight(), mode=mode)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        improver.process_resume(resume, POSTING, use_cache=False)
+        elapsed = time.perf_counter() - start
+    return elapsed, model.usage()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--latency", type=float, default=0.3, help="time to first token in seconds")
+    parser.add_argument("--tokens-per-sec", type=float, default=150.0, help="output tokens per second")
+    args = parser.parse_args()
+
+    print(f"{'entries':>7}  {'mode':<11}{'calls':>6}{'in tokens':>11}{'out tokens':>12}{'wall s':>9}")
+    for entries in args.entries:
+        resume = make_resume(entries)
+        timings = {}
+        for mode in ("monolithic", "sections"):
+            elapsed, usage = run(mode, resume, args)
+            timings[mode] = elapsed
+            print(f"{entries:>7}  {mode:<11}{usage['calls']:>6}{usage['input_tokens']:>11}"
+                  f"{usage['output_tokens']:>12}{elapsed:>9.2f}")
+        print(f"{'':>7}  speedup {timings['monolithic'] / timings['sections']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
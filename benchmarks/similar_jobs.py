@@ -0,0 +1,87 @@
+"""Recall and latency of the IVF job index against brute-force search.
+
+Builds an ``IVFIndex`` over ``--postings`` synthetic 384-dimensional
+embeddings by incremental insertion (as ``JobIndex`` syncs do), then runs
+``--queries`` held-out queries with several ``nprobe`` settings and reports
+recall@k against exact search, p50/p99 latency, and the same for brute
+force over all vectors. The vectors mimic MiniLM embeddings of postings:
+role families, specialisations within each, and per-posting noise
+(``--noise``), so neighbours span neighbouring clusters:
+
+    python -m benchmarks.similar_jobs --postings 100000 --queries 500
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from resumegpt.utils.vector_index import IVFIndex
+
+DIM = 384
+
+
+def make_embeddings(count, noise, seed=0, families=50, specialisations=40):
+    rng = np.random.default_rng(seed)
+    family = rng.standard_normal((families, DIM))
+    specialisation = family[:, None, :] + 0.7 * rng.standard_normal((families, specialisations, DIM))
+    centres = specialisation.reshape(-1, DIM)
+    # Some roles are posted far more often than others
+    weights = 1.0 / np.arange(1, len(centres) + 1) ** 0.8
+    picks = rng.choice(len(centres), size=count, p=weights / weights.sum())
+    vectors = centres[picks] + noise * rng.standard_normal((count, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.99) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--noise", type=float, default=0.8)
+    parser.add_argument("--batch", type=int, default=1000, help="postings per insertion")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    embeddings = make_embeddings(args.postings + args.queries, args.noise)
+    vectors, queries = embeddings[:args.postings], embeddings[args.postings:]
+    keys = [f"job_submission_{i}" for i in range(args.postings)]
+
+    index = IVFIndex(DIM)
+    start = time.perf_counter()
+    for offset in range(0, args.postings, args.batch):
+        index.add(keys[offset:offset + args.batch], vectors[offset:offset + args.batch])
+    build = time.perf_counter() - start
+    stats = index.stats()
+    print(f"{args.postings} postings: built in {build:.1f}s, {stats['lists']} lists, largest {stats['largest_list']}")
+
+    exact, brute_times = [], []
+    for query in queries:
+        start = time.perf_counter()
+        scores = vectors @ query
+        best = np.argpartition(-scores, args.k - 1)[:args.k]
+        best = best[np.argsort(-scores[best])]
+        brute_times.append(time.perf_counter() - start)
+        exact.append({keys[i] for i in best})
+
+    print(f"\n{'search':<12}{'recall@' + str(args.k):>10}{'p50 ms':>9}{'p99 ms':>9}")
+    p50, p99 = percentiles(brute_times)
+    print(f"{'brute force':<12}{1.0:>10.3f}{p50:>9.2f}{p99:>9.2f}")
+    for nprobe in args.nprobe:
+        times, recall = [], []
+        for query, expected in zip(queries, exact):
+            start = time.perf_counter()
+            found = index.search(query, args.k, nprobe=nprobe)
+            times.append(time.perf_counter() - start)
+            recall.append(len(expected & {key for key, _ in found}) / args.k)
+        p50, p99 = percentiles(times)
+        print(f"{'nprobe ' + str(nprobe):<12}{statistics.mean(recall):>10.3f}{p50:>9.2f}{p99:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare vectorized skill matching against a per-skill, per-pair loop.
+
+Matches ``--resume-skills`` resume skills against ``--job-skills`` job skills
+split over the ``JobSkills`` categories, as ``ResumeScorer.match_skills``
+does, and times:
+
+- ``loop``: one forward pass per skill and a Python loop over every pair
+- ``vectorized``: ``match_skills``, exact/alias matches first, the rest in
+  one batched forward pass and one matrix product
+
+Offline by default, with a randomly initialised MiniLM-shaped encoder:
+
+    python -m benchmarks.skill_matching --resume-skills 50 --job-skills 40
+    python -m benchmarks.skill_matching --pretrained
+"""
+import argparse
+import statistics
+import warnings
+
+import numpy as np
+
+from resumegpt.config.config import Config
+from resumegpt.services.resume_scorer import SKILL_CATEGORIES, ResumeScorer, normalize_skill
+from resumegpt.utils.model_cache import EMBEDDING_MODEL, ModelCache, load_transformer
+
+from .quantization import random_minilm, random_tokenizer, timed
+
+SKILLS = [
+    "Python", "Java", "Go", "Rust", "C++", "TypeScript", "JavaScript", "SQL", "Bash", "Scala",
+    "Kubernetes", "Docker", "Terraform", "AWS", "Google Cloud Platform", "Azure", "Linux", "Kafka",
+    "PostgreSQL", "MySQL", "Redis", "Elasticsearch", "Spark", "Airflow", "dbt", "Snowflake",
+    "React", "Vue", "Node.js", "Django", "Flask", "FastAPI", "GraphQL", "REST APIs", "gRPC",
+    "PyTorch", "TensorFlow", "scikit-learn", "pandas", "NumPy", "machine learning", "deep learning",
+    "natural language processing", "computer vision", "data modeling", "distributed systems",
+    "microservices", "CI/CD pipelines", "observability", "performance tuning", "system design",
+    "unit testing", "code review", "technical writing", "agile delivery", "stakeholder management",
+    "communication", "mentoring", "leadership", "problem solving", "collaboration", "ownership",
+    "cross-functional teamwork", "product sense", "incident response", "security best practices",
+]
+
+
+def make_skills(resume_count, job_count):
+    """Resume skills as the parser groups them and job skills split over the categories.
+
+    About half the job skills appear on the resume verbatim or as an alias.
+    """
+    resume = SKILLS[:resume_count]
+    shared = [skill.lower() for skill in resume[:job_count // 2]]
+    unique = SKILLS[resume_count:] + [f"{skill} at scale" for skill in SKILLS]
+    job = shared + unique[:job_count - len(shared)]
+    categories = {name: job[i::len(SKILL_CATEGORIES)] for i, name in enumerate(SKILL_CATEGORIES)}
+    return {"skills": resume}, categories
+
+
+def loop_match(scorer, resume_skills, job_skills):
+    """The straightforward version: embed skill by skill, compare pair by pair."""
+    resume = {skill: scorer._get_embeddings(normalize_skill(skill))[0] for skill in resume_skills["skills"]}
+    matches = {}
+    for skills in job_skills.values():
+        for skill in skills:
+            vector = scorer._get_embeddings(normalize_skill(skill))[0]
+            best, best_similarity = None, -1.0
+            for resume_skill, resume_vector in resume.items():
+                similarity = float(np.dot(vector, resume_vector))
+                if similarity > best_similarity:
+                    best, best_similarity = resume_skill, similarity
+            matches[skill] = (best, best_similarity)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resume-skills", type=int, default=50)
+    parser.add_argument("--job-skills", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pretrained", action="store_true", help="download and use the real MiniLM")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    # Every run has to embed from scratch, not read the on-disk store
+    Config.EMBEDDING_STORE_PATH = ""
+
+    resume_skills, job_skills = make_skills(args.resume_skills, args.job_skills)
+    models = ModelCache()
+    if args.pretrained:
+        models.register(EMBEDDING_MODEL, lambda: load_transformer(EMBEDDING_MODEL))
+    else:
+        words = [normalize_skill(skill) for skill in SKILLS] + [" at scale"]
+        tokenizer = random_tokenizer([word.replace("/", " / ").replace(".", " . ") for word in words])
+        models.register(EMBEDDING_MODEL, lambda: random_minilm(tokenizer))
+    models.get(EMBEDDING_MODEL)
+
+    forward_passes = {}
+    timings = {"loop": [], "vectorized": []}
+    for _ in range(args.repeat):
+        for name, match in (("loop", loop_match), ("vectorized", ResumeScorer.match_skills)):
+            scorer = ResumeScorer(models=models)
+            calls = []
+            original = scorer.embed_many
+            scorer.embed_many = lambda texts, batch_size=None: calls.append(len(texts)) or original(texts, batch_size)
+            _, seconds = timed(lambda: match(scorer, resume_skills, job_skills))
+            timings[name].append(seconds)
+            forward_passes[name] = sum(-(-count // Config.EMBEDDING_BATCH_SIZE) for count in calls)
+
+    job_count = sum(len(skills) for skills in job_skills.values())
+    print(f"{len(resume_skills['skills'])} resume skills x {job_count} job skills, median of {args.repeat}")
+    print(f"{'mode':<12}{'ms':>10}{'forward passes':>16}")
+    for name, values in timings.items():
+        print(f"{name:<12}{statistics.median(values) * 1000:>10.1f}{forward_passes[name]:>16}")
+    speedup = statistics.median(timings["loop"]) / statistics.median(timings["vectorized"])
+    print(f"\nvectorized is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
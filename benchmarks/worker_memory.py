@@ -0,0 +1,108 @@
+"""Measure per-worker memory of a pre-fork server with and without preloading.
+
+Forks ``--workers`` processes the way ``gunicorn -w N`` does. In ``lazy``
+mode each worker loads the models on its first request; in ``preload`` mode
+the master loads, warms and freezes them first (``ModelCache.preload`` and
+``gc.freeze``, as ``wsgi.py`` does with ``MODEL_PRELOAD=true``) and the
+workers only run inference. Once every worker has served a request, each
+reports RSS, PSS and USS (unique set size: memory no other process shares)
+from ``/proc/self/smaps_rollup``, so Linux only:
+
+    python -m benchmarks.worker_memory --workers 4
+    python -m benchmarks.worker_memory --pretrained
+
+Offline by default, with randomly initialised models of the real shapes.
+"""
+import argparse
+import gc
+import multiprocessing
+import warnings
+
+from resumegpt.utils.embeddings import mean_pooled
+from resumegpt.utils.model_cache import EMBEDDING_MODEL, ModelCache, load_ner_pipeline, load_transformer
+
+from .quantization import make_texts, random_minilm, random_ner, random_tokenizer
+
+
+def memory():
+    """RSS, PSS and USS of this process in MiB."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def make_cache(args, texts):
+    cache = ModelCache()
+    if args.pretrained:
+        cache.register("ner", load_ner_pipeline)
+        cache.register(EMBEDDING_MODEL, lambda: load_transformer(EMBEDDING_MODEL))
+    else:
+        tokenizer = random_tokenizer(texts)
+        cache.register("ner", lambda: random_ner(tokenizer, args.ner_layers, args.ner_hidden))
+        cache.register(EMBEDDING_MODEL, lambda: random_minilm(tokenizer))
+    return cache
+
+
+def serve(cache, texts, barrier, results, index):
+    """One worker: handle a request, then report memory while all workers are alive."""
+    with cache.use(EMBEDDING_MODEL) as (tokenizer, model):
+        mean_pooled(tokenizer, model, texts)
+    with cache.use("ner") as ner:
+        ner(texts)
+    barrier.wait()
+    results.put((index, memory()))
+    barrier.wait()
+
+
+def run(mode, args):
+    texts = make_texts(16)
+    ctx = multiprocessing.get_context("fork")
+    cache = make_cache(args, texts)
+    if mode == "preload":
+        cache.preload()
+        gc.freeze()
+    barrier = ctx.Barrier(args.workers + 1)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=serve, args=(cache, texts, barrier, results, i)) for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    master = memory()
+    rows = sorted(results.get() for _ in workers)
+    barrier.wait()
+    for worker in workers:
+        worker.join()
+    if mode == "preload":
+        gc.unfreeze()
+    return master, [row for _, row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ner-layers", type=int, default=12)
+    parser.add_argument("--ner-hidden", type=int, default=768)
+    parser.add_argument("--pretrained", action="store_true", help="download and use the real checkpoints")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    print(f"{'mode':<9}{'process':<10}{'RSS MiB':>9}{'PSS MiB':>9}{'USS MiB':>9}")
+    for mode in ("lazy", "preload"):
+        master, workers = run(mode, args)
+        print(f"{mode:<9}{'master':<10}{master['rss']:>9.0f}{master['pss']:>9.0f}{master['uss']:>9.0f}")
+        for i, row in enumerate(workers):
+            print(f"{mode:<9}{f'worker {i}':<10}{row['rss']:>9.0f}{row['pss']:>9.0f}{row['uss']:>9.0f}")
+        total = master["pss"] + sum(row["pss"] for row in workers)
+        print(f"{mode:<9}total PSS {total:.0f} MiB\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -177,33 +177,62 @@ class ResumeGPTExtension {
             document.getElementById('downloadPDF').disabled = true;
             document.getElementById('status').textContent = 'Tailoring resume...';
             
-            const response = await fetch(`${this.API_URL}/tailor-resume`, {
+            const response = await fetch(`${this.API_URL}/tailor-resume/stream`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
-                    'Accept': 'application/json'
+                    'Accept': 'text/event-stream'
                 },
                 body: JSON.stringify(requestData)
             });
 
             console.log('Response status:', response.status);
-            const responseText = await response.text();
-            console.log('Response text:', responseText);
-
             if (!response.ok) {
+                const responseText = await response.text();
                 throw new Error(`HTTP error! status: ${response.status}, message: ${responseText}`);
             }
-            
-            const result = JSON.parse(responseText);
-            console.log('Parsed result:', result);
 
-            if (result.success && result.data) {
-                this.tailoredResume = result.data;
-                this.displayTailoredResume(result.data);
+            // Render each section as soon as the server has generated it
+            const partial = {
+                tailored_resume: {
+                    name: this.resumeData.name,
+                    skills: [],
+                    experience: [],
+                    education: []
+                },
+                match_score: 0,
+                improvements: []
+            };
+            let result = null;
+            await this.readEventStream(response, (event, payload) => {
+                console.log('Stream event:', event, payload);
+                if (event === 'error') {
+                    throw new Error(payload.error || 'Failed to tailor resume');
+                }
+                if (event === 'result') {
+                    result = payload;
+                    return;
+                }
+                if (event === 'experience') {
+                    partial.tailored_resume.experience[payload.index] = payload.entry;
+                } else if (event === 'skills' || event === 'education') {
+                    partial.tailored_resume[event] = payload;
+                } else {
+                    partial[event] = payload;
+                }
+                this.displayTailoredResume(partial);
+                document.getElementById('downloadJSON').disabled = true;
+                document.getElementById('downloadPDF').disabled = true;
+                document.getElementById('status').textContent = `Tailoring resume... (${event} ready)`;
+            });
+
+            if (result) {
+                this.tailoredResume = result;
+                this.displayTailoredResume(result);
                 document.getElementById('status').textContent = 'Resume tailored successfully!';
                 document.getElementById('status').className = 'success';
             } else {
-                throw new Error(result.error || 'Failed to tailor resume');
+                throw new Error('Failed to tailor resume');
             }
         } catch (error) {
             console.error('Detailed error:', error);
@@ -214,6 +243,30 @@ class ResumeGPTExtension {
         }
     }
 
+    async readEventStream(response, onEvent) {
+        // Minimal server-sent events reader for fetch() response bodies
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let event = 'message';
+                let data = '';
+                for (const line of frame.split('\n')) {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+
     async getJobHtml() {
         console.log("Getting job HTML...");
         const [tab] = await chrome.tabs.query({ active: true, currentWindow: true });
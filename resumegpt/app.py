@@ -1,6 +1,12 @@
 from flask import Flask
 from flask_cors import CORS
 from .services.api_handler import api as api_blueprint
+from .services.job_index import JobIndex
+from .services.job_queue import JobQueue
+from .services.llm_client import LLMClientRegistry
+from .utils.result_cache import TailoringCache
+from .utils.semantic_cache import SemanticCache, minilm_embedder
+from .config.config import Config
 
 def create_app():
     app = Flask(__name__)
@@ -15,6 +21,39 @@ def create_app():
     })
     
     app.register_blueprint(api_blueprint, url_prefix='/api')
+    
+    # One set of LLM clients shared by every request and worker thread
+    llm_clients = LLMClientRegistry(max_connections=Config.LLM_MAX_CONNECTIONS)
+    if Config.LLM_WARMUP:
+        llm_clients.warm_up()
+    app.extensions['llm_clients'] = llm_clients
+    
+    # Reuse results for resume/posting pairs that were already tailored
+    app.extensions['result_cache'] = TailoringCache(
+        max_entries=Config.RESULT_CACHE_MAX_ENTRIES,
+        max_bytes=Config.RESULT_CACHE_MAX_BYTES,
+        db_path=Config.RESULT_CACHE_PATH or None,
+        ttl=Config.RESULT_CACHE_TTL
+    ) if Config.RESULT_CACHE_ENABLED else None
+    
+    # Also reuse them for the same role reposted with slightly different text
+    app.extensions['semantic_cache'] = SemanticCache(
+        minilm_embedder(),
+        threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+        min_overlap=Config.SEMANTIC_CACHE_MIN_OVERLAP,
+        max_entries=Config.SEMANTIC_CACHE_MAX_ENTRIES,
+        values_per_entry=Config.SEMANTIC_CACHE_VALUES_PER_ENTRY
+    ) if Config.SEMANTIC_CACHE_ENABLED else None
+    
+    # Similar-job search over saved postings, synced in the background from the first query
+    app.extensions['job_index'] = JobIndex()
+    
+    # Background workers for asynchronous tailoring requests
+    app.extensions['job_queue'] = JobQueue(
+        max_workers=Config.JOB_QUEUE_WORKERS,
+        max_queue_size=Config.JOB_QUEUE_MAX_SIZE,
+        result_ttl=Config.JOB_RESULT_TTL
+    )
     return app
 
 if __name__ == "__main__":
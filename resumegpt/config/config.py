@@ -9,3 +9,109 @@ class Config:
     GEMINI_TEMPERATURE = float(os.getenv('GEMINI_TEMPERATURE', '0.7'))
     API_URL = 'http://localhost:5000/api'
 
+    # Background job queue for asynchronous tailoring
+    JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', '4'))
+    JOB_QUEUE_MAX_SIZE = int(os.getenv('JOB_QUEUE_MAX_SIZE', '32'))
+    JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', '3600'))
+
+    # Batch tailoring of one resume against many postings
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+    BATCH_MAX_JOBS = int(os.getenv('BATCH_MAX_JOBS', '50'))
+
+    # Model backend: gemini, or fake for offline tests and benchmarks
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')
+    FAKE_LLM_LATENCY = float(os.getenv('FAKE_LLM_LATENCY', '0.5'))
+    FAKE_LLM_LATENCY_DISTRIBUTION = os.getenv('FAKE_LLM_LATENCY_DISTRIBUTION', 'lognormal')
+    FAKE_LLM_JITTER = float(os.getenv('FAKE_LLM_JITTER', '0.3'))
+    FAKE_LLM_TOKENS_PER_SEC = float(os.getenv('FAKE_LLM_TOKENS_PER_SEC', '150'))
+    FAKE_LLM_ERROR_RATE = float(os.getenv('FAKE_LLM_ERROR_RATE', '0'))
+    FAKE_LLM_SEED = int(os.getenv('FAKE_LLM_SEED', '0'))
+
+    # Shared LLM client pool
+    LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '10'))
+    LLM_KEEPALIVE_EXPIRY = float(os.getenv('LLM_KEEPALIVE_EXPIRY', '60'))
+    LLM_WARMUP = os.getenv('LLM_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+    # Extra attempts when a reply is not valid JSON for the expected schema
+    LLM_PARSE_RETRIES = int(os.getenv('LLM_PARSE_RETRIES', '1'))
+
+    # Time budgets, retries, hedging and circuit breaking around model calls
+    LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', '90'))
+    LLM_ATTEMPT_TIMEOUT = float(os.getenv('LLM_ATTEMPT_TIMEOUT', '45'))
+    LLM_MAX_ATTEMPTS = int(os.getenv('LLM_MAX_ATTEMPTS', '3'))
+    LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', '0.5'))
+    LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', '8'))
+    LLM_HEDGING = os.getenv('LLM_HEDGING', 'false').lower() in ('1', 'true', 'yes')
+    # Hedge delay until enough calls have been seen to use their p95 latency
+    LLM_HEDGE_DELAY = float(os.getenv('LLM_HEDGE_DELAY', '10'))
+    LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', '5'))
+    LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', '30'))
+
+    # Opt-in tailoring result cache (in-process LRU in front of a SQLite file).
+    # Entries hold the tailored resume, so the file contains personal data.
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '256'))
+    RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    RESULT_CACHE_PATH = os.getenv(
+        'RESULT_CACHE_PATH',
+        os.path.join(os.path.expanduser('~'), '.cache', 'resumegpt', 'tailoring.sqlite3')
+    )
+    RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', str(7 * 24 * 3600)))
+
+    # ResumeScorer embeddings, memory-mapped and shared by all processes ('' disables)
+    EMBEDDING_STORE_PATH = os.getenv(
+        'EMBEDDING_STORE_PATH',
+        os.path.join(os.path.expanduser('~'), '.cache', 'resumegpt', 'embeddings')
+    )
+    EMBEDDING_STORE_HOT_ENTRIES = int(os.getenv('EMBEDDING_STORE_HOT_ENTRIES', '4096'))
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '32'))
+    # Cosine similarity at which a resume skill counts as covering a job skill
+    SKILL_MATCH_THRESHOLD = float(os.getenv('SKILL_MATCH_THRESHOLD', '0.7'))
+    # Bulk ranking: request limits and queries scored per block
+    RANK_MAX_RESUMES = int(os.getenv('RANK_MAX_RESUMES', '10000'))
+    RANK_MAX_JOBS = int(os.getenv('RANK_MAX_JOBS', '1000'))
+    RANK_MAX_TOP_K = int(os.getenv('RANK_MAX_TOP_K', '100'))
+    RANK_CHUNK_SIZE = int(os.getenv('RANK_CHUNK_SIZE', '256'))
+
+    # Similar-job search over saved postings (<JOB_DATA_DIR>/job_submission_*/job.yaml)
+    JOB_DATA_DIR = os.getenv('JOB_DATA_DIR', 'data')
+    JOB_INDEX_PATH = os.getenv(
+        'JOB_INDEX_PATH',
+        os.path.join(os.path.expanduser('~'), '.cache', 'resumegpt', 'job_index.npz')
+    )
+    JOB_INDEX_NPROBE = int(os.getenv('JOB_INDEX_NPROBE', '8'))
+    # Seconds between rescans of JOB_DATA_DIR for added or removed postings
+    JOB_INDEX_SYNC_INTERVAL = float(os.getenv('JOB_INDEX_SYNC_INTERVAL', '60'))
+
+    # Reuse parsed postings and tailoring results across near-duplicate postings
+    SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+    SEMANTIC_CACHE_MIN_OVERLAP = float(os.getenv('SEMANTIC_CACHE_MIN_OVERLAP', '0.6'))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '1024'))
+    SEMANTIC_CACHE_VALUES_PER_ENTRY = int(os.getenv('SEMANTIC_CACHE_VALUES_PER_ENTRY', '16'))
+
+    # How resumes are tailored: monolithic (one prompt) or sections (one prompt
+    # per skills list, experience and education entry, run concurrently)
+    TAILOR_MODE = os.getenv('TAILOR_MODE', 'monolithic')
+    TAILOR_SECTION_CONCURRENCY = int(os.getenv('TAILOR_SECTION_CONCURRENCY', '8'))
+
+    # Opt-in job text compaction before it is put into the tailoring prompt
+    PROMPT_COMPACTION = os.getenv('PROMPT_COMPACTION', 'false').lower() in ('1', 'true', 'yes')
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '1500'))
+
+    # How JobPost extracts fields: serial, concurrent or structured
+    JOB_PARSE_MODE = os.getenv('JOB_PARSE_MODE', 'serial')
+
+    # Loaded transformer models above this many bytes are evicted when idle (0: no limit)
+    MODEL_CACHE_MAX_BYTES = int(os.getenv('MODEL_CACHE_MAX_BYTES', '0'))
+    # CPU inference precision for the registry's models: none (fp32) or int8 (dynamic quantization)
+    MODEL_QUANTIZATION = os.getenv('MODEL_QUANTIZATION', 'none')
+    # Load and warm the models in wsgi.py before workers fork (gunicorn --preload)
+    MODEL_PRELOAD = os.getenv('MODEL_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+    # JobAnalyzer NER: sentences per forward pass and how subword tokens are merged
+    NER_BATCH_SIZE = int(os.getenv('NER_BATCH_SIZE', '16'))
+    NER_AGGREGATION = os.getenv('NER_AGGREGATION', 'simple')
+
+    # JobAnalyzer sentiment: sentences per forward pass and sentence scores kept across postings
+    SENTIMENT_BATCH_SIZE = int(os.getenv('SENTIMENT_BATCH_SIZE', '32'))
+    SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv('SENTIMENT_CACHE_MAX_ENTRIES', '4096'))
@@ -1,12 +1,18 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from ..prompts.prompts import Prompts
-from .. import config
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import List, Optional, Dict, Any, Iterable, Union
+from ..config.config import Config
+from ..utils.json_stream import extract_json
+from ..utils.keyword_matcher import KeywordMatcher
+from ..utils.model_cache import MODEL_CACHE, ModelCache
+from ..utils.resilience import deadline_scope
+from ..utils.single_flight import SingleFlight
 from bs4 import BeautifulSoup
+from collections import OrderedDict
+from contextlib import nullcontext
+import asyncio
+import hashlib
 import re
-from transformers import pipeline, AutoTokenizer, AutoModel
-import torch
+import threading
 
 class JobSkills(BaseModel):
     """Skills required for the job."""
@@ -26,19 +32,53 @@ class JobDescription(BaseModel):
     skills: JobSkills = Field(default_factory=JobSkills)
     requirements: JobRequirements = Field(default_factory=JobRequirements)
 
+# List fields extracted from every posting and how they are described to the model
+SECTION_QUERIES = {
+    'technical_skills': "technical skills and tools required",
+    'non_technical_skills': "soft skills and competencies required",
+    'qualifications': "qualifications and requirements",
+    'duties': "main responsibilities and duties",
+    'ats_keywords': "important keywords and industry terms",
+}
+COMPANY_PROMPT = "What is the company name in this job posting? Return only the name."
+TITLE_PROMPT = "What is the job title in this job posting? Return only the title."
+
+# Elements that start a new line when cleaning with ``keep_lines``
+BLOCK_TAGS = ['p', 'div', 'li', 'ul', 'ol', 'br', 'tr', 'section', 'article',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Postings being parsed concurrently share one set of extraction calls
+PARSE_FLIGHTS = SingleFlight()
+
 class JobPost:
-    def __init__(self, posting: str):
+    def __init__(self, posting: str, llm=None, flights: Optional[SingleFlight] = None, semantic_cache=None):
         self.raw_content = posting
         self.cleaned_content = None
         self.parsed_job = None
-        self.extractor_llm = ChatGoogleGenerativeAI(
-            model=config.MODEL_NAME,
-            google_api_key=config.GOOGLE_API_KEY,
-            temperature=0.2  # Lower temperature for more consistent parsing
-        )
+        self._extractor_llm = llm
+        self.flights = flights or PARSE_FLIGHTS
+        # Optional SemanticCache shared with other postings
+        self.semantic_cache = semantic_cache
+
+    @property
+    def extractor_llm(self):
+        # Built on first use so HTML cleaning alone doesn't need an API key
+        if self._extractor_llm is None:
+            # Imported here: the services package imports this module
+            from ..services.llm_backends import create_chat_model
+            from ..services.llm_client import ResilientChatModel
+            self._extractor_llm = ResilientChatModel(create_chat_model(
+                Config.GEMINI_MODEL_NAME,
+                temperature=0.2  # Lower temperature for more consistent parsing
+            ))
+        return self._extractor_llm
 
-    def clean_html_content(self):
-        """Clean and normalize HTML content."""
+    def clean_html_content(self, keep_lines: bool = False):
+        """Clean and normalize HTML content.
+
+        With ``keep_lines`` each block element (paragraph, list item, ...)
+        stays on its own line instead of being joined into one string.
+        """
         soup = BeautifulSoup(self.raw_content, 'html.parser')
         
         # Remove script and style elements
@@ -46,14 +86,32 @@ class JobPost:
             script.decompose()
             
         # Get text and normalize spaces
-        text = soup.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text)
+        if keep_lines:
+            for block in soup.find_all(BLOCK_TAGS):
+                block.insert_before('\n')
+                block.insert_after('\n')
+            text = soup.get_text()
+            text = re.sub(r'[^\S\n]+', ' ', text)
+            text = re.sub(r'\s*\n\s*', '\n', text).strip()
+        else:
+            text = soup.get_text(separator=' ', strip=True)
+            text = re.sub(r'\s+', ' ', text)
         self.cleaned_content = text
         return text
 
     def extract_section(self, text: str, section_name: str) -> List[str]:
         """Extract specific sections from job posting."""
-        prompt = f"""Extract the {section_name} from this job posting. Return as a list of strings.
+        response = self.extractor_llm.invoke(self._section_prompt(text, section_name))
+        return self._parse_list_items(response.content)
+
+    async def aextract_section(self, text: str, section_name: str) -> List[str]:
+        """Async variant of ``extract_section``."""
+        response = await self.extractor_llm.ainvoke(self._section_prompt(text, section_name))
+        return self._parse_list_items(response.content)
+
+    @staticmethod
+    def _section_prompt(text: str, section_name: str) -> str:
+        return f"""Extract the {section_name} from this job posting. Return as a list of strings.
         Job Posting: {text}
         
         Rules:
@@ -62,146 +120,381 @@ class JobPost:
         - Maximum 10 items
         - Return only the list, no explanations
         """
+
+    @staticmethod
+    def _parse_list_items(content: str) -> List[str]:
+        # Prefer a JSON array of strings when the model answers with one
+        if '[' in content:
+            try:
+                return extract_json(content, schema=List[str])[:10]
+            except ValueError:
+                pass
         
-        response = self.extractor_llm.invoke(prompt)
         # Process response to extract list items
-        items = re.findall(r'[-•*]\s*(.+)', response.content)
+        items = re.findall(r'[-•*]\s*(.+)', content)
         if not items:
             # Try alternative parsing if bullet points aren't found
-            items = [line.strip() for line in response.content.split('\n') if line.strip()]
+            items = [line.strip() for line in content.split('\n') if line.strip()]
         return items[:10]  # Limit to 10 items
 
-    def parse_job_post(self, verbose=False) -> dict:
-        """Parse the job posting into structured data."""
+    def parse_job_post(self, verbose=False, mode: Optional[str] = None) -> dict:
+        """Parse the job posting into structured data.
+
+        ``mode`` picks how the fields are extracted (default
+        ``Config.JOB_PARSE_MODE``): ``serial`` makes one blocking call per
+        field, ``concurrent`` sends the same calls at once through the async
+        chat API, and ``structured`` fills ``JobDescription`` in a single
+        structured-output call.
+        """
+        mode = mode or Config.JOB_PARSE_MODE
+        extractors = {
+            'serial': self._extract_serial,
+            'concurrent': self._extract_concurrent,
+            'structured': self._extract_structured,
+        }
+        if mode not in extractors:
+            raise ValueError(f"Unknown job parse mode: {mode}")
         try:
             # Clean HTML content first
             cleaned_text = self.clean_html_content()
             
-            # Extract each section separately
-            technical_skills = self.extract_section(cleaned_text, "technical skills and tools required")
-            non_technical_skills = self.extract_section(cleaned_text, "soft skills and competencies required")
-            qualifications = self.extract_section(cleaned_text, "qualifications and requirements")
-            duties = self.extract_section(cleaned_text, "main responsibilities and duties")
-            ats_keywords = self.extract_section(cleaned_text, "important keywords and industry terms")
-
-            # Create structured output
-            self.parsed_job = JobDescription(
-                company=self.extract_company_name(cleaned_text),
-                job_title=self.extract_job_title(cleaned_text),
-                skills=JobSkills(
-                    technical_skills=technical_skills,
-                    non_technical_skills=non_technical_skills,
-                    ats_keywords=ats_keywords
-                ),
-                requirements=JobRequirements(
-                    qualifications=qualifications,
-                    duties=duties
-                )
-            )
+            # Identical postings parsed at the same time share one extraction
+            model_name = getattr(self.extractor_llm, 'model', None) or Config.GEMINI_MODEL_NAME
+            key = hashlib.sha256(f"{model_name}\n{mode}\n{cleaned_text}".encode('utf-8')).hexdigest()
+            # Reuse the parse of a near-duplicate posting if there is one
+            semantic_key = f"parsed:{model_name}:{mode}"
+            if self.semantic_cache is not None:
+                cached = self.semantic_cache.get(cleaned_text, semantic_key)
+                if cached is not None:
+                    self.parsed_job = JobDescription(**cached)
+                    return self.parsed_job.dict()
+            
+            # Every extraction call for this posting shares one time budget
+            with deadline_scope(Config.LLM_DEADLINE):
+                self.parsed_job = self.flights.do(key, extractors[mode], cleaned_text)
+            if self.semantic_cache is not None:
+                self.semantic_cache.set(cleaned_text, semantic_key, self.parsed_job.model_dump())
 
             return self.parsed_job.dict()
             
         except Exception as e:
-            config.logger.error(f"Failed to parse job post: {str(e)}")
+            print(f"Failed to parse job post: {str(e)}")
             raise
 
+    def _extract_serial(self, cleaned_text: str) -> JobDescription:
+        # Extract each section separately
+        sections = {
+            field: self.extract_section(cleaned_text, section_name)
+            for field, section_name in SECTION_QUERIES.items()
+        }
+        return self._assemble(
+            sections,
+            company=self.extract_company_name(cleaned_text),
+            job_title=self.extract_job_title(cleaned_text)
+        )
+
+    def _extract_concurrent(self, cleaned_text: str) -> JobDescription:
+        return asyncio.run(self._aextract_all(cleaned_text))
+
+    async def _aextract_all(self, cleaned_text: str) -> JobDescription:
+        fields = list(SECTION_QUERIES)
+        results = await asyncio.gather(
+            *(self.aextract_section(cleaned_text, SECTION_QUERIES[field]) for field in fields),
+            self.aextract_company_name(cleaned_text),
+            self.aextract_job_title(cleaned_text)
+        )
+        sections = dict(zip(fields, results))
+        return self._assemble(sections, company=results[-2], job_title=results[-1])
+
+    def _extract_structured(self, cleaned_text: str) -> JobDescription:
+        wanted = ', '.join(SECTION_QUERIES.values())
+        prompt = f"""Extract the company name, the job title and the following lists from this job posting: {wanted}.
+        Job Posting: {cleaned_text}
+        
+        Rules:
+        - Each list item should be a complete, meaningful phrase
+        - Remove duplicates
+        - Maximum 10 items per list
+        """
+        parsed = self.extractor_llm.with_structured_output(JobDescription).invoke(prompt)
+        if isinstance(parsed, dict):
+            parsed = JobDescription(**parsed)
+        # Same limits as the per-field prompts
+        sections = {
+            'technical_skills': parsed.skills.technical_skills,
+            'non_technical_skills': parsed.skills.non_technical_skills,
+            'ats_keywords': parsed.skills.ats_keywords,
+            'qualifications': parsed.requirements.qualifications,
+            'duties': parsed.requirements.duties,
+        }
+        return self._assemble(
+            {field: items[:10] for field, items in sections.items()},
+            company=parsed.company,
+            job_title=parsed.job_title
+        )
+
+    @staticmethod
+    def _assemble(sections: Dict[str, List[str]], company: Optional[str], job_title: Optional[str]) -> JobDescription:
+        # Create structured output
+        return JobDescription(
+            company=company,
+            job_title=job_title,
+            skills=JobSkills(
+                technical_skills=sections['technical_skills'],
+                non_technical_skills=sections['non_technical_skills'],
+                ats_keywords=sections['ats_keywords']
+            ),
+            requirements=JobRequirements(
+                qualifications=sections['qualifications'],
+                duties=sections['duties']
+            )
+        )
+
     def extract_company_name(self, text: str) -> Optional[str]:
         """Extract company name from job posting."""
-        prompt = "What is the company name in this job posting? Return only the name."
-        response = self.extractor_llm.invoke(prompt + "\n" + text[:1000])
+        response = self.extractor_llm.invoke(COMPANY_PROMPT + "\n" + text[:1000])
+        return response.content.strip()
+
+    async def aextract_company_name(self, text: str) -> Optional[str]:
+        response = await self.extractor_llm.ainvoke(COMPANY_PROMPT + "\n" + text[:1000])
         return response.content.strip()
 
     def extract_job_title(self, text: str) -> Optional[str]:
         """Extract job title from job posting."""
-        prompt = "What is the job title in this job posting? Return only the title."
-        response = self.extractor_llm.invoke(prompt + "\n" + text[:1000])
+        response = self.extractor_llm.invoke(TITLE_PROMPT + "\n" + text[:1000])
         return response.content.strip()
 
+    async def aextract_job_title(self, text: str) -> Optional[str]:
+        response = await self.extractor_llm.ainvoke(TITLE_PROMPT + "\n" + text[:1000])
+        return response.content.strip()
+
+# CoNLL-03 entity groups counted as skills; MISC covers products, languages and tools
+TECHNICAL_ENTITY_LABELS = {'ORG', 'MISC'}
+SOFT_ENTITY_LABELS = {'MISC'}
+
+def _entity_label(entity: Dict[str, Any]) -> str:
+    """Entity group of a NER result, with or without aggregation (B-ORG -> ORG)."""
+    return entity.get('entity_group') or entity['entity'].split('-')[-1]
+
+# Indicators the JobAnalyzer heuristics look for
+REQUIREMENT_INDICATORS = ['require', 'must', 'should', 'need']
+TECHNICAL_INDICATORS = ['programming', 'software', 'technical', 'technology']
+SOFT_INDICATORS = ['communication', 'interpersonal', 'leadership']
+CULTURE_INDICATORS = {
+    'innovation': ['innovative', 'cutting-edge', 'pioneering'],
+    'collaboration': ['team', 'collaborative', 'cross-functional'],
+    'growth': ['learning', 'development', 'mentorship']
+}
+SENIORITY_INDICATORS = {
+    'entry': ['entry', 'junior', 'graduate'],
+    'mid': ['mid', 'intermediate', 'experienced'],
+    'senior': ['senior', 'lead', 'principal']
+}
+
+# Every indicator of every analyzer, found in a single pass over a posting
+INDICATOR_MATCHER = KeywordMatcher(
+    REQUIREMENT_INDICATORS + TECHNICAL_INDICATORS + SOFT_INDICATORS
+    + [kw for kws in CULTURE_INDICATORS.values() for kw in kws]
+    + [kw for kws in SENIORITY_INDICATORS.values() for kw in kws]
+)
+
+class AnalysisDocument:
+    """A posting split into sentences once and scanned once for indicators.
+
+    Sentences are the ``text.split('.')`` pieces the analyzers always used,
+    kept with their offsets into ``text``. ``keywords[i]`` holds the
+    indicators found in sentence ``i`` (lowercased substring matches).
+    """
+
+    def __init__(self, text: str, matcher: KeywordMatcher = INDICATOR_MATCHER):
+        self.text = text
+        self.sentences: List[str] = []
+        self.offsets: List[int] = []
+        self.keywords: List[set] = []
+        start = 0
+        for sentence in text.split('.'):
+            self.sentences.append(sentence)
+            self.offsets.append(start)
+            # Lowercased per sentence: lower() may change the length, so
+            # match offsets only hold within one sentence
+            self.keywords.append(matcher.found(sentence.lower()))
+            start += len(sentence) + 1
+        self.found = set().union(*self.keywords)
+
+    def sentences_with(self, indicators: Iterable[str]) -> List[int]:
+        """Indices of the sentences containing any of ``indicators``."""
+        wanted = set(indicators)
+        return [i for i, keywords in enumerate(self.keywords) if keywords & wanted]
+
+    def contains_any(self, indicators: Iterable[str]) -> bool:
+        return not self.found.isdisjoint(indicators)
+
+class SentimentCache:
+    """Bounded in-process LRU of sentiment scores keyed by sentence."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sentence: str) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(sentence)
+            if score is not None:
+                self._scores.move_to_end(sentence)
+            return score
+
+    def set(self, sentence: str, score: float) -> None:
+        with self._lock:
+            self._scores[sentence] = score
+            self._scores.move_to_end(sentence)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+# Culture sentences are often boilerplate shared by many postings
+SENTIMENT_CACHE = SentimentCache(max_entries=Config.SENTIMENT_CACHE_MAX_ENTRIES)
+
 class JobAnalyzer:
-    def __init__(self):
-        self.ner_pipeline = pipeline("ner", model="dbmdz/bert-large-cased-finetuned-conll03-english")
-        self.sentiment_pipeline = pipeline("sentiment-analysis")
-        self.tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
-        self.model = AutoModel.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
+    def __init__(
+        self,
+        ner_pipeline=None,
+        sentiment_pipeline=None,
+        sentiment_cache: Optional[SentimentCache] = None,
+        models: Optional[ModelCache] = None
+    ):
+        # Models come from the shared registry on first use unless given here
+        self.ner_pipeline = ner_pipeline
+        self.sentiment_pipeline = sentiment_pipeline
+        self.sentiment_cache = SENTIMENT_CACHE if sentiment_cache is None else sentiment_cache
+        self.models = models or MODEL_CACHE
+        
+    def _pipeline(self, name: str, given):
+        return nullcontext(given) if given is not None else self.models.use(name)
         
     def analyze_job_posting(self, text: str) -> Dict[str, Any]:
         """Comprehensive analysis of job posting."""
+        # Split and scan the posting once for all the analyzers
+        doc = AnalysisDocument(text)
+        skills = self.extract_skills(doc)
         return {
-            'requirements': self.extract_requirements(text),
-            'skills': self.extract_skills(text),
-            'company_culture': self.analyze_company_culture(text),
-            'keywords': self.extract_ats_keywords(text),
-            'seniority_level': self.determine_seniority(text)
+            'requirements': self.extract_requirements(doc),
+            'skills': skills,
+            'company_culture': self.analyze_company_culture(doc),
+            'keywords': self.extract_ats_keywords(doc, skills),
+            'seniority_level': self.determine_seniority(doc)
         }
         
-    def analyze_company_culture(self, text: str) -> Dict[str, float]:
+    @staticmethod
+    def _document(text: Union[str, AnalysisDocument]) -> AnalysisDocument:
+        return text if isinstance(text, AnalysisDocument) else AnalysisDocument(text)
+        
+    def analyze_company_culture(self, text: Union[str, AnalysisDocument]) -> Dict[str, float]:
         """Analyze company culture and values using sentiment analysis."""
-        culture_indicators = {
-            'innovation': ['innovative', 'cutting-edge', 'pioneering'],
-            'collaboration': ['team', 'collaborative', 'cross-functional'],
-            'growth': ['learning', 'development', 'mentorship']
+        doc = self._document(text)
+        relevant = {
+            value: [doc.sentences[i].strip() for i in doc.sentences_with(keywords)]
+            for value, keywords in CULTURE_INDICATORS.items()
         }
+        # Score each distinct sentence once, even if it shows several values
+        sentiment = self._sentence_sentiment(list(dict.fromkeys(
+            sent for sentences in relevant.values() for sent in sentences
+        )))
         
         scores = {}
-        for value, keywords in culture_indicators.items():
-            # Get sentiment scores for sentences containing culture keywords
-            relevant_sentences = [sent for sent in text.split('.') 
-                               if any(keyword in sent.lower() for keyword in keywords)]
-            if relevant_sentences:
-                sentiments = self.sentiment_pipeline(relevant_sentences)
-                scores[value] = sum(s['score'] for s in sentiments) / len(sentiments)
+        for value, sentences in relevant.items():
+            if sentences:
+                scores[value] = sum(sentiment[sent] for sent in sentences) / len(sentences)
             else:
                 scores[value] = 0.0
                 
         return scores
 
-    def extract_requirements(self, text: str) -> List[str]:
+    def _sentence_sentiment(self, sentences: List[str]) -> Dict[str, float]:
+        """Sentiment score per sentence, from the cache or one batched pass."""
+        scores = {}
+        missing = []
+        for sent in sentences:
+            cached = self.sentiment_cache.get(sent)
+            if cached is None:
+                missing.append(sent)
+            else:
+                scores[sent] = cached
+        
+        if missing:
+            with self._pipeline('sentiment', self.sentiment_pipeline) as sentiment_pipeline:
+                results = sentiment_pipeline(missing, batch_size=Config.SENTIMENT_BATCH_SIZE)
+            for sent, result in zip(missing, results):
+                scores[sent] = float(result['score'])
+                self.sentiment_cache.set(sent, scores[sent])
+        return scores
+
+    def extract_requirements(self, text: Union[str, AnalysisDocument]) -> List[str]:
         """Extract job requirements using NLP."""
-        requirements = []
-        for sent in text.split('.') if '.' in text else []:
-            if any(keyword in sent.lower() for keyword in ['require', 'must', 'should', 'need']):
-                requirements.append(sent.strip())
-        return requirements
+        doc = self._document(text)
+        if '.' not in doc.text:
+            return []
+        return [doc.sentences[i].strip() for i in doc.sentences_with(REQUIREMENT_INDICATORS)]
 
-    def extract_skills(self, text: str) -> Dict[str, List[str]]:
+    def extract_skills(self, text: Union[str, AnalysisDocument]) -> Dict[str, List[str]]:
         """Extract technical and soft skills from job posting."""
+        doc = self._document(text)
         skills = {
             'technical': [],
             'soft': []
         }
         
-        # Define skill indicators
-        technical_indicators = ['programming', 'software', 'technical', 'technology']
-        soft_indicators = ['communication', 'interpersonal', 'leadership']
-        
-        for sent in text.split('.') if '.' in text else []:
-            sent_lower = sent.lower()
-            
+        # Collect the sentences first so NER runs over them in batches
+        candidates = []
+        for i, keywords in enumerate(doc.keywords) if '.' in doc.text else []:
             # Classify skills based on context
-            if any(ind in sent_lower for ind in technical_indicators):
-                skills['technical'].extend([
-                    ent.strip() for ent, label in self.ner_pipeline(sent) 
-                    if label == 'PRODUCT' or label == 'ORG' or label == 'TECH'
-                ])
-            elif any(ind in sent_lower for ind in soft_indicators):
-                skills['soft'].extend([
-                    ent.strip() for ent, label in self.ner_pipeline(sent) 
-                    if label == 'SKILL'
-                ])
+            if not keywords.isdisjoint(TECHNICAL_INDICATORS):
+                candidates.append(('technical', doc.sentences[i]))
+            elif not keywords.isdisjoint(SOFT_INDICATORS):
+                candidates.append(('soft', doc.sentences[i]))
+        
+        if not candidates:
+            return skills
+        
+        with self._pipeline('ner', self.ner_pipeline) as ner_pipeline:
+            entities = ner_pipeline([sent for _, sent in candidates], batch_size=Config.NER_BATCH_SIZE)
+        for (kind, _), found in zip(candidates, entities):
+            labels = TECHNICAL_ENTITY_LABELS if kind == 'technical' else SOFT_ENTITY_LABELS
+            skills[kind].extend(
+                entity['word'].strip() for entity in found if _entity_label(entity) in labels
+            )
             
         return skills
 
-    def determine_seniority(self, text: str) -> str:
+    def extract_ats_keywords(
+        self,
+        text: Union[str, AnalysisDocument],
+        skills: Optional[Dict[str, List[str]]] = None
+    ) -> List[str]:
+        """Skills named in the posting, then the indicator terms it uses.
+
+        ``skills`` is the ``extract_skills`` result for the same text; it is
+        computed when not given. Indicator terms are ordered by the first
+        sentence they appear in.
+        """
+        doc = self._document(text)
+        if skills is None:
+            skills = self.extract_skills(doc)
+        # Requirement indicators are modal verbs, not keywords
+        first_seen = {}
+        for i, keywords in enumerate(doc.keywords):
+            for keyword in keywords.difference(REQUIREMENT_INDICATORS):
+                first_seen.setdefault(keyword, i)
+        indicators = sorted(first_seen, key=lambda keyword: (first_seen[keyword], keyword))
+        return list(dict.fromkeys(skills['technical'] + skills['soft'] + indicators))
+
+    def determine_seniority(self, text: Union[str, AnalysisDocument]) -> str:
         """Determine job seniority level."""
-        seniority_indicators = {
-            'entry': ['entry', 'junior', 'graduate'],
-            'mid': ['mid', 'intermediate', 'experienced'],
-            'senior': ['senior', 'lead', 'principal']
-        }
-        
-        text_lower = text.lower()
-        for level, indicators in seniority_indicators.items():
-            if any(ind in text_lower for ind in indicators):
+        doc = self._document(text)
+        for level, indicators in SENIORITY_INDICATORS.items():
+            if doc.contains_any(indicators):
                 return level
             
         return 'not_specified'
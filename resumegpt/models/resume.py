@@ -30,4 +30,19 @@ class JobPortalData(BaseModel):
 class TailoredResume(BaseModel):
     tailored_resume: Resume
     match_score: int = Field(ge=0, le=100)
-    improvements: List[str]
\ No newline at end of file
+    improvements: List[str]
+
+class TailoredSkills(BaseModel):
+    skills: List[str]
+    match_score: int = Field(ge=0, le=100)
+    improvements: List[str]
+
+class TailoredExperience(BaseModel):
+    experience: Experience
+    match_score: int = Field(ge=0, le=100)
+    improvements: List[str]
+
+class TailoredEducation(BaseModel):
+    education: Education
+    match_score: int = Field(ge=0, le=100)
+    improvements: List[str]
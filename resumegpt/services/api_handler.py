@@ -1,7 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, url_for, Response, stream_with_context
 from flask_cors import cross_origin
-from .resume_improver import ResumeImprover
-from ..models.resume import JobPortalData, ResumeRequest
+from .resume_improver import ResumeImprover, TAILOR_FLIGHTS
+from .resume_scorer import ResumeScorer
+from .job_index import IndexNotReadyError, html_posting_text
+from .job_queue import QueueFullError
+from ..models.resume import JobPortalData, ResumeRequest, Resume
+from ..config.config import Config
+from ..utils.model_cache import MODEL_CACHE
+from ..utils.resilience import CircuitOpenError
+from pydantic import ValidationError
 import json
 
 # Create a Blueprint instead of a Flask app
@@ -21,57 +28,51 @@ def tailor_resume():
         data = request.get_json()
         print("Received data:", json.dumps(data, indent=2) if data else "No data")
         
-        if not data:
+        job_html, resume_data, error = _validate_tailor_request(data)
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'No JSON data received'
+                'error': error
             }), 400
-            
-        if 'jobHtml' not in data:
-            return jsonify({
-                'success': False,
-                'error': 'Missing jobHtml in request'
-            }), 400
-            
-        if 'resumeData' not in data:
-            return jsonify({
-                'success': False,
-                'error': 'Missing resumeData in request'
-            }), 400
-            
-        job_html = data.get('jobHtml')
-        resume_data = data.get('resumeData')
-        
-        # Validate resume_data format
-        if not isinstance(resume_data, dict):
-            try:
-                resume_data = json.loads(resume_data)
-            except json.JSONDecodeError:
-                return jsonify({
-                    'success': False,
-                    'error': 'resumeData must be a valid JSON object'
-                }), 400
         
         print("Processing resume with job HTML length:", len(job_html))
         print("Resume data structure:", json.dumps(resume_data, indent=2))
         
-        improver = ResumeImprover()
-        result = improver.process_resume(
-            resume_data=resume_data,
-            job_html=job_html
+        use_cache = not _flag(data, 'bypassCache')
+        
+        # Opt-in async mode: queue the work and let the client poll for it
+        if _flag(data, 'async'):
+            return _enqueue_tailoring(job_html, resume_data, use_cache)
+        
+        result, prompt_stats = _get_improver().tailor_with_stats(
+            Resume(**resume_data),
+            job_html,
+            use_cache=use_cache
         )
         
         if result and isinstance(result, dict):
-            return jsonify({
+            body = {
                 'success': True,
                 'data': result
-            })
+            }
+            # Only set when this request actually built a prompt (no cache hit)
+            if prompt_stats:
+                body['promptStats'] = prompt_stats
+            return jsonify(body)
         else:
             return jsonify({
                 'success': False,
                 'error': 'Failed to tailor resume.'
             }), 500
             
+    except CircuitOpenError as e:
+        # The model backend is failing; tell the client when to come back
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = str(max(1, int(e.retry_after + 0.5)))
+        return response, 503
     except Exception as e:
         print(f"API Error: {str(e)}")
         import traceback
@@ -79,4 +80,327 @@ def tailor_resume():
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500 
\ No newline at end of file
+        }), 500
+
+
+@api.route('/jobs/<job_id>', methods=['GET', 'OPTIONS'])
+@cross_origin()
+def get_job(job_id):
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    job = current_app.extensions['job_queue'].get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown job id: {job_id}'
+        }), 404
+    
+    body = job.to_dict()
+    body['success'] = job.status != job.FAILED
+    return jsonify(body)
+
+
+@api.route('/tailor-resume/stream', methods=['POST', 'OPTIONS'])
+@cross_origin()
+def tailor_resume_stream():
+    """Tailor a resume and stream each section as server-sent events."""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    data = request.get_json(silent=True)
+    job_html, resume_data, error = _validate_tailor_request(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    use_cache = not _flag(data, 'bypassCache')
+    
+    def generate():
+        try:
+            improver = _get_improver()
+            for event, payload in improver.stream_resume(resume_data=resume_data, job_html=job_html,
+                                                         use_cache=use_cache):
+                yield _sse(event, payload)
+        except Exception as e:
+            print(f"Streaming API Error: {str(e)}")
+            yield _sse('error', {'error': str(e)})
+    
+    return _event_stream(generate())
+
+
+@api.route('/tailor-resume/batch', methods=['POST', 'OPTIONS'])
+@cross_origin()
+def tailor_resume_batch():
+    """Tailor one resume against many job postings, streaming results as they finish."""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    data = request.get_json(silent=True) or {}
+    job_htmls = data.get('jobHtml')
+    if not isinstance(job_htmls, list) or not job_htmls or not all(isinstance(h, str) for h in job_htmls):
+        return jsonify({
+            'success': False,
+            'error': 'jobHtml must be a non-empty list of strings'
+        }), 400
+    if len(job_htmls) > Config.BATCH_MAX_JOBS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {Config.BATCH_MAX_JOBS} job postings per batch'
+        }), 400
+    
+    resume_data, error = _load_resume_data(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    # Validate the resume once for the whole batch
+    try:
+        resume = Resume(**resume_data)
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid resumeData: {str(e)}'
+        }), 400
+    
+    try:
+        concurrency = int(data.get('concurrency', Config.BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        concurrency = Config.BATCH_CONCURRENCY
+    concurrency = max(1, min(concurrency, Config.BATCH_CONCURRENCY))
+    use_cache = not _flag(data, 'bypassCache')
+    
+    def generate():
+        succeeded = 0
+        improver = _get_improver()
+        results = improver.tailor_many(resume, job_htmls, max_concurrency=concurrency, use_cache=use_cache)
+        for index, result, error in results:
+            if error is None:
+                succeeded += 1
+                yield _sse('job', {'index': index, 'success': True, 'data': result})
+            else:
+                yield _sse('job', {'index': index, 'success': False, 'error': error})
+        yield _sse('done', {
+            'total': len(job_htmls),
+            'succeeded': succeeded,
+            'failed': len(job_htmls) - succeeded
+        })
+    
+    return _event_stream(generate())
+
+
+@api.route('/rank', methods=['POST', 'OPTIONS'])
+@cross_origin()
+def rank():
+    """Rank parsed resumes against job postings, returning the top matches per query."""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    data = request.get_json(silent=True) or {}
+    resumes, jobs = data.get('resumes'), data.get('jobs')
+    for name, items, limit in (('resumes', resumes, Config.RANK_MAX_RESUMES), ('jobs', jobs, Config.RANK_MAX_JOBS)):
+        if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+            return jsonify({
+                'success': False,
+                'error': f'{name} must be a non-empty list of objects'
+            }), 400
+        if len(items) > limit:
+            return jsonify({
+                'success': False,
+                'error': f'At most {limit} {name} per request'
+            }), 400
+    
+    by = data.get('by', 'job')
+    if by not in ('job', 'resume'):
+        return jsonify({
+            'success': False,
+            'error': "by must be 'job' or 'resume'"
+        }), 400
+    try:
+        top_k = int(data.get('topK', 10))
+    except (TypeError, ValueError):
+        top_k = 10
+    top_k = max(1, min(top_k, Config.RANK_MAX_TOP_K))
+    
+    try:
+        rankings = _get_scorer().rank(resumes, jobs, top_k=top_k, by=by)
+        return jsonify({
+            'success': True,
+            'by': by,
+            'rankings': rankings
+        })
+    except Exception as e:
+        print(f"API Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api.route('/similar-jobs', methods=['GET', 'POST', 'OPTIONS'])
+@cross_origin()
+def similar_jobs():
+    """Find saved postings similar to a saved one (jobId) or to a new posting (jobHtml)."""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    data = (request.get_json(silent=True) or {}) if request.method == 'POST' else {}
+    job_id = data.get('jobId', request.args.get('jobId'))
+    job_html = data.get('jobHtml')
+    try:
+        k = int(data.get('k', request.args.get('k', 10)))
+    except (TypeError, ValueError):
+        k = 10
+    k = max(1, min(k, Config.RANK_MAX_TOP_K))
+    
+    job_index = current_app.extensions['job_index']
+    if job_id:
+        try:
+            results = job_index.similar_to(job_id, k)
+        except IndexNotReadyError as e:
+            response = jsonify({
+                'success': False,
+                'error': str(e)
+            })
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        if results is None:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown jobId: {job_id}'
+            }), 404
+    elif isinstance(job_html, str) and job_html.strip():
+        results = job_index.search(html_posting_text(job_html), k)
+    else:
+        return jsonify({
+            'success': False,
+            'error': 'Provide jobId or jobHtml'
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'results': results
+    })
+
+
+def _validate_tailor_request(data):
+    """Return ``(job_html, resume_data, error)`` for a tailoring request body."""
+    if not data:
+        return None, None, 'No JSON data received'
+    if 'jobHtml' not in data:
+        return None, None, 'Missing jobHtml in request'
+    
+    resume_data, error = _load_resume_data(data)
+    if error:
+        return None, None, error
+    return data.get('jobHtml'), resume_data, None
+
+
+def _load_resume_data(data):
+    """Return ``(resume_data, error)`` from a request body's resumeData field."""
+    if 'resumeData' not in data:
+        return None, 'Missing resumeData in request'
+    
+    resume_data = data.get('resumeData')
+    
+    # Validate resume_data format
+    if not isinstance(resume_data, dict):
+        try:
+            resume_data = json.loads(resume_data)
+        except (TypeError, json.JSONDecodeError):
+            return None, 'resumeData must be a valid JSON object'
+    return resume_data, None
+
+
+def _sse(event: str, payload) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _event_stream(events) -> Response:
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 503 until the preloaded models are warm."""
+    is_ready = MODEL_CACHE.warmed or not Config.MODEL_PRELOAD
+    return jsonify({
+        'ready': is_ready,
+        'models': sorted(MODEL_CACHE.stats()['models'])
+    }), 200 if is_ready else 503
+
+
+@api.route('/stats', methods=['GET'])
+def stats():
+    """Report shared client pool, job queue, cache, model and coalescing usage."""
+    result_cache = current_app.extensions.get('result_cache')
+    semantic_cache = current_app.extensions.get('semantic_cache')
+    job_index = current_app.extensions.get('job_index')
+    return jsonify({
+        'llm_clients': current_app.extensions['llm_clients'].stats(),
+        'job_queue': current_app.extensions['job_queue'].stats(),
+        'result_cache': result_cache.stats() if result_cache else None,
+        'semantic_cache': semantic_cache.stats() if semantic_cache else None,
+        'models': MODEL_CACHE.stats(),
+        'job_index': job_index.stats() if job_index else None,
+        'coalescing': TAILOR_FLIGHTS.stats()
+    })
+
+
+def _flag(data: dict, name: str) -> bool:
+    """Read a boolean option from the JSON body or the query string."""
+    flag = data.get(name, request.args.get(name, False))
+    if isinstance(flag, str):
+        return flag.lower() in ('1', 'true', 'yes')
+    return bool(flag)
+
+
+def _get_improver() -> ResumeImprover:
+    """Build a ResumeImprover on the app's shared LLM client."""
+    return ResumeImprover(
+        model=current_app.extensions['llm_clients'].get(),
+        cache=current_app.extensions.get('result_cache'),
+        semantic_cache=current_app.extensions.get('semantic_cache')
+    )
+
+
+def _get_scorer() -> ResumeScorer:
+    """The app's shared ResumeScorer, created on first use."""
+    scorer = current_app.extensions.get('resume_scorer')
+    if scorer is None:
+        scorer = current_app.extensions['resume_scorer'] = ResumeScorer()
+    return scorer
+
+
+def _enqueue_tailoring(job_html: str, resume_data: dict, use_cache: bool = True):
+    job_queue = current_app.extensions['job_queue']
+    improver = _get_improver()
+    try:
+        job = job_queue.submit(improver.process_resume, resume_data=resume_data, job_html=job_html,
+                               use_cache=use_cache)
+    except QueueFullError as e:
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = '5'
+        return response, 429
+    
+    status_url = url_for('api.get_job', job_id=job.id)
+    response = jsonify({
+        'success': True,
+        'jobId': job.id,
+        'status': job.status,
+        'statusUrl': status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from ..config.config import Config
+from ..utils.vector_index import IVFIndex
+from .prompt_compactor import posting_sentences
+from .resume_scorer import ResumeScorer
+
+SUBMISSION_PREFIX = 'job_submission_'
+
+
+class IndexNotReadyError(Exception):
+    """Raised for a posting that may be saved but isn't indexed before the first sync."""
+
+
+def posting_text(job: Dict) -> str:
+    """Text embedded for a saved posting: title, company, skills and requirements."""
+    parts = [job.get('job_title'), job.get('company')]
+    for section in ('skills', 'requirements'):
+        for items in (job.get(section) or {}).values():
+            parts.extend(items or [])
+    return ". ".join(part.strip() for part in parts if isinstance(part, str) and part.strip())
+
+def html_posting_text(job_html: str) -> str:
+    """Text embedded for a new posting: its sentences without markup or boilerplate.
+
+    Parsing it into the saved postings' fields would take several model
+    calls per query; the EEO and benefits text is what most skews the match.
+    """
+    return ". ".join(sentence.rstrip('.!?;') for sentence in posting_sentences(job_html))
+
+# Indexes to reset in a forked child, before any of its threads can use them
+_INDEXES = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    for job_index in list(_INDEXES):
+        job_index._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+class JobIndex:
+    """Nearest-neighbour search over the postings saved under ``data_dir``.
+
+    Each ``job_submission_<timestamp>/job.yaml`` is embedded once with
+    MiniLM and kept in an ``IVFIndex`` saved to ``index_path``, so a
+    restart only embeds postings added since. Submissions are immutable, so
+    a sync only adds new directories and drops deleted ones. Syncs run on a
+    background thread, started by the first query in each process and
+    repeated every ``sync_interval`` seconds; queries only read the index
+    and see no postings until the first sync has finished (or only those of
+    the saved index).
+    """
+
+    def __init__(
+        self,
+        data_dir: str = None,
+        index_path: str = None,
+        scorer: ResumeScorer = None,
+        nprobe: int = None,
+        sync_interval: float = None
+    ):
+        self.data_dir = data_dir or Config.JOB_DATA_DIR
+        self.index_path = Config.JOB_INDEX_PATH if index_path is None else index_path
+        self.nprobe = nprobe or Config.JOB_INDEX_NPROBE
+        self.sync_interval = Config.JOB_INDEX_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self._scorer = scorer
+        self.index: Optional[IVFIndex] = None
+        # Job id (directory name) -> company and title, for search results
+        self.postings: Dict[str, Dict[str, Optional[str]]] = {}
+        self._loaded = False
+        self._synced_at: Optional[float] = None
+        # _lock guards the index and postings for queries; _sync_lock keeps
+        # one sync at a time, so only the thread holding it changes them
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        _INDEXES.add(self)
+
+    def _after_fork(self):
+        # The parent's sync thread didn't come along, and it may have been
+        # holding the locks
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def scorer(self) -> ResumeScorer:
+        # Created on first use so building the app doesn't open the embedding store
+        if self._scorer is None:
+            self._scorer = ResumeScorer()
+        return self._scorer
+
+    def sync(self, batch_size: int = 256) -> Dict[str, int]:
+        """Index postings added to ``data_dir`` since the last sync and drop removed ones."""
+        with self._sync_lock:
+            return self._sync(batch_size)
+
+    def search(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        """The ``k`` saved postings most similar to ``text``."""
+        self._ensure_syncing()
+        vector = self.scorer.embed_many([text])[0]
+        with self._lock:
+            if self.index is None:
+                return []
+            return self._results(self.index.search(vector, k, self.nprobe))
+
+    def similar_to(self, job_id: str, k: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """The ``k`` saved postings most similar to a saved one; None if it isn't indexed.
+
+        Raises ``IndexNotReadyError`` instead of returning None until the
+        first sync has finished.
+        """
+        self._ensure_syncing()
+        with self._lock:
+            vector = self.index.get(job_id) if self.index is not None else None
+            if vector is None:
+                if self._synced_at is None:
+                    raise IndexNotReadyError("Job index is still being built, retry shortly")
+                return None
+            return self._results(self.index.search(vector, k, self.nprobe, exclude=[job_id]))
+
+    def close(self):
+        """Stop the background syncs, waiting for one in progress to finish."""
+        self._closed.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'postings': len(self.postings),
+                'index': self.index.stats() if self.index is not None else None,
+                'last_sync_age': time.monotonic() - self._synced_at if self._synced_at is not None else None,
+            }
+
+    def _ensure_syncing(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._sync_forever, name="job-index-sync", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _sync_forever(self):
+        while not self._closed.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Job index sync failed: {e}")
+            self._closed.wait(self.sync_interval)
+
+    def _sync(self, batch_size: int = 256) -> Dict[str, int]:
+        # Reading and embedding postings and saving happen outside _lock;
+        # queries only wait while the index itself is updated
+        self._load()
+        on_disk = set(self._submission_ids())
+        removed = [job_id for job_id in self.postings if job_id not in on_disk]
+        added = sorted(on_disk.difference(self.postings))
+        if removed:
+            with self._lock:
+                self.index.remove(removed)
+                for job_id in removed:
+                    del self.postings[job_id]
+
+        indexed = 0
+        for start in range(0, len(added), batch_size):
+            jobs = {}
+            for job_id in added[start:start + batch_size]:
+                job = self._read(job_id)
+                # Unreadable or empty postings are retried on the next sync
+                if job and posting_text(job):
+                    jobs[job_id] = job
+            if not jobs:
+                continue
+            vectors = self.scorer.embed_many([posting_text(job) for job in jobs.values()])
+            with self._lock:
+                if self.index is None:
+                    self.index = IVFIndex(vectors.shape[1], nprobe=self.nprobe)
+                self.index.add(list(jobs), vectors)
+                for job_id, job in jobs.items():
+                    self.postings[job_id] = {'company': job.get('company'), 'job_title': job.get('job_title')}
+            indexed += len(jobs)
+
+        # One save per sync that changed anything, so a burst of new
+        # postings is written once
+        if (indexed or removed) and self.index_path:
+            self._save()
+        self._synced_at = time.monotonic()
+        return {'added': indexed, 'removed': len(removed)}
+
+    def _submission_ids(self) -> List[str]:
+        try:
+            entries = os.scandir(self.data_dir)
+        except FileNotFoundError:
+            return []
+        with entries:
+            return [entry.name for entry in entries
+                    if entry.name.startswith(SUBMISSION_PREFIX) and entry.is_dir()]
+
+    def _read(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.data_dir, job_id, 'job.yaml')) as f:
+                job = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError) as e:
+            print(f"Skipping saved posting {job_id}: {e}")
+            return None
+        return job if isinstance(job, dict) else None
+
+    def _results(self, matches) -> List[Dict[str, Any]]:
+        return [
+            {
+                'jobId': job_id,
+                'score': score,
+                'company': self.postings.get(job_id, {}).get('company'),
+                'jobTitle': self.postings.get(job_id, {}).get('job_title'),
+            }
+            for job_id, score in matches
+        ]
+
+    def _load(self):
+        """Read the saved index once, unless it was built with another embedding model."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path + '.json') as f:
+                saved = json.load(f)
+            if saved.get('namespace') != self.scorer.namespace:
+                print(f"Rebuilding job index: saved for {saved.get('namespace')}, now {self.scorer.namespace}")
+                return
+            index = IVFIndex.load(self.index_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Rebuilding job index: {e}")
+            return
+        index.nprobe = self.nprobe
+        with self._lock:
+            self.index = index
+            self.postings = {job_id: saved['postings'].get(job_id, {}) for job_id in index.keys()}
+
+    def _save(self):
+        # The metadata goes first; _load ignores entries the index doesn't have
+        tmp = self.index_path + '.json.tmp'
+        os.makedirs(os.path.dirname(os.path.abspath(tmp)), exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump({'namespace': self.scorer.namespace, 'postings': self.postings}, f)
+        os.replace(tmp, self.index_path + '.json')
+        self.index.save(self.index_path)
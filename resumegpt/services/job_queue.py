@@ -0,0 +1,191 @@
+import os
+import queue
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot accept more work."""
+
+
+class Job:
+    """A unit of work tracked by the job queue."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict):
+        self.id = uuid.uuid4().hex
+        self.status = Job.QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    @property
+    def done(self) -> bool:
+        return self.status in (Job.SUCCEEDED, Job.FAILED)
+
+    def run(self):
+        self.status = Job.RUNNING
+        self.started_at = time.time()
+        try:
+            self.result = self._fn(*self._args, **self._kwargs)
+            self.status = Job.SUCCEEDED
+        except Exception as e:
+            self.error = str(e)
+            self.status = Job.FAILED
+        finally:
+            self.finished_at = time.time()
+            # Drop references to the (potentially large) inputs once finished
+            self._args = ()
+            self._kwargs = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'jobId': self.id,
+            'status': self.status,
+            'createdAt': self.created_at,
+            'startedAt': self.started_at,
+            'finishedAt': self.finished_at,
+        }
+        if self.status == Job.SUCCEEDED:
+            data['data'] = self.result
+        elif self.status == Job.FAILED:
+            data['error'] = self.error
+        return data
+
+
+# Queues to reset in a forked child, before any of its threads can use them
+_QUEUES = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    # The parent's threads didn't come along, and its locks and queued jobs
+    # may be in any state
+    for job_queue in list(_QUEUES):
+        job_queue._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class JobQueue:
+    """Bounded worker pool that runs jobs in the background.
+
+    Jobs wait in a fixed-size queue; once it is full, ``submit`` raises
+    ``QueueFullError`` instead of blocking so callers can shed load.
+    Finished jobs are kept for ``result_ttl`` seconds so clients can poll
+    for their results. Workers start on the first ``submit`` in each
+    process, so a queue created before a fork (``gunicorn --preload``) gets
+    its own threads in every worker.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 32, result_ttl: float = 3600):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.result_ttl = result_ttl
+        self._reset()
+        _QUEUES.add(self)
+
+    def _reset(self):
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._workers = []
+        self._completed = 0
+        self._rejected = 0
+        self._stopping = False
+        self._pid = None
+
+    def _ensure_workers(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            self._pid = os.getpid()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Job:
+        """Queue ``fn(*args, **kwargs)`` and return its job handle."""
+        self._ensure_workers()
+        self._prune()
+        job = Job(fn, args, kwargs)
+        with self._lock:
+            # Checked with the put under the lock, so no job is queued after
+            # the workers have decided to exit
+            if self._stopping:
+                raise RuntimeError("Job queue is shut down")
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._rejected += 1
+                raise QueueFullError("Job queue is full, try again later")
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == Job.RUNNING)
+            return {
+                'workers': self.max_workers,
+                'max_queue_size': self.max_queue_size,
+                'queued': self._queue.qsize(),
+                'running': running,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and stop the workers once the queued ones have run.
+
+        Never blocks on a full queue. A queue whose workers never started
+        (nothing was submitted in this process) has nothing queued, so it
+        just stops accepting jobs.
+        """
+        with self._lock:
+            self._stopping = True
+            workers = list(self._workers)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _work(self):
+        while True:
+            try:
+                job = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                with self._lock:
+                    if self._stopping and self._queue.empty():
+                        break
+                continue
+            job.run()
+            with self._lock:
+                self._completed += 1
+
+    def _prune(self):
+        """Forget finished jobs whose results have expired."""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.done and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,408 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from pydantic import BaseModel
+
+from ..config.config import Config
+from ..models.resume import Resume
+from ..utils.json_stream import extract_json
+from .prompt_compactor import estimate_tokens
+
+
+def create_gemini_client(model_name: str, temperature: float, max_connections: int = 10):
+    """Build a Gemini chat model whose HTTP client keeps connections alive."""
+    # Imported here so the fake backend works without the Google SDK
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    kwargs = {}
+    if 'client_args' in ChatGoogleGenerativeAI.model_fields:
+        import httpx
+        kwargs['client_args'] = {
+            'limits': httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY
+            )
+        }
+    if Config.GEMINI_API_KEY:
+        kwargs['google_api_key'] = Config.GEMINI_API_KEY
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=temperature,
+        **kwargs
+    )
+
+
+class LLMBackend(ABC):
+    """Interface every chat model backend implements.
+
+    Backends answer prompts with ``invoke``, ``ainvoke`` and ``stream``,
+    which return (or yield) messages with a ``content`` attribute, and
+    support ``with_structured_output(schema)`` for pydantic results. Every
+    call's token counts are added to ``usage()``.
+    """
+
+    name = None
+
+    def __init__(self, model_name: str, temperature: float):
+        self.model = model_name
+        self.temperature = temperature
+        self._usage_lock = threading.Lock()
+        self._usage = {'calls': 0, 'input_tokens': 0, 'output_tokens': 0}
+
+    @abstractmethod
+    def invoke(self, prompt: str, **kwargs) -> AIMessage:
+        ...
+
+    @abstractmethod
+    async def ainvoke(self, prompt: str, **kwargs) -> AIMessage:
+        ...
+
+    @abstractmethod
+    def stream(self, prompt: str, **kwargs) -> Iterator[AIMessageChunk]:
+        ...
+
+    @abstractmethod
+    def with_structured_output(self, schema, **kwargs):
+        ...
+
+    def usage(self) -> Dict[str, int]:
+        with self._usage_lock:
+            return dict(self._usage)
+
+    def _record(self, input_tokens: int, output_tokens: int, calls: int = 1):
+        with self._usage_lock:
+            self._usage['calls'] += calls
+            self._usage['input_tokens'] += input_tokens or 0
+            self._usage['output_tokens'] += output_tokens or 0
+
+    def _record_message(self, message, calls: int = 1):
+        usage = getattr(message, 'usage_metadata', None) or {}
+        self._record(usage.get('input_tokens', 0), usage.get('output_tokens', 0), calls)
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through ``langchain_google_genai``."""
+
+    name = 'gemini'
+
+    def __init__(self, model_name: str, temperature: float, max_connections: int = 10):
+        super().__init__(model_name, temperature)
+        self._client = create_gemini_client(model_name, temperature, max_connections)
+
+    def invoke(self, prompt, **kwargs):
+        message = self._client.invoke(prompt, **kwargs)
+        self._record_message(message)
+        return message
+
+    async def ainvoke(self, prompt, **kwargs):
+        message = await self._client.ainvoke(prompt, **kwargs)
+        self._record_message(message)
+        return message
+
+    def stream(self, prompt, **kwargs):
+        calls = 1
+        for chunk in self._client.stream(prompt, **kwargs):
+            # Chunks carry usage deltas; the call is counted once
+            self._record_message(chunk, calls)
+            calls = 0
+            yield chunk
+
+    def with_structured_output(self, schema, **kwargs):
+        runnable = self._client.with_structured_output(schema, include_raw=True, **kwargs)
+        backend = self
+
+        class Structured:
+            def invoke(self, prompt, **call_kwargs):
+                return backend._structured_result(runnable.invoke(prompt, **call_kwargs))
+
+            async def ainvoke(self, prompt, **call_kwargs):
+                return backend._structured_result(await runnable.ainvoke(prompt, **call_kwargs))
+
+        return Structured()
+
+    def _structured_result(self, output: dict):
+        self._record_message(output.get('raw'))
+        if output.get('parsing_error') is not None:
+            raise output['parsing_error']
+        return output['parsed']
+
+
+class ServiceUnavailable(Exception):
+    """Failure injected by the fake backend, named like the Google API's 503."""
+
+
+class FakeChatBackend(LLMBackend):
+    """Deterministic local stand-in for a hosted model, for tests and benchmarks.
+
+    Answers are derived from the prompt alone: tailoring prompts get a
+    schema-valid ``TailoredResume`` (or section result) built from the
+    resume in the prompt,
+    job post prompts get the company, title or list items taken from the
+    posting, and structured output is filled in for any pydantic schema.
+    Each call waits a time-to-first-token drawn from ``latency_distribution``
+    (``constant``, ``normal`` or ``lognormal`` around ``latency`` seconds,
+    spread by ``jitter``) plus one ``1 / tokens_per_sec`` per output token.
+    The same prompt, seed and call order always give the same answers and
+    timings.
+    """
+
+    name = 'fake'
+    # Distinct prompts whose call count is remembered; older ones start over
+    max_tracked_prompts = 4096
+
+    def __init__(
+        self,
+        model_name: str = 'fake',
+        temperature: float = 0.0,
+        max_connections: int = None,
+        latency: float = None,
+        latency_distribution: str = None,
+        jitter: float = None,
+        tokens_per_sec: float = None,
+        error_rate: float = None,
+        seed: int = None
+    ):
+        # Never share cache entries with the real model of the same name
+        super().__init__(f"fake-{model_name}", temperature)
+        self.latency = Config.FAKE_LLM_LATENCY if latency is None else latency
+        self.latency_distribution = latency_distribution or Config.FAKE_LLM_LATENCY_DISTRIBUTION
+        self.jitter = Config.FAKE_LLM_JITTER if jitter is None else jitter
+        self.tokens_per_sec = tokens_per_sec or Config.FAKE_LLM_TOKENS_PER_SEC
+        self.error_rate = Config.FAKE_LLM_ERROR_RATE if error_rate is None else error_rate
+        self.seed = Config.FAKE_LLM_SEED if seed is None else seed
+        if self.latency_distribution not in ('constant', 'normal', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {self.latency_distribution}")
+        self._seen: "OrderedDict[bytes, int]" = OrderedDict()
+
+    def invoke(self, prompt, **kwargs):
+        content, first_token, per_token = self._plan(prompt)
+        time.sleep(first_token + per_token * estimate_tokens(content))
+        return self._message(prompt, content)
+
+    async def ainvoke(self, prompt, **kwargs):
+        content, first_token, per_token = self._plan(prompt)
+        await asyncio.sleep(first_token + per_token * estimate_tokens(content))
+        return self._message(prompt, content)
+
+    def stream(self, prompt, **kwargs):
+        content, first_token, per_token = self._plan(prompt)
+        time.sleep(first_token)
+        self._record(estimate_tokens(prompt), 0)
+        pieces = re.findall(r'\S+\s*|\s+', content) or ['']
+        for i in range(0, len(pieces), 4):
+            piece = ''.join(pieces[i:i + 4])
+            tokens = estimate_tokens(piece)
+            time.sleep(per_token * tokens)
+            # Counted as generated, so readers that stop early pay only for what they read
+            self._record(0, tokens, calls=0)
+            yield AIMessageChunk(content=piece)
+
+    def with_structured_output(self, schema, **kwargs):
+        backend = self
+
+        class Structured:
+            def invoke(self, prompt, **call_kwargs):
+                parsed, delay = backend._structured(prompt, schema)
+                time.sleep(delay)
+                return parsed
+
+            async def ainvoke(self, prompt, **call_kwargs):
+                parsed, delay = backend._structured(prompt, schema)
+                await asyncio.sleep(delay)
+                return parsed
+
+        return Structured()
+
+    def _plan(self, prompt: str):
+        """Pick this call's answer and timings, or raise an injected failure."""
+        key = hashlib.sha256(prompt.encode('utf-8')).digest()
+        with self._usage_lock:
+            occurrence = self._seen.pop(key, 0) + 1
+            self._seen[key] = occurrence
+            if len(self._seen) > self.max_tracked_prompts:
+                self._seen.popitem(last=False)
+        digest = hashlib.sha256(f"{self.seed}\n{occurrence}\n{prompt}".encode('utf-8')).digest()
+        rng = random.Random(int.from_bytes(digest[:8], 'big'))
+        if self.error_rate and rng.random() < self.error_rate:
+            time.sleep(self.latency)
+            raise ServiceUnavailable("Injected backend failure")
+
+        if self.latency_distribution == 'normal':
+            first_token = max(0.0, rng.gauss(self.latency, self.jitter * self.latency))
+        elif self.latency_distribution == 'lognormal':
+            first_token = self.latency * math.exp(rng.gauss(0.0, self.jitter))
+        else:
+            first_token = self.latency
+        return self._answer(prompt, rng), first_token, 1.0 / self.tokens_per_sec
+
+    def _message(self, prompt: str, content: str) -> AIMessage:
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(content)
+        self._record(input_tokens, output_tokens)
+        return AIMessage(content=content, usage_metadata={
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'total_tokens': input_tokens + output_tokens,
+        })
+
+    def _answer(self, prompt: str, rng: random.Random) -> str:
+        if '"tailored_resume"' in prompt and 'Current Resume:' in prompt:
+            return self._tailored_resume(prompt)
+        if 'Resume section (' in prompt:
+            return self._tailored_section(prompt)
+        posting = _posting_text(prompt)
+        if prompt.startswith("What is the company name"):
+            return _company(posting)
+        if prompt.startswith("What is the job title"):
+            return _title(posting)
+        if prompt.startswith("Extract the"):
+            sentences = _sentences(posting)
+            picked = sorted(rng.sample(range(len(sentences)), min(5, len(sentences))))
+            return '\n'.join(f"- {sentences[i][:80]}" for i in picked)
+        return "OK"
+
+    @staticmethod
+    def _tailored_resume(prompt: str) -> str:
+        job_text = prompt.split('Job Description:', 1)[-1].split('Current Resume:', 1)[0].lower()
+        try:
+            resume = Resume(**extract_json(prompt.split('Current Resume:', 1)[1], schema=Resume))
+        except ValueError:
+            resume = Resume(name='Jane Doe', skills=[], experience=[], education=[])
+
+        # Skills the posting mentions go first, as a real tailoring pass would
+        matched = [skill for skill in resume.skills if skill.lower() in job_text]
+        resume.skills = matched + [skill for skill in resume.skills if skill not in matched]
+        score = round(100 * len(matched) / len(resume.skills)) if resume.skills else 50
+        improvements = [f"Highlighted {skill}" for skill in matched[:3]] or ["Reordered skills"]
+        return json.dumps({
+            'tailored_resume': resume.model_dump(),
+            'match_score': score,
+            'improvements': improvements,
+        }, indent=2)
+
+    @staticmethod
+    def _tailored_section(prompt: str) -> str:
+        job_text = prompt.split('Job Description:', 1)[-1].split('Resume section (', 1)[0].lower()
+        kind, rest = prompt.split('Resume section (', 1)[1].split('):', 1)
+        section = extract_json(rest)
+        if kind == 'skills':
+            matched = [skill for skill in section['skills'] if skill.lower() in job_text]
+            section['skills'] = matched + [skill for skill in section['skills'] if skill not in matched]
+            score = round(100 * len(matched) / len(section['skills'])) if section['skills'] else 50
+            improvements = [f"Highlighted {skill}" for skill in matched[:3]]
+            value = section['skills']
+        else:
+            # Score by how many of the entry's words the posting uses
+            words = set(re.findall(r'[a-z]{3,}', ' '.join(str(v) for v in section.values()).lower()))
+            score = round(100 * sum(word in job_text for word in words) / len(words)) if words else 50
+            improvements = [f"Aligned {kind} wording with the posting"]
+            value = section
+        return json.dumps({kind: value, 'match_score': score, 'improvements': improvements}, indent=2)
+
+    def _structured(self, prompt: str, schema):
+        """Return a schema instance for the prompt and how long it takes to generate."""
+        content, first_token, per_token = self._plan(prompt)
+        try:
+            parsed = schema(**extract_json(content, schema=schema))
+        except ValueError:
+            posting = _posting_text(prompt)
+            hints = {'company': _company(posting), 'job_title': _title(posting)}
+            rng = random.Random(int.from_bytes(hashlib.sha256(prompt.encode('utf-8')).digest()[:8], 'big'))
+            parsed = schema(**_fake_fields(schema, rng, _sentences(posting), hints))
+        # Charge for the JSON the model would have written
+        output_tokens = estimate_tokens(parsed.model_dump_json())
+        self._record(estimate_tokens(prompt), output_tokens)
+        return parsed, first_token + per_token * output_tokens
+
+
+def _posting_text(prompt: str) -> str:
+    if 'Job Posting:' in prompt:
+        text = prompt.split('Job Posting:', 1)[1]
+        return re.split(r'\n\s*Rules:', text, maxsplit=1)[0].strip()
+    return prompt.split('\n', 1)[-1].strip()
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in re.split(r'(?<=[.!?])\s+|\n+', text) if len(s.strip()) > 3] or ['General duties']
+
+
+def _company(posting: str) -> str:
+    match = re.search(r'\b(?:at|join|About)\s+([A-Z][\w&.-]*(?: [A-Z][\w&.-]*)*)', posting)
+    if not match:
+        return 'Acme Corp'
+    words = []
+    for word in match.group(1).split():
+        if word in ('You', 'We', 'Our', 'The', 'This'):
+            break
+        words.append(word)
+    return ' '.join(words).rstrip('.') or 'Acme Corp'
+
+
+def _title(posting: str) -> str:
+    line = next((line.strip() for line in posting.splitlines() if line.strip()), 'Software Engineer')
+    return re.split(r'\s+(?:at|-|\|)\s+', line, maxsplit=1)[0][:60]
+
+
+def _fake_fields(model, rng: random.Random, sentences: List[str], hints: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        name: hints[name] if name in hints else _fake_value(field.annotation, field.metadata, rng, sentences, hints)
+        for name, field in model.model_fields.items()
+    }
+
+
+def _fake_value(annotation, metadata, rng: random.Random, sentences: List[str], hints: Dict[str, str]):
+    """Generate a value that validates against ``annotation``."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        annotation = next(arg for arg in args if arg is not type(None))
+        return _fake_value(annotation, metadata, rng, sentences, hints)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _fake_fields(annotation, rng, sentences, hints)
+    if origin in (list, List):
+        item = args[0] if args else str
+        if item is str:
+            return [s[:80] for s in rng.sample(sentences, min(3, len(sentences)))]
+        return [_fake_value(item, [], rng, sentences, hints) for _ in range(min(3, len(sentences)))]
+    if origin is dict:
+        return {}
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation in (int, float):
+        low = next((m.ge for m in metadata if hasattr(m, 'ge')), 0)
+        high = next((m.le for m in metadata if hasattr(m, 'le')), 100)
+        return annotation(rng.randint(int(low), int(high)))
+    return rng.choice(sentences)[:80]
+
+
+BACKENDS = {
+    GeminiBackend.name: GeminiBackend,
+    FakeChatBackend.name: FakeChatBackend,
+}
+
+
+def create_chat_model(
+    model_name: str = None,
+    temperature: float = None,
+    max_connections: int = None,
+    backend: str = None
+) -> LLMBackend:
+    """Build a chat model on the backend named by ``Config.LLM_BACKEND``."""
+    backend = backend or Config.LLM_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend}")
+    return BACKENDS[backend](
+        model_name or Config.GEMINI_MODEL_NAME,
+        Config.GEMINI_TEMPERATURE if temperature is None else temperature,
+        max_connections or Config.LLM_MAX_CONNECTIONS
+    )
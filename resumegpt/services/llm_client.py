@@ -0,0 +1,352 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from ..config.config import Config
+from ..utils.resilience import (
+    CircuitBreaker, Deadline, DeadlineExceeded, LatencyTracker, backoff_delay, is_retryable
+)
+from .llm_backends import create_chat_model
+
+# Breaker for model clients created outside an LLMClientRegistry
+LLM_BREAKER = CircuitBreaker(Config.LLM_BREAKER_FAILURES, Config.LLM_BREAKER_RESET)
+
+
+class PooledChatModel:
+    """A shared chat model that bounds concurrent calls and counts usage.
+
+    At most ``max_connections`` calls run at once; further callers wait for
+    a free slot instead of opening more connections. Attributes not defined
+    here are forwarded to the wrapped model.
+    """
+
+    def __init__(self, model, max_connections: int):
+        self._model = model
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        with self._slot():
+            return self._model.invoke(prompt, **kwargs)
+
+    async def ainvoke(self, prompt, **kwargs):
+        # Wait for a slot off the event loop so other coroutines keep running
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # Cancelled while waiting (e.g. a losing hedge): the thread still
+            # takes the slot, so hand it back once it has
+            acquiring.add_done_callback(lambda _: self._slots.release())
+            raise
+        self._begin()
+        try:
+            return await self._model.ainvoke(prompt, **kwargs)
+        finally:
+            self._end()
+
+    def stream(self, prompt, **kwargs):
+        with self._slot():
+            if not hasattr(self._model, 'stream'):
+                # Models that can't stream produce their whole reply as one chunk
+                yield self._model.invoke(prompt, **kwargs)
+                return
+            yield from self._model.stream(prompt, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    @contextmanager
+    def _slot(self):
+        self._slots.acquire()
+        self._begin()
+        try:
+            yield
+        finally:
+            self._end()
+
+    def _begin(self):
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+
+    def _end(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+class ResilientChatModel:
+    """Deadlines, retries, hedging and circuit breaking around a chat model.
+
+    Each call gets a time budget of ``deadline`` seconds, shortened by any
+    enclosing ``deadline_scope``. Attempts that fail with a transient error
+    or take longer than ``attempt_timeout`` are retried with jittered
+    backoff while budget remains. With ``hedging`` a second, identical
+    request is sent once the first has run longer than the recent p95
+    latency, and whichever answers first wins. Failures feed ``breaker``,
+    which refuses calls outright while the backend is unhealthy.
+    """
+
+    def __init__(
+        self,
+        model,
+        breaker: Optional[CircuitBreaker] = None,
+        deadline: float = None,
+        attempt_timeout: float = None,
+        max_attempts: int = None,
+        hedging: bool = None,
+        hedge_delay: float = None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self._model = model
+        self.breaker = breaker or LLM_BREAKER
+        self.deadline = Config.LLM_DEADLINE if deadline is None else deadline
+        self.attempt_timeout = Config.LLM_ATTEMPT_TIMEOUT if attempt_timeout is None else attempt_timeout
+        self.max_attempts = max(1, Config.LLM_MAX_ATTEMPTS if max_attempts is None else max_attempts)
+        self.hedging = Config.LLM_HEDGING if hedging is None else hedging
+        self.hedge_delay = Config.LLM_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        self.latency = LatencyTracker()
+        # Sync calls run on these threads so a hung request can be abandoned
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max(4, 2 * Config.LLM_MAX_CONNECTIONS), thread_name_prefix='llm-call'
+        )
+        self._lock = threading.Lock()
+        self.retried = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.timed_out = 0
+
+    def invoke(self, prompt, **kwargs):
+        deadline = Deadline.within(self.deadline)
+        for attempt in range(1, self.max_attempts + 1):
+            self.breaker.before_call()
+            try:
+                result = self._attempt(lambda: self._model.invoke(prompt, **kwargs), deadline)
+            except Exception as e:
+                delay = self._on_failure(e, attempt, deadline)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def ainvoke(self, prompt, **kwargs):
+        deadline = Deadline.within(self.deadline)
+        for attempt in range(1, self.max_attempts + 1):
+            self.breaker.before_call()
+            try:
+                result = await self._aattempt(lambda: self._model.ainvoke(prompt, **kwargs), deadline)
+            except Exception as e:
+                delay = self._on_failure(e, attempt, deadline)
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stream(self, prompt, **kwargs):
+        """Stream the reply, retrying failures that happen before the first chunk.
+
+        The deadline bounds the time to the first chunk; once output is
+        flowing it is passed through as it arrives.
+        """
+        deadline = Deadline.within(self.deadline)
+        for attempt in range(1, self.max_attempts + 1):
+            self.breaker.before_call()
+            try:
+                chunks = iter(self._model.stream(prompt, **kwargs))
+                first = self._attempt(lambda: next(chunks, None), deadline, hedge=False)
+            except Exception as e:
+                delay = self._on_failure(e, attempt, deadline)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            if first is not None:
+                yield first
+                yield from chunks
+            return
+
+    def with_structured_output(self, schema, **kwargs):
+        return ResilientChatModel(
+            self._model.with_structured_output(schema, **kwargs),
+            breaker=self.breaker,
+            deadline=self.deadline,
+            attempt_timeout=self.attempt_timeout,
+            max_attempts=self.max_attempts,
+            hedging=self.hedging,
+            hedge_delay=self.hedge_delay,
+            executor=self._executor
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def _on_failure(self, error: Exception, attempt: int, deadline: Deadline) -> float:
+        """Record a failed attempt and return the backoff before the next one.
+
+        Re-raises ``error`` when it should not or cannot be retried.
+        """
+        if not is_retryable(error) and not isinstance(error, DeadlineExceeded):
+            # The backend answered; the request itself was the problem
+            self.breaker.record_success()
+            raise error
+        self.breaker.record_failure()
+        delay = backoff_delay(attempt, Config.LLM_RETRY_BASE_DELAY, Config.LLM_RETRY_MAX_DELAY)
+        if isinstance(error, DeadlineExceeded) or attempt >= self.max_attempts or delay >= deadline.remaining():
+            raise error
+        with self._lock:
+            self.retried += 1
+        print(f"LLM call failed ({type(error).__name__}: {str(error)}), "
+              f"retrying in {delay:.2f}s ({attempt}/{self.max_attempts - 1})")
+        return delay
+
+    def _timeout_error(self, deadline: Deadline) -> TimeoutError:
+        with self._lock:
+            self.timed_out += 1
+        if deadline.expired:
+            return DeadlineExceeded("LLM call ran out of its time budget")
+        return TimeoutError(f"LLM call took longer than {self.attempt_timeout}s")
+
+    def _hedge_after(self) -> float:
+        return self.latency.percentile(95) or self.hedge_delay
+
+    def _won(self, future_index: int, started: float):
+        self.latency.record(time.monotonic() - started)
+        if future_index > 0:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def _attempt(self, call: Callable, deadline: Deadline, hedge: bool = True):
+        started = time.monotonic()
+        ends = started + min(self.attempt_timeout, deadline.remaining())
+        hedge_at = started + self._hedge_after() if hedge and self.hedging else None
+        futures = [self._executor.submit(call)]
+        while True:
+            now = time.monotonic()
+            until = ends if hedge_at is None or len(futures) > 1 else min(ends, hedge_at)
+            done, _ = wait(futures, timeout=max(0.0, until - now), return_when=FIRST_COMPLETED)
+            for index, future in enumerate(futures):
+                if future in done and future.exception() is None:
+                    self._won(index, started)
+                    return future.result()
+            if all(future.done() for future in futures):
+                raise futures[0].exception()
+            now = time.monotonic()
+            if now >= ends:
+                # Abandon the attempt; its thread finishes in the background
+                raise self._timeout_error(deadline)
+            if hedge_at is not None and len(futures) == 1 and now >= hedge_at:
+                with self._lock:
+                    self.hedged += 1
+                futures.append(self._executor.submit(call))
+
+    async def _aattempt(self, call: Callable, deadline: Deadline):
+        started = time.monotonic()
+        ends = started + min(self.attempt_timeout, deadline.remaining())
+        hedge_at = started + self._hedge_after() if self.hedging else None
+        tasks = [asyncio.ensure_future(call())]
+        try:
+            while True:
+                now = time.monotonic()
+                until = ends if hedge_at is None or len(tasks) > 1 else min(ends, hedge_at)
+                done, _ = await asyncio.wait(tasks, timeout=max(0.0, until - now),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for index, task in enumerate(tasks):
+                    if task in done and task.exception() is None:
+                        self._won(index, started)
+                        return task.result()
+                if all(task.done() for task in tasks):
+                    raise tasks[0].exception()
+                now = time.monotonic()
+                if now >= ends:
+                    raise self._timeout_error(deadline)
+                if hedge_at is not None and len(tasks) == 1 and now >= hedge_at:
+                    with self._lock:
+                        self.hedged += 1
+                    tasks.append(asyncio.ensure_future(call()))
+        finally:
+            # Unlike threads, the losing or timed-out coroutines can be cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+class LLMClientRegistry:
+    """Process-wide registry of chat model clients shared across requests.
+
+    Clients are created once per ``(model_name, temperature)`` and reused by
+    every request and thread, so the HTTP session and auth setup are paid
+    once instead of per request. By default they are built on the backend
+    named by ``Config.LLM_BACKEND``.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        factory: Optional[Callable] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.max_connections = max_connections
+        self._factory = factory or (
+            lambda model_name, temperature: create_chat_model(model_name, temperature, max_connections)
+        )
+        # One breaker for every client: they all talk to the same backend
+        self.breaker = breaker or CircuitBreaker(Config.LLM_BREAKER_FAILURES, Config.LLM_BREAKER_RESET)
+        self._clients: Dict[Tuple[str, float], ResilientChatModel] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def get(self, model_name: str = None, temperature: float = None) -> 'ResilientChatModel':
+        """Return the shared client for a model, creating it on first use."""
+        key = (model_name or Config.GEMINI_MODEL_NAME,
+               Config.GEMINI_TEMPERATURE if temperature is None else temperature)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused += 1
+                return client
+            client = ResilientChatModel(
+                PooledChatModel(self._factory(*key), self.max_connections),
+                breaker=self.breaker
+            )
+            self._clients[key] = client
+            self.created += 1
+            return client
+
+    def warm_up(self, model_name: str = None, temperature: float = None) -> bool:
+        """Create the default client ahead of the first request."""
+        try:
+            self.get(model_name, temperature)
+            return True
+        except Exception as e:
+            # Missing credentials shouldn't stop the app from starting;
+            # the error surfaces again on the first request that needs it.
+            print(f"LLM client warm-up failed: {str(e)}")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            clients = list(self._clients.values())
+            # Token counts from backends that report them
+            usages = [client.usage() for client in clients if callable(getattr(client, 'usage', None))]
+            return {
+                'backend': Config.LLM_BACKEND,
+                'clients': len(clients),
+                'pool_size': self.max_connections,
+                'in_flight': sum(client.in_flight for client in clients),
+                'calls': sum(client.calls for client in clients),
+                'created': self.created,
+                'reused': self.reused,
+                'retried': sum(client.retried for client in clients),
+                'hedged': sum(client.hedged for client in clients),
+                'hedge_wins': sum(client.hedge_wins for client in clients),
+                'timed_out': sum(client.timed_out for client in clients),
+                'circuit': self.breaker.stats(),
+                'input_tokens': sum(usage['input_tokens'] for usage in usages),
+                'output_tokens': sum(usage['output_tokens'] for usage in usages),
+            }
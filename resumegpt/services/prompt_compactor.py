@@ -0,0 +1,158 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+from ..config.config import Config
+from ..models.job_post import JobPost
+from ..models.resume import Resume
+
+# Rough sub-word token count: words and individual punctuation marks
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+# Equal-opportunity and legal statements: never useful for tailoring
+BOILERPLATE_PATTERN = re.compile(
+    r"equal (employment )?opportunit|without regard to|race, colou?r|sexual orientation|"
+    r"gender identity|national origin|protected veteran|veteran status|"
+    r"(regardless of|basis of|because of)\b[^.;]{0,80}\bdisabilit|disability status|"
+    r"(applicants|individuals) with disabilities|reasonable accommodation|e-verify|drug[- ]free|"
+    r"privacy (policy|notice)|applicants? (will|must) be considered",
+    re.IGNORECASE
+)
+
+# Benefits and hiring conditions, matched only when phrased as an offer so
+# that a dental, insurance or HR role's own duties aren't mistaken for them
+BENEFITS_PATTERN = re.compile(
+    r"(we offer|we provide|benefits include|you('ll| will) (get|receive|enjoy)|eligible for|"
+    r"comprehensive|competitive)\b[^.;]{0,40}\b(medical|health|dental|vision|life|insurance|benefits)\b|"
+    r"401\(?k\)?|paid time off|\bpto\b|parental leave|paid holidays|tuition reimbursement|"
+    r"benefits package|our benefits|(our|great|generous) perks|perks (include|such as|like)|"
+    r"salary range|pay range|compensation range|"
+    r"(subject to|contingent (up)?on|pass(ing)? an?|completion of an?)\b[^.;]{0,20}background check",
+    re.IGNORECASE
+)
+
+# Sentences with these cues usually carry the actual requirements
+REQUIREMENT_CUES = ('require', 'must', 'experience', 'responsib', 'qualif', 'skill',
+                    'proficien', 'knowledge', 'familiar', 'degree', 'you will', 'ability')
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to
+we will with you your who what which within about into across all any can more other such
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text`` without a tokenizer."""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def posting_sentences(job_html: str) -> List[str]:
+    """Sentences of a job posting, without markup or boilerplate."""
+    return [s for s in _sentences(job_html) if not _is_boilerplate(s)]
+
+
+class PromptCompactor:
+    """Shrink a job posting to the parts worth sending to the model.
+
+    Markup is stripped with ``JobPost.clean_html_content`` and boilerplate
+    (EEO statements, benefits) is dropped. If the rest still exceeds the
+    token budget, sentences are ranked by their overlap with the resume and
+    the best ones are kept, in their original order, until the budget is
+    used up.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = None,
+        token_counter: Callable[[str], int] = estimate_tokens
+    ):
+        self.token_budget = Config.PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+        self.count_tokens = token_counter
+
+    def compact(self, job_html: str, resume: Resume) -> Tuple[str, Dict[str, int]]:
+        """Return the compacted job text and before/after token counts."""
+        sentences = _sentences(job_html)
+        relevant = [s for s in sentences if not _is_boilerplate(s)]
+
+        costs = [self.count_tokens(s) for s in relevant]
+        if sum(costs) <= self.token_budget:
+            kept = relevant
+        else:
+            kept = self._select(relevant, costs, resume)
+
+        compacted = '\n'.join(kept)
+        stats = {
+            'tokens_before': self.count_tokens(job_html),
+            'tokens_after': self.count_tokens(compacted),
+            'token_budget': self.token_budget,
+            'sentences_total': len(sentences),
+            'sentences_kept': len(kept),
+            'boilerplate_dropped': len(sentences) - len(relevant),
+        }
+        return compacted, stats
+
+    def _select(self, sentences: List[str], costs: List[int], resume: Resume) -> List[str]:
+        """Greedily keep the highest scoring sentences that fit the budget."""
+        scores = self._score(sentences, resume)
+        ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+        chosen, used = set(), 0
+        for i in ranked:
+            if used + costs[i] <= self.token_budget:
+                chosen.add(i)
+                used += costs[i]
+        return [sentences[i] for i in sorted(chosen)]
+
+    def _score(self, sentences: List[str], resume: Resume) -> List[float]:
+        resume_text = ' '.join(
+            [' '.join(resume.skills)]
+            + [f"{exp.title} {exp.description}" for exp in resume.experience]
+            + [edu.degree for edu in resume.education]
+        )
+        resume_terms = set(_terms(resume_text))
+
+        sentence_terms = [_terms(sentence) for sentence in sentences]
+        document_frequency = Counter(term for terms in sentence_terms for term in set(terms))
+        n_sentences = len(sentences)
+
+        scores = []
+        for position, (sentence, terms) in enumerate(zip(sentences, sentence_terms)):
+            if not terms:
+                scores.append(0.0)
+                continue
+            # Rare posting terms that also appear in the resume count the most
+            overlap = sum(
+                math.log(1 + n_sentences / document_frequency[term])
+                for term in set(terms) if term in resume_terms
+            )
+            score = overlap / math.sqrt(len(terms))
+            if _has_requirement_cue(sentence):
+                score += 0.5
+            if position < 2:
+                # The opening lines usually name the role and company
+                score += 1.0
+            scores.append(score)
+        return scores
+
+
+def _sentences(job_html: str) -> List[str]:
+    text = JobPost(job_html).clean_html_content(keep_lines=True)
+    return [s.strip() for s in SENTENCE_BREAK.split(text) if s.strip()]
+
+
+def _has_requirement_cue(sentence: str) -> bool:
+    lowered = sentence.lower()
+    return any(cue in lowered for cue in REQUIREMENT_CUES)
+
+
+def _is_boilerplate(sentence: str) -> bool:
+    # A benefits match in a sentence that also reads as a requirement is kept
+    if BOILERPLATE_PATTERN.search(sentence):
+        return True
+    return bool(BENEFITS_PATTERN.search(sentence)) and not _has_requirement_cue(sentence)
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
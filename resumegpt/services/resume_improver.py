@@ -1,29 +1,368 @@
-from ..models.resume import Resume, TailoredResume
-from langchain_google_genai import ChatGoogleGenerativeAI
+from ..models.job_post import JobPost
+from ..models.resume import (
+    Resume, TailoredResume, TailoredSkills, TailoredExperience, TailoredEducation
+)
 from ..config.config import Config
+from ..utils.json_stream import JSONStreamParser, ANY, extract_json
+from ..utils.resilience import Deadline, DeadlineExceeded, deadline_scope
+from ..utils.result_cache import TailoringCache
+from ..utils.semantic_cache import SemanticCache
+from ..utils.single_flight import SingleFlight
+from .llm_backends import create_chat_model
+from .llm_client import ResilientChatModel
+from .prompt_compactor import PromptCompactor, estimate_tokens
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 
+# Sections of the response emitted as soon as they are complete while streaming
+STREAM_SECTIONS = [
+    ('tailored_resume', 'skills'),
+    ('tailored_resume', 'experience', ANY),
+    ('tailored_resume', 'education'),
+    ('match_score',),
+    ('improvements',),
+]
+
+# Response format of each section prompt in the ``sections`` tailoring mode
+SECTION_SCHEMAS = {
+    'skills': TailoredSkills,
+    'experience': TailoredExperience,
+    'education': TailoredEducation,
+}
+
+TAILOR_MODES = ('monolithic', 'sections')
+
+# Identical tailoring requests in flight at the same time share one model call
+TAILOR_FLIGHTS = SingleFlight()
+
 class ResumeImprover:
-    def __init__(self):
-        self.model = ChatGoogleGenerativeAI(
-            model=Config.GEMINI_MODEL_NAME,
-            temperature=Config.GEMINI_TEMPERATURE
-        )
+    def __init__(
+        self,
+        model=None,
+        cache: Optional[TailoringCache] = None,
+        flights: Optional[SingleFlight] = None,
+        compactor: Optional[PromptCompactor] = None,
+        mode: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
+        self.model = model or ResilientChatModel(create_chat_model(
+            Config.GEMINI_MODEL_NAME,
+            Config.GEMINI_TEMPERATURE
+        ))
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        self.flights = flights or TAILOR_FLIGHTS
+        if compactor is None and Config.PROMPT_COMPACTION:
+            compactor = PromptCompactor()
+        self.compactor = compactor
+        # ``monolithic`` regenerates the resume in one call; ``sections``
+        # tailors each section in its own, concurrent call and merges them
+        self.mode = mode or Config.TAILOR_MODE
+        if self.mode not in TAILOR_MODES:
+            raise ValueError(f"Unknown tailoring mode: {self.mode}")
     
-    def process_resume(self, resume_data: dict, job_html: str) -> dict:
+    def process_resume(self, resume_data: dict, job_html: str, use_cache: bool = True) -> dict:
         try:
             # Validate input resume
             resume = Resume(**resume_data)
+            return self.tailor(resume, job_html, use_cache=use_cache)
             
-            # Clean up the name
-            actual_name = "Dhruv Singh"  # We should extract this from the resume properly
-            
-            prompt = f"""
+        except Exception as e:
+            print(f"Resume processing error: {str(e)}")
+            print(f"Full error details:", e)
+            raise
+
+    def tailor(self, resume: Resume, job_html: str, use_cache: bool = True) -> dict:
+        """Tailor an already validated resume to one job posting."""
+        return self.tailor_with_stats(resume, job_html, use_cache)[0]
+
+    def tailor_with_stats(
+        self,
+        resume: Resume,
+        job_html: str,
+        use_cache: bool = True
+    ) -> Tuple[dict, Optional[Dict[str, int]]]:
+        """Like ``tailor``, also returning the prompt compaction stats.
+
+        The stats are None when the result came from a cache or compaction
+        is off.
+        """
+        request_key = self._request_key(resume, job_html)
+        exact = use_cache and self.cache is not None
+        if exact:
+            cached = self.cache.get(request_key)
+            if cached is not None:
+                return cached, None
+        
+        # The same role reposted elsewhere with slightly different text
+        semantic = self.semantic_cache if use_cache else None
+        if semantic is not None:
+            posting_text = JobPost(job_html).clean_html_content()
+            semantic_key = 'tailored:' + self._request_key(resume, '')
+            cached = semantic.get(posting_text, semantic_key)
+            if cached is not None:
+                return cached, None
+        
+        # Concurrent identical requests wait for the first one's model call
+        result, stats = self.flights.do(request_key, self._generate, resume, job_html)
+        if exact:
+            self.cache.set(request_key, result)
+        if semantic is not None:
+            semantic.set(posting_text, semantic_key, result)
+        return result, stats
+
+    def _generate(self, resume: Resume, job_html: str) -> Tuple[dict, Optional[Dict[str, int]]]:
+        job_text, stats = self._job_text(resume, job_html)
+        if self.mode == 'sections':
+            return self._merge_sections(resume, dict(self._tailor_sections(resume, job_text))), stats
+        
+        prompt = self._build_prompt(resume, job_text)
+        # One time budget shared by parse retries and the client's own retries
+        with deadline_scope(Config.LLM_DEADLINE):
+            return self._request_json(prompt, TailoredResume), stats
+
+    def _request_json(self, prompt: str, schema) -> dict:
+        """Ask the model for JSON matching ``schema`` and return it validated.
+
+        A reply that drifts from the schema is abandoned mid-stream and retried.
+        """
+        attempts = 1 + Config.LLM_PARSE_RETRIES
+        for attempt in range(1, attempts + 1):
+            try:
+                return self._parse_response(self._response_chunks(prompt), schema)
+            except ValueError as e:
+                print(f"Response parse failed (attempt {attempt}/{attempts}): {str(e)}")
+        raise Exception("Failed to parse AI response into valid JSON")
+
+    def _response_chunks(self, prompt: str) -> Iterator[str]:
+        """Stream the model reply, or yield it whole if the model can't stream."""
+        if not hasattr(self.model, 'stream'):
+            yield self.model.invoke(prompt).content
+            return
+        for chunk in self.model.stream(prompt):
+            yield chunk.content
+
+    @staticmethod
+    def _within_deadline(chunks: Iterator[str], deadline: Deadline) -> Iterator[str]:
+        """Advance ``chunks`` inside ``deadline``'s scope, yielding outside it.
+
+        A generator can't keep a context variable set across its yields, so
+        the scope is entered for each step; model calls made by a step,
+        retries included, get no more than the remaining budget.
+        """
+        done = object()
+        while True:
+            with deadline_scope(deadline.remaining()):
+                chunk = next(chunks, done)
+            if chunk is done:
+                return
+            yield chunk
+
+    def tailor_many(
+        self,
+        resume: Resume,
+        job_htmls: List[str],
+        max_concurrency: int = 4,
+        use_cache: bool = True
+    ) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+        """Tailor one resume against several job postings concurrently.
+
+        Yields ``(index, result, error)`` for each posting in completion
+        order, so one slow or failing posting does not hold up the others.
+        """
+        workers = max(1, min(max_concurrency, len(job_htmls)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tailor')
+        try:
+            futures = {
+                executor.submit(self.tailor, resume, job_html, use_cache): index
+                for index, job_html in enumerate(job_htmls)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    yield index, future.result(), None
+                except Exception as e:
+                    print(f"Batch tailoring error for job {index}: {str(e)}")
+                    yield index, None, str(e)
+        finally:
+            # Don't start queued postings if the caller stopped listening
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stream_resume(self, resume_data: dict, job_html: str, use_cache: bool = True) -> Iterator[Tuple[str, Any]]:
+        """Tailor the resume while streaming the model output.
+
+        Yields ``(event, payload)`` pairs: one per section as soon as it has
+        been generated (``skills``, each ``experience`` entry, ``education``,
+        ``match_score``, ``improvements``) and a final ``result`` with the
+        validated tailored resume.
+        """
+        resume = Resume(**resume_data)
+        cache_key = self._request_key(resume, job_html) if use_cache and self.cache is not None else None
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            # Replay the cached result as if it had just been generated
+            parser = JSONStreamParser(watch=STREAM_SECTIONS)
+            for path, value in parser.feed(json.dumps(cached)):
+                yield self._section_event(path, value)
+            yield 'result', cached
+            return
+        
+        if self.mode == 'sections':
+            for event, payload in self._stream_sections(resume, job_html):
+                if event == 'result' and cache_key:
+                    self.cache.set(cache_key, payload)
+                yield event, payload
+            return
+        
+        prompt = self._build_prompt(resume, self._job_text(resume, job_html)[0])
+        # One time budget shared by parse retries and the client's own retries
+        deadline = Deadline.within(Config.LLM_DEADLINE)
+        attempts = 1 + Config.LLM_PARSE_RETRIES
+        for attempt in range(1, attempts + 1):
+            parser = JSONStreamParser(watch=STREAM_SECTIONS, schema=TailoredResume)
+            emitted = False
+            try:
+                for content in self._within_deadline(self._response_chunks(prompt), deadline):
+                    for path, value in parser.feed(content):
+                        emitted = True
+                        yield self._section_event(path, value)
+                    if parser.done:
+                        break
+                if not parser.done:
+                    # Invalid JSON doesn't stop the scan, so it shows up here
+                    raise ValueError("No complete JSON value in model response")
+                break
+            except ValueError as e:
+                print(f"Response parse failed (attempt {attempt}/{attempts}): {str(e)}")
+                # Sections already sent can't be taken back, so only retry a clean start
+                if emitted or attempt == attempts:
+                    raise Exception("Failed to parse AI response into valid JSON")
+                if deadline.expired:
+                    raise DeadlineExceeded("No time left to retry the model response")
+        
+        tailored = TailoredResume(**parser.result)
+        result = tailored.model_dump()
+        if cache_key:
+            self.cache.set(cache_key, result)
+        yield 'result', result
+
+    def _stream_sections(self, resume: Resume, job_html: str) -> Iterator[Tuple[str, Any]]:
+        """Stream events for the ``sections`` mode as each section call finishes."""
+        results = {}
+        for key, section in self._tailor_sections(resume, self._job_text(resume, job_html)[0]):
+            results[key] = section
+            if key[0] == 'skills':
+                yield 'skills', section['skills']
+            elif key[0] == 'experience':
+                yield 'experience', {'index': key[1], 'entry': section['experience']}
+        result = self._merge_sections(resume, results)
+        yield 'education', result['tailored_resume']['education']
+        yield 'match_score', result['match_score']
+        yield 'improvements', result['improvements']
+        yield 'result', result
+
+    def _tailor_sections(self, resume: Resume, job_text: str) -> Iterator[Tuple[tuple, dict]]:
+        """Tailor every section of the resume concurrently.
+
+        Yields ``(key, result)`` in completion order, where ``key`` is
+        ``('skills',)``, ``('experience', i)`` or ``('education', i)``. All
+        calls share one compacted job text and one time budget.
+        """
+        sections = self._sections(resume)
+        if not sections:
+            return
+        deadline = Deadline.within(Config.LLM_DEADLINE)
+        
+        def tailor_section(key, payload):
+            with deadline_scope(deadline.remaining()):
+                prompt = self._section_prompt(job_text, key[0], payload)
+                return self._request_json(prompt, SECTION_SCHEMAS[key[0]])
+        
+        workers = max(1, min(Config.TAILOR_SECTION_CONCURRENCY, len(sections)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tailor-section')
+        try:
+            futures = {executor.submit(tailor_section, key, payload): key for key, payload in sections}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # One failed section fails the resume; don't start the rest
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _sections(resume: Resume) -> List[Tuple[tuple, dict]]:
+        sections = []
+        if resume.skills:
+            sections.append((('skills',), {'skills': resume.skills}))
+        sections += [(('experience', i), exp.model_dump()) for i, exp in enumerate(resume.experience)]
+        sections += [(('education', i), edu.model_dump()) for i, edu in enumerate(resume.education)]
+        return sections
+
+    def _merge_sections(self, resume: Resume, results: Dict[tuple, dict]) -> dict:
+        """Combine per-section results into one ``TailoredResume``.
+
+        The match score is the average of the section scores weighted by
+        each section's size, so a long job entry counts for more than a
+        one-line degree.
+        """
+        weighted, total_weight, improvements = 0.0, 0, []
+        for key, payload in self._sections(resume):
+            section = results[key]
+            weight = estimate_tokens(json.dumps(payload))
+            weighted += section['match_score'] * weight
+            total_weight += weight
+            improvements += [item for item in section['improvements'] if item not in improvements]
+        
+        skills = results[('skills',)]['skills'] if ('skills',) in results else resume.skills
+        tailored = TailoredResume(
+            tailored_resume=Resume(
+                name=resume.name,
+                skills=skills,
+                experience=[results[('experience', i)]['experience'] for i in range(len(resume.experience))],
+                education=[results[('education', i)]['education'] for i in range(len(resume.education))]
+            ),
+            match_score=round(weighted / total_weight) if total_weight else 0,
+            improvements=improvements
+        )
+        return tailored.model_dump()
+
+    @staticmethod
+    def _section_event(path: tuple, value: Any) -> Tuple[str, Any]:
+        if path[-2:-1] == ('experience',):
+            return 'experience', {'index': path[-1], 'entry': value}
+        return path[-1], value
+
+    def _request_key(self, resume: Resume, job_html: str) -> str:
+        """Content hash of everything that determines the model output."""
+        model_name = getattr(self.model, 'model', None) or Config.GEMINI_MODEL_NAME
+        if self.mode != 'monolithic':
+            model_name = f"{model_name}|{self.mode}"
+        temperature = getattr(self.model, 'temperature', None)
+        if temperature is None:
+            temperature = Config.GEMINI_TEMPERATURE
+        return TailoringCache.make_key(job_html, resume.model_dump_json(), str(model_name), temperature)
+
+    def _job_text(self, resume: Resume, job_html: str) -> Tuple[str, Optional[Dict[str, int]]]:
+        """Strip markup and boilerplate and keep the job text within budget.
+
+        Returns the text and its compaction stats (None when compaction is off).
+        """
+        if self.compactor is None:
+            return job_html, None
+        job_text, stats = self.compactor.compact(job_html, resume)
+        print(f"Prompt compaction: {stats['tokens_before']} -> {stats['tokens_after']} job tokens")
+        return job_text, stats
+
+    def _build_prompt(self, resume: Resume, job_text: str) -> str:
+        # Clean up the name
+        actual_name = "Dhruv Singh"  # We should extract this from the resume properly
+        
+        return f"""
             You are a professional resume tailoring assistant. Given the job description and current resume below, 
             create a tailored version that better matches the job requirements.
 
             Job Description:
-            {job_html}
+            {job_text}
             
             Current Resume:
             {resume.model_dump_json(indent=2)}
@@ -58,38 +397,45 @@ class ResumeImprover:
                 "improvements": ["list", "of", "improvements", "made"]
             }}
             """
+
+    def _section_prompt(self, job_text: str, kind: str, payload: dict) -> str:
+        formats = {
+            'skills': '"skills": ["list", "of", "relevant", "skills"]',
+            'experience': '"experience": {"title": "job title", "company": "company name", '
+                          '"description": "single complete description"}',
+            'education': '"education": {"degree": "degree name", "school": "school name", '
+                         '"description": "tailored description"}',
+        }
+        return f"""
+            You are a professional resume tailoring assistant. Given the job description and one
+            section of a resume below, rewrite only that section so it better matches the job.
+
+            Job Description:
+            {job_text}
             
-            # Get response from Gemini
-            response = self.model.invoke(prompt)
-            
-            # Extract and clean the content
-            response_content = response.content
-            print(f"Raw API Response: {response_content}")
-            
-            # Clean the response - remove any markdown formatting
-            cleaned_content = response_content
-            if "```json" in cleaned_content:
-                cleaned_content = cleaned_content.split("```json")[1].split("```")[0]
-            elif "```" in cleaned_content:
-                cleaned_content = cleaned_content.split("```")[1]
-            
-            cleaned_content = cleaned_content.strip()
-            print(f"Cleaned content: {cleaned_content}")
+            Resume section ({kind}):
+            {json.dumps(payload, indent=2)}
             
-            try:
-                result = json.loads(cleaned_content)
-                # Validate output
-                tailored = TailoredResume(**result)
-                return tailored.model_dump()
-            except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {e}")
-                print(f"Failed content: {cleaned_content}")
-                raise Exception("Failed to parse AI response into valid JSON")
+            Important Instructions:
+            1. Keep descriptions concise and single-version only
+            2. Keep the actual titles, company and school names; don't invent new ones
+            3. Format all text properly without truncation
+            4. Score how well this section matches the job from 0 to 100
             
-        except Exception as e:
-            print(f"Resume processing error: {str(e)}")
-            print(f"Full error details:", e)
-            raise
+            Provide a response in the following JSON format ONLY (no markdown, no extra text):
+            {{
+                {formats[kind]},
+                "match_score": 85,
+                "improvements": ["list", "of", "improvements", "made"]
+            }}
+            """
+
+    def _parse_response(self, response_content, schema=TailoredResume) -> dict:
+        """Validate a model reply, given as text or as streamed chunks."""
+        # Fences and prose around the JSON are skipped by the extractor
+        result = extract_json(response_content, schema=schema)
+        tailored = schema(**result)
+        return tailored.model_dump()
 
     def parse_resume_content(self, content):
         lines = content.split('\n')
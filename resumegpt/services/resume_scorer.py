@@ -1,80 +1,365 @@
-from typing import Dict, List
-from transformers import AutoTokenizer, AutoModel
-import torch
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+import re
 import numpy as np
+from ..config.config import Config
+from ..utils import embedding_store
+from ..utils.embedding_store import EmbeddingStore
+from ..utils.embeddings import mean_pooled
+from ..utils.model_cache import EMBEDDING_MODEL, MODEL_CACHE, ModelCache
+
+@lru_cache(maxsize=None)
+def shared_embedding_store() -> Optional[EmbeddingStore]:
+    """The process's embedding store, opened on first use; None if disabled."""
+    if not Config.EMBEDDING_STORE_PATH:
+        return None
+    if not embedding_store.SUPPORTED:
+        print("Embedding store disabled: file locking (fcntl) is not available on this platform")
+        return None
+    return EmbeddingStore(Config.EMBEDDING_STORE_PATH, hot_entries=Config.EMBEDDING_STORE_HOT_ENTRIES)
+
+# JobSkills categories scored by _score_skills_match
+SKILL_CATEGORIES = ('technical_skills', 'non_technical_skills', 'ats_keywords')
+
+# Common spellings mapped to one canonical name, matched without the model
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'react.js': 'react',
+    'reactjs': 'react',
+    'vue.js': 'vue',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'nlp': 'natural language processing',
+    'ai': 'artificial intelligence',
+    'aws': 'amazon web services',
+    'gcp': 'google cloud platform',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+}
+
+def normalize_skill(skill: str) -> str:
+    """Lowercased, whitespace-collapsed skill name with aliases resolved."""
+    name = re.sub(r'\s+', ' ', skill).strip().strip('.,;:').lower()
+    return SKILL_ALIASES.get(name, name)
+
+def _unique_skills(skills) -> Dict[str, str]:
+    """Map normalized names to the first spelling seen, in order."""
+    unique: Dict[str, str] = {}
+    for skill in skills:
+        if isinstance(skill, str) and skill.strip():
+            unique.setdefault(normalize_skill(skill), skill.strip())
+    return unique
+
+def _resume_skill_list(resume_skills) -> List[str]:
+    """Flatten resume skills given as a list, a dict of lists or a list of {'skills': [...]} groups."""
+    if isinstance(resume_skills, dict):
+        resume_skills = list(resume_skills.values())
+    skills: List[str] = []
+    for item in resume_skills or []:
+        if isinstance(item, str):
+            skills.append(item)
+        elif isinstance(item, dict):
+            skills.extend(item.get('skills', []))
+        else:
+            skills.extend(item)
+    return skills
+
+def _job_skill_categories(job_skills) -> Dict[str, Dict[str, str]]:
+    if hasattr(job_skills, 'model_dump'):
+        job_skills = job_skills.model_dump()
+    categories = {name: _unique_skills(job_skills.get(name) or []) for name in SKILL_CATEGORIES}
+    return {name: skills for name, skills in categories.items() if skills}
+
+def _skills_text(skills: List[str]) -> str:
+    return ", ".join(_unique_skills(skills))
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the ``k`` highest scores in each row, best first."""
+    if k < scores.shape[1]:
+        # Partial selection, then sort only the k selected
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
 
 class ResumeScorer:
-    def __init__(self):
-        self.tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
-        self.model = AutoModel.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
+    def __init__(self, models: ModelCache = None, store: Optional[EmbeddingStore] = None):
+        # MiniLM comes from the shared registry, loaded on first use
+        self.models = models or MODEL_CACHE
+        self.store = store if store is not None else shared_embedding_store()
+        # Stored vectors are only valid for the same model, precision and pooling
+        self.namespace = f"{EMBEDDING_MODEL}|{self.models.quantization}|masked-mean-l2"
+        
+    def embed_many(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        """L2-normalized embeddings for ``texts``, one row per text.
+
+        Texts are deduplicated, looked up in the embedding store, and the rest
+        sorted by length and batched so each batch pads only to its own
+        longest text; padding is masked out of the mean.
+        """
+        batch_size = batch_size or Config.EMBEDDING_BATCH_SIZE
+        unique = list(dict.fromkeys(texts))
+        keys = {text: EmbeddingStore.key(text, self.namespace) for text in unique}
+        found = self.store.get_many(list(keys.values())) if self.store is not None else [None] * len(unique)
+        vectors = dict(zip(unique, found))
+        missing = sorted((text for text in unique if vectors[text] is None), key=len)
+        
+        if missing:
+            with self.models.use_transformer(EMBEDDING_MODEL) as (tokenizer, model):
+                computed = mean_pooled(tokenizer, model, missing, batch_size, normalize=True)
+            vectors.update(zip(missing, computed))
+            if self.store is not None:
+                self.store.put_many([keys[text] for text in missing], computed)
+        
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.ascontiguousarray(np.stack([vectors[text] for text in texts]), dtype=np.float32)
         
     def _get_embeddings(self, text: str) -> np.ndarray:
         """Get embeddings for text using transformer model."""
-        inputs = self.tokenizer(text, padding=True, truncation=True, return_tensors="pt")
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-        return outputs.last_hidden_state.mean(dim=1).numpy()
+        return self.embed_many([text])
+        
+    def _vectors(self, texts: List[str], known: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """Map each of ``texts`` to its embedding, embedding only those not in ``known``."""
+        vectors = dict(known or {})
+        missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing:
+            vectors.update(zip(missing, self.embed_many(missing)))
+        return vectors
         
     def calculate_match_score(
         self, 
         resume_data: Dict, 
         job_data: Dict
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Any]:
         """Calculate how well the resume matches the job requirements."""
+        experiences = resume_data['experiences']
+        education = resume_data['education']
+        requirements = job_data['requirements']
+        # One batched forward pass for every text the section scores compare
+        vectors = self._vectors([
+            self._experience_text(experiences),
+            self._education_text(education),
+            " ".join(requirements),
+        ] + self._skill_texts_to_embed(resume_data['skills'], job_data['skills']))
+        skills = self.match_skills(resume_data['skills'], job_data['skills'], vectors)
         scores = {
-            'skills_match': self._score_skills_match(
-                resume_data['skills'], 
-                job_data['skills']
-            ),
-            'experience_match': self._score_experience_match(
-                resume_data['experiences'], 
-                job_data['requirements']
-            ),
-            'education_match': self._score_education_match(
-                resume_data['education'], 
-                job_data['requirements']
-            )
+            'skills_match': skills['score'],
+            'experience_match': self._score_experience_match(experiences, requirements, vectors),
+            'education_match': self._score_education_match(education, requirements, vectors)
         }
         
         scores['overall_match'] = sum(scores.values()) / len(scores)
+        scores['skill_matches'] = skills['matches']
         return scores
 
+    def rank(
+        self,
+        resumes: List[Dict],
+        jobs: List[Dict],
+        top_k: int = 10,
+        by: str = 'job',
+        chunk_size: int = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Rank resumes for each job (``by='job'``) or jobs for each resume (``by='resume'``).
+
+        Resumes and jobs have the shapes ``calculate_match_score`` takes. Each
+        corpus is embedded once, in one batch per side, and section scores
+        are matrix products of the normalized embeddings. Skills compare the
+        joined skill lists as one text each, a coarser signal than
+        ``match_skills`` that scales to whole corpora. Queries are scored
+        ``chunk_size`` at a time, keeping only their top ``top_k``, so memory
+        grows with the chunk rather than with resumes x jobs.
+        """
+        if by not in ('job', 'resume'):
+            raise ValueError(f"Unknown ranking direction: {by}")
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        chunk_size = chunk_size or Config.RANK_CHUNK_SIZE
+        if not resumes or not jobs:
+            return [[] for _ in (jobs if by == 'job' else resumes)]
+        
+        resume_skills, experience, education = self._embed_corpus([
+            [_skills_text(_resume_skill_list(resume.get('skills'))) for resume in resumes],
+            [self._experience_text(resume.get('experiences', [])) for resume in resumes],
+            [self._education_text(resume.get('education', [])) for resume in resumes],
+        ])
+        job_skills, requirements = self._embed_corpus([
+            [_skills_text([skill for skills in _job_skill_categories(job.get('skills') or {}).values()
+                           for skill in skills.values()]) for job in jobs],
+            [" ".join(job.get('requirements') or []) for job in jobs],
+        ])
+        # Same conventions as the per-pair scores for empty sections
+        has_resume_skills = np.array([bool(_resume_skill_list(r.get('skills'))) for r in resumes])
+        has_education = np.array([bool(r.get('education')) for r in resumes])
+        has_job_skills = np.array([bool(_job_skill_categories(j.get('skills') or {})) for j in jobs])
+        has_requirements = np.array([bool(j.get('requirements')) for j in jobs])
+        
+        def section_scores(rows: slice, columns: slice):
+            """Resumes ``rows`` x jobs ``columns`` section scores."""
+            skills = resume_skills[rows] @ job_skills[columns].T
+            skills = np.where(has_resume_skills[rows, None], skills, 0.0)
+            skills = np.where(has_job_skills[None, columns], skills, 1.0)
+            experience_match = experience[rows] @ requirements[columns].T
+            experience_match = np.where(has_requirements[None, columns], experience_match, 1.0)
+            education_match = education[rows] @ requirements[columns].T
+            education_match = np.where(has_education[rows, None] & has_requirements[None, columns],
+                                       education_match, 0.0)
+            return skills, experience_match, education_match
+        
+        query_count = len(jobs) if by == 'job' else len(resumes)
+        k = min(top_k, len(resumes) if by == 'job' else len(jobs))
+        rankings = []
+        for start in range(0, query_count, chunk_size):
+            queries = slice(start, min(start + chunk_size, query_count))
+            if by == 'job':
+                sections = [score.T for score in section_scores(slice(None), queries)]
+            else:
+                sections = list(section_scores(queries, slice(None)))
+            overall = (sections[0] + sections[1] + sections[2]) / 3
+            best = _top_k(overall, k)
+            picked = [np.take_along_axis(score, best, axis=1) for score in [overall] + sections]
+            for row in range(len(best)):
+                rankings.append([
+                    {
+                        'index': int(best[row, i]),
+                        'overall_match': float(picked[0][row, i]),
+                        'skills_match': float(picked[1][row, i]),
+                        'experience_match': float(picked[2][row, i]),
+                        'education_match': float(picked[3][row, i]),
+                    }
+                    for i in range(k)
+                ])
+        return rankings
+
+    def _embed_corpus(self, sections: List[List[str]]) -> List[np.ndarray]:
+        """Embed equally long lists of section texts in one batch, one matrix per section."""
+        embeddings = self.embed_many([text for texts in sections for text in texts])
+        return list(embeddings.reshape(len(sections), len(sections[0]), -1))
+
     def _score_skills_match(self, resume_skills: Dict[str, List[str]], job_skills: Dict[str, List[str]]) -> float:
         """Calculate skills match score using semantic similarity."""
-        # Implementation
+        return self.match_skills(resume_skills, job_skills)['score']
 
-    def _score_experience_match(self, experiences: List[Dict], requirements: List[str]) -> float:
-        """Calculate experience match score using semantic similarity."""
-        if not requirements:
-            return 1.0
+    def _skill_texts_to_embed(self, resume_skills, job_skills) -> List[str]:
+        """Normalized skills match_skills will embed: none if every job skill matches exactly."""
+        resume = _unique_skills(_resume_skill_list(resume_skills))
+        pending = [
+            name for skills in _job_skill_categories(job_skills).values()
+            for name in skills if name not in resume
+        ]
+        return list(resume) + pending if resume and pending else []
+
+    def match_skills(
+        self,
+        resume_skills: Union[Dict[str, List[str]], List],
+        job_skills: Union[Dict[str, List[str]], Any],
+        vectors: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict[str, Any]:
+        """Match every job skill to its most similar resume skill, per ``JobSkills`` category.
+
+        Skills that are equal after normalization and alias resolution match
+        with similarity 1.0 without the model. The others are embedded in one
+        batch and compared with a single matrix product over all categories.
+        A job skill is covered when its best similarity reaches
+        ``Config.SKILL_MATCH_THRESHOLD``. Each category scores the mean of
+        its best similarities; ``score`` is the mean over categories.
+        """
+        threshold = Config.SKILL_MATCH_THRESHOLD
+        resume = _unique_skills(_resume_skill_list(resume_skills))
+        categories = _job_skill_categories(job_skills)
+        
+        # (category, normalized name) of job skills without an exact match
+        pending = [
+            (category, name) for category, skills in categories.items()
+            for name in skills if name not in resume
+        ]
+        best: Dict[tuple, tuple] = {}
+        if pending and resume:
+            resume_names = list(resume)
+            vectors = self._vectors(resume_names + [name for _, name in pending], vectors)
+            resume_matrix = np.stack([vectors[name] for name in resume_names])
+            job_matrix = np.stack([vectors[name] for _, name in pending])
+            similarity = job_matrix @ resume_matrix.T
+            closest = similarity.argmax(axis=1)
+            for row, item in enumerate(pending):
+                best[item] = (resume_names[closest[row]], float(similarity[row, closest[row]]))
         
-        experience_text = " ".join([
+        result = {'categories': {}, 'matches': []}
+        for category, skills in categories.items():
+            similarities, missing = [], []
+            for name, job_skill in skills.items():
+                if name in resume:
+                    resume_name, score, exact = name, 1.0, True
+                else:
+                    resume_name, score = best.get((category, name), (None, 0.0))
+                    score, exact = min(max(score, 0.0), 1.0), False
+                similarities.append(score)
+                if score >= threshold:
+                    result['matches'].append({
+                        'category': category,
+                        'job_skill': job_skill,
+                        'resume_skill': resume[resume_name],
+                        'similarity': score,
+                        'exact': exact,
+                    })
+                else:
+                    missing.append(job_skill)
+            result['categories'][category] = {
+                'score': float(np.mean(similarities)),
+                'coverage': 1.0 - len(missing) / len(skills),
+                'missing': missing,
+            }
+        
+        # Nothing is missing from a posting that lists no skills
+        category_scores = [entry['score'] for entry in result['categories'].values()]
+        result['score'] = float(np.mean(category_scores)) if category_scores else 1.0
+        return result
+
+    @staticmethod
+    def _experience_text(experiences: List[Dict]) -> str:
+        return " ".join([
             " ".join(exp.get('highlights', [])) 
             for exp in experiences
         ])
-        
-        # Calculate semantic similarity using transformers
-        exp_emb = self._get_embeddings(experience_text)
-        req_emb = self._get_embeddings(" ".join(requirements))
-        
-        similarity = cosine_similarity(exp_emb, req_emb)[0][0]
-        return float(similarity)
 
-    def _score_education_match(self, education: List[Dict], requirements: List[str]) -> float:
-        """Calculate education match score using semantic similarity."""
-        if not requirements or not education:
-            return 0.0
-        
-        education_text = " ".join([
+    @staticmethod
+    def _education_text(education: List[Dict]) -> str:
+        return " ".join([
             f"{edu.get('school', '')} {' '.join(deg.get('names', []))}"
             for edu in education
             for deg in edu.get('degrees', [])
         ])
+
+    def _score_experience_match(
+        self, experiences: List[Dict], requirements: List[str], vectors: Optional[Dict[str, np.ndarray]] = None
+    ) -> float:
+        """Calculate experience match score using semantic similarity."""
+        if not requirements:
+            return 1.0
         
-        # Calculate semantic similarity using transformers
-        edu_emb = self._get_embeddings(education_text)
-        req_emb = self._get_embeddings(" ".join(requirements))
+        experience_text = self._experience_text(experiences)
+        requirements_text = " ".join(requirements)
+        vectors = self._vectors([experience_text, requirements_text], vectors)
+        # Embeddings are normalized, so the dot product is the cosine similarity
+        return float(vectors[experience_text] @ vectors[requirements_text])
+
+    def _score_education_match(
+        self, education: List[Dict], requirements: List[str], vectors: Optional[Dict[str, np.ndarray]] = None
+    ) -> float:
+        """Calculate education match score using semantic similarity."""
+        if not requirements or not education:
+            return 0.0
         
-        similarity = cosine_similarity(edu_emb, req_emb)[0][0]
-        return float(similarity) 
\ No newline at end of file
+        education_text = self._education_text(education)
+        requirements_text = " ".join(requirements)
+        vectors = self._vectors([education_text, requirements_text], vectors)
+        return float(vectors[education_text] @ vectors[requirements_text])
@@ -0,0 +1,236 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no flock, and files that are memory-mapped can't be replaced
+    fcntl = None
+
+# True where the store can run (POSIX file locks)
+SUPPORTED = fcntl is not None
+
+MAGIC = b'RGEMB1\0\0'
+HEADER = struct.Struct('<8sI4x')
+KEY_BYTES = 16
+
+
+class EmbeddingStore:
+    """Persistent embedding cache keyed by content hash, shared across processes.
+
+    Vectors are appended as float32 rows to ``<path>.f32``, which readers
+    memory-map, so every worker process on a host shares one copy of the
+    pages. ``<path>.idx`` holds the 16-byte key of each row in row order; a
+    row is visible once its key is written, and rows written by other
+    processes are picked up on the next miss. A bounded LRU of recently used
+    vectors sits in front of the file. Appends and ``compact`` take an
+    exclusive lock on ``<path>.lock``; reloading the index takes a shared one.
+    """
+
+    def __init__(self, path: str, hot_entries: int = 4096):
+        if not SUPPORTED:
+            raise OSError("EmbeddingStore needs POSIX file locks (fcntl)")
+        self.path = path
+        self.hot_entries = hot_entries
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._row_count = 0
+        self._index_offset = 0
+        self._index_inode = None
+        self._matrix: Optional[np.ndarray] = None
+        self._hot: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hot_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._open_lock_file()
+        with self._lock:
+            self._refresh()
+
+    def _open_lock_file(self):
+        # flock locks belong to the open file, which a forked child would share
+        # with its parent, so each process opens its own
+        self._lock_file = open(self.path + '.lock', 'a+b')
+        self._pid = os.getpid()
+
+    @staticmethod
+    def key(text: str, namespace: str = '') -> bytes:
+        """Key for ``text`` embedded by the model/pooling named by ``namespace``."""
+        return hashlib.blake2b(f"{namespace}\0{text}".encode('utf-8'), digest_size=KEY_BYTES).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """Vectors for ``keys``, None where the store has none."""
+        with self._lock:
+            found = [self._get(key) for key in keys]
+            if any(vector is None for vector in found) and self._index_changed():
+                self._refresh()
+                found = [vector if vector is not None else self._get(key) for vector, key in zip(found, keys)]
+            self._counters['misses'] += sum(vector is None for vector in found)
+            return found
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray):
+        """Append vectors for keys the store doesn't have yet."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        with self._lock:
+            if self.dim is not None and vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+            self._flock(fcntl.LOCK_EX)
+            try:
+                # Another process may have appended or compacted meanwhile
+                self._refresh(locked=True)
+                new = {}
+                for key, vector in zip(keys, vectors):
+                    if key not in self._rows and key not in new:
+                        new[key] = vector
+                if new:
+                    self._append(list(new), np.stack(list(new.values())))
+                    self._refresh(locked=True)
+            finally:
+                self._flock(fcntl.LOCK_UN)
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+            self._counters['stores'] += len(keys)
+
+    def compact(self, max_rows: Optional[int] = None) -> int:
+        """Rewrite the files without duplicate rows, keeping the newest ``max_rows``.
+
+        Returns how many rows were dropped.
+        """
+        with self._lock:
+            self._flock(fcntl.LOCK_EX)
+            try:
+                self._refresh(locked=True)
+                # _rows maps each key to its last row
+                kept = sorted(self._rows.values())
+                if max_rows is not None:
+                    kept = kept[-max_rows:] if max_rows > 0 else []
+                dropped = self._row_count - len(kept)
+                if dropped:
+                    keys = self._read_keys(HEADER.size)
+                    vectors = np.array(self._matrix[kept]) if kept else np.zeros((0, self.dim), np.float32)
+                    self._write_files([keys[row] for row in kept], vectors)
+                    self._hot.clear()
+                    self._refresh(locked=True)
+                return dropped
+            finally:
+                self._flock(fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                'rows': self._row_count,
+                'unique_keys': len(self._rows),
+                'hot_entries': len(self._hot),
+                'file_bytes': self._row_count * (self.dim or 0) * 4,
+            }
+
+    def close(self):
+        with self._lock:
+            self._matrix = None
+            self._lock_file.close()
+
+    def _flock(self, operation: int):
+        if self._pid != os.getpid():
+            self._open_lock_file()
+        fcntl.flock(self._lock_file, operation)
+
+    def _get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look a key up in the hot tier, then the file; caller holds the lock."""
+        vector = self._hot.get(key)
+        if vector is not None:
+            self._hot.move_to_end(key)
+            self._counters['hot_hits'] += 1
+            return vector
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        self._counters['disk_hits'] += 1
+        vector = np.array(self._matrix[row])
+        self._remember(key, vector)
+        return vector
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        if self.hot_entries <= 0:
+            return
+        self._hot[key] = vector
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_entries:
+            self._hot.popitem(last=False)
+
+    def _index_changed(self) -> bool:
+        try:
+            stat = os.stat(self.path + '.idx')
+        except FileNotFoundError:
+            return False
+        return stat.st_ino != self._index_inode or stat.st_size > self._index_offset
+
+    def _refresh(self, locked: bool = False):
+        """Load index entries written since the last refresh and remap the matrix."""
+        if not locked:
+            self._flock(fcntl.LOCK_SH)
+        try:
+            try:
+                stat = os.stat(self.path + '.idx')
+            except FileNotFoundError:
+                return
+            if stat.st_ino != self._index_inode:
+                # New or compacted files: start over
+                with open(self.path + '.idx', 'rb') as f:
+                    magic, dim = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError(f"{self.path}.idx is not an embedding index")
+                self.dim = dim
+                self._rows = {}
+                self._row_count = 0
+                self._index_offset = HEADER.size
+                self._index_inode = stat.st_ino
+                self._matrix = None
+            if stat.st_size > self._index_offset:
+                for key in self._read_keys(self._index_offset):
+                    self._rows[key] = self._row_count
+                    self._row_count += 1
+                self._index_offset = HEADER.size + self._row_count * KEY_BYTES
+            if self._row_count and (self._matrix is None or len(self._matrix) < self._row_count):
+                self._matrix = np.memmap(self.path + '.f32', dtype=np.float32, mode='r',
+                                         shape=(self._row_count, self.dim))
+        finally:
+            if not locked:
+                self._flock(fcntl.LOCK_UN)
+
+    def _read_keys(self, offset: int) -> List[bytes]:
+        with open(self.path + '.idx', 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        # Ignore a partly written trailing key
+        count = len(data) // KEY_BYTES
+        return [data[i * KEY_BYTES:(i + 1) * KEY_BYTES] for i in range(count)]
+
+    def _append(self, keys: List[bytes], vectors: np.ndarray):
+        """Append rows; caller holds the exclusive file lock."""
+        if self.dim is None:
+            self._write_files([], np.zeros((0, vectors.shape[1]), np.float32))
+            self._refresh(locked=True)
+        row_bytes = self.dim * 4
+        with open(self.path + '.f32', 'r+b') as f:
+            # Drop vectors whose keys were never written, e.g. after a crash
+            f.truncate(self._row_count * row_bytes)
+            f.seek(0, os.SEEK_END)
+            f.write(vectors.tobytes())
+        # Writing the keys last publishes the rows
+        with open(self.path + '.idx', 'ab') as f:
+            f.write(b''.join(keys))
+
+    def _write_files(self, keys: List[bytes], vectors: np.ndarray):
+        """Replace both files; the index goes last so readers never see a newer index than matrix."""
+        for suffix, data in (('.f32', vectors.astype(np.float32).tobytes()),
+                             ('.idx', HEADER.pack(MAGIC, vectors.shape[1]) + b''.join(keys))):
+            tmp = f"{self.path}{suffix}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self.path + suffix)
@@ -0,0 +1,24 @@
+from typing import List
+
+import numpy as np
+
+
+def mean_pooled(tokenizer, model, texts: List[str], batch_size: int = 32, normalize: bool = False) -> np.ndarray:
+    """Masked mean-pooled embeddings for ``texts``, one row per text.
+
+    Padding is masked out of the mean, so a text embeds the same whatever
+    batch it is in. ``normalize`` scales each row to unit length.
+    """
+    import torch
+    rows: List[np.ndarray] = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                           max_length=512, return_tensors="pt")
+        with torch.no_grad():
+            hidden = model(**inputs).last_hidden_state
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        if normalize:
+            pooled = torch.nn.functional.normalize(pooled, dim=1)
+        rows.append(pooled.numpy().astype(np.float32, copy=False))
+    return np.concatenate(rows) if rows else np.zeros((0, 0), dtype=np.float32)
@@ -0,0 +1,322 @@
+import json
+import typing
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# Matches any array index when used inside a watched path
+ANY = '*'
+
+
+class SchemaDriftError(ValueError):
+    """Raised when streamed JSON stops matching the expected schema."""
+
+    def __init__(self, path: tuple, message: str):
+        super().__init__(f"{'.'.join(str(p) for p in path) or '<root>'}: {message}")
+        self.path = path
+
+
+class JSONStreamParser:
+    """Incrementally scan a JSON object as it arrives in chunks.
+
+    Text before the root ``{`` (markdown fences, prose) is skipped; if what
+    follows a ``{`` turns out not to be JSON, as in ``Here is {your}
+    resume``, scanning resumes just after it. Every time a value whose path
+    matches one of the ``watch`` patterns is closed, ``feed`` returns it as a ``(path, value)`` pair, so callers can act on a
+    section of the response before the whole document has been generated.
+
+    Paths are tuples of object keys and array indexes, e.g.
+    ``('tailored_resume', 'experience', 0)``; ``ANY`` in a pattern matches
+    any array index.
+
+    With a ``schema`` (a pydantic model or a type such as ``List[str]``)
+    every value is checked as soon as it is read: a value of the wrong kind
+    or a missing required field raises ``SchemaDriftError`` without waiting
+    for the rest of the document. Keys the schema doesn't declare are
+    ignored, as pydantic ignores them. A
+    list schema makes the parser look for a root ``[`` instead of ``{``.
+    """
+
+    def __init__(self, watch: Sequence[Sequence] = (), schema: Any = None):
+        self.watch = [tuple(pattern) for pattern in watch]
+        self.schema = schema
+        self._root = '[' if _kind(schema) == 'array' else '{'
+        self.buffer = ''
+        self.result = None
+        self.done = False
+        self._rescan_from(0)
+
+    def feed(self, chunk: str) -> List[Tuple[tuple, Any]]:
+        """Consume the next chunk of text and return newly completed values.
+
+        Raises ``SchemaDriftError`` as soon as a value stops matching the
+        schema; invalid JSON only ends a candidate value, not the scan.
+        """
+        events = []
+        self.buffer += chunk
+        while True:
+            try:
+                self._scan(events)
+                return events
+            except SchemaDriftError:
+                raise
+            except ValueError:
+                if not self._stack:
+                    raise
+                # The candidate was prose such as "{your}": look for the
+                # root again just after where it opened
+                self._rescan_from(self._stack[0]['start'] + 1)
+
+    def _rescan_from(self, pos: int):
+        self._pos = pos
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._string_path = None
+        self._string_is_key = False
+        self._scalar_start = None
+        self._scalar_path = None
+        self._value_type = None
+
+    def _scan(self, events: list):
+        while self._pos < len(self.buffer) and not self.done:
+            i = self._pos
+            ch = self.buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._end_string(i, events)
+                continue
+
+            if self._scalar_start is not None:
+                if ch not in ',]} \t\r\n':
+                    continue
+                self._complete(self._scalar_path, self._scalar_start, i, events)
+                self._scalar_start = None
+
+            if not self._stack:
+                # Skip everything until the root value opens
+                if ch == self._root:
+                    self._start_value(ch, (), i, self.schema)
+                continue
+
+            if ch in ' \t\r\n':
+                continue
+
+            frame = self._stack[-1]
+            expect = frame['expect']
+            if frame['kind'] == 'object':
+                if expect == 'key' and ch == '"':
+                    self._start_string(i, None, is_key=True)
+                elif expect in ('key', 'comma') and ch == '}':
+                    self._close(i, events)
+                elif expect == 'colon' and ch == ':':
+                    frame['expect'] = 'value'
+                elif expect == 'value':
+                    frame['expect'] = 'comma'
+                    self._start_value(ch, frame['path'] + (frame['key'],), i, frame['child'])
+                elif expect == 'comma' and ch == ',':
+                    frame['expect'] = 'key'
+                else:
+                    self._fail(i)
+            else:
+                if expect == 'value' and ch == ']' and frame['index'] < 0:
+                    self._close(i, events)
+                elif expect == 'value':
+                    frame['expect'] = 'comma'
+                    frame['index'] += 1
+                    self._start_value(ch, frame['path'] + (frame['index'],), i, frame['child'])
+                elif expect == 'comma' and ch == ',':
+                    frame['expect'] = 'value'
+                elif expect == 'comma' and ch == ']':
+                    self._close(i, events)
+                else:
+                    self._fail(i)
+
+    @property
+    def started(self) -> bool:
+        return bool(self._stack) or self.done
+
+    @staticmethod
+    def _frame(kind: str, path: tuple, start: int, annotation: Any) -> dict:
+        return {
+            'kind': kind,
+            'path': path,
+            'start': start,
+            'key': None,
+            'index': -1,
+            'expect': 'key' if kind == 'object' else 'value',
+            'annotation': annotation,
+            # Expected type of the next value; arrays know it up front
+            'child': _item_type(annotation) if kind == 'array' else None,
+            'keys': set(),
+        }
+
+    def _start_value(self, ch: str, path: tuple, i: int, annotation: Any = None):
+        kind = 'object' if ch == '{' else 'array' if ch == '[' else 'scalar'
+        expected = _kind(annotation)
+        if expected is not None and expected != kind:
+            raise SchemaDriftError(path, f"expected {expected}, got {kind}")
+
+        if ch == '{':
+            self._stack.append(self._frame('object', path, i, annotation))
+        elif ch == '[':
+            self._stack.append(self._frame('array', path, i, annotation))
+        elif ch == '"':
+            self._start_string(i, path, is_key=False)
+            self._value_type = annotation
+        elif ch in '-0123456789tfn':
+            self._scalar_start = i
+            self._scalar_path = path
+            self._value_type = annotation
+        else:
+            self._fail(i)
+
+    def _start_string(self, i: int, path: Optional[tuple], is_key: bool):
+        self._in_string = True
+        self._string_start = i
+        self._string_path = path
+        self._string_is_key = is_key
+
+    def _end_string(self, i: int, events: list):
+        if self._string_is_key:
+            frame = self._stack[-1]
+            key = json.loads(self.buffer[self._string_start:i + 1])
+            frame['key'] = key
+            frame['keys'].add(key)
+            frame['child'] = _field_type(frame['annotation'], frame['path'] + (key,))
+            frame['expect'] = 'colon'
+        else:
+            self._complete(self._string_path, self._string_start, i + 1, events)
+
+    def _close(self, i: int, events: list):
+        frame = self._stack.pop()
+        model = _unwrap(frame['annotation'])
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            missing = [name for name, field in model.model_fields.items()
+                       if field.is_required() and name not in frame['keys']]
+            if missing:
+                raise SchemaDriftError(frame['path'], f"missing {', '.join(missing)}")
+        if self._stack:
+            self._complete(frame['path'], frame['start'], i + 1, events)
+        else:
+            self.result = json.loads(self.buffer[frame['start']:i + 1])
+            self.done = True
+
+    def _complete(self, path: tuple, start: int, end: int, events: list):
+        value_type, self._value_type = self._value_type, None
+        watched = any(self._matches(pattern, path) for pattern in self.watch)
+        if not watched and _kind(value_type) != 'scalar':
+            return
+        try:
+            value = json.loads(self.buffer[start:end])
+        except json.JSONDecodeError:
+            self._fail(start)
+        if _kind(value_type) == 'scalar':
+            try:
+                _adapter(value_type).validate_python(value)
+            except ValidationError as e:
+                raise SchemaDriftError(path, e.errors()[0]['msg'])
+        if watched:
+            events.append((path, value))
+
+    @staticmethod
+    def _matches(pattern: tuple, path: tuple) -> bool:
+        if len(pattern) != len(path):
+            return False
+        return all(p == ANY and isinstance(q, int) or p == q for p, q in zip(pattern, path))
+
+    def _fail(self, i: int):
+        raise ValueError(f"Invalid JSON at offset {i}: {self.buffer[max(0, i - 20):i + 20]!r}")
+
+
+def extract_json(chunks: Union[str, Iterable[str]], schema: Any = None) -> Any:
+    """Parse the first JSON value out of a model reply, text or chunks.
+
+    Markdown fences and prose around the value are skipped. Chunks are
+    consumed only until the value is complete, and a chunk iterator
+    (e.g. a streaming model response) is closed as soon as the value ends
+    or stops matching ``schema``, so a bad generation is not paid for in
+    full. Raises ``ValueError`` (``SchemaDriftError`` for schema problems)
+    if no complete, valid value is found.
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    parser = JSONStreamParser(schema=schema)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            if parser.done:
+                return parser.result
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+    raise ValueError("Incomplete JSON in model response" if parser.started
+                     else "No JSON found in model response")
+
+
+def _unwrap(annotation: Any) -> Any:
+    """Strip ``Annotated`` and ``Optional`` down to the underlying type."""
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Annotated:
+            annotation = typing.get_args(annotation)[0]
+        elif origin is Union:
+            args = [a for a in typing.get_args(annotation) if a is not type(None)]
+            if len(args) != 1:
+                return None
+            annotation = args[0]
+        else:
+            return annotation
+
+
+def _kind(annotation: Any) -> Optional[str]:
+    """What JSON value ``annotation`` needs, or None if anything goes."""
+    annotation = _unwrap(annotation)
+    if annotation is None or annotation is Any:
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return 'object'
+    origin = typing.get_origin(annotation) or annotation
+    if origin is dict:
+        return 'object'
+    if origin in (list, tuple, set, frozenset):
+        return 'array'
+    if origin in (str, int, float, bool):
+        return 'scalar'
+    return None
+
+
+def _item_type(annotation: Any) -> Any:
+    args = typing.get_args(_unwrap(annotation))
+    return args[0] if args else None
+
+
+def _field_type(annotation: Any, path: tuple) -> Any:
+    """Type of ``path[-1]`` inside an object of type ``annotation``."""
+    annotation = _unwrap(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        field = annotation.model_fields.get(path[-1])
+        if field is None:
+            # Like pydantic, ignore extra keys: their values go unchecked
+            return None
+        # Keep constraints such as ge/le so they are checked too
+        return field.rebuild_annotation()
+    if typing.get_origin(annotation) is dict:
+        args = typing.get_args(annotation)
+        return args[1] if len(args) == 2 else None
+    return None
+
+
+@lru_cache(maxsize=256)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
@@ -0,0 +1,62 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class KeywordMatcher:
+    """Find many keywords in one pass over a text (Aho-Corasick).
+
+    Matches are plain substrings, like ``keyword in text``. Building the
+    automaton is linear in the total keyword length; a search is linear in
+    the text length plus the number of matches, however many keywords there
+    are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        for keyword in dict.fromkeys(keywords):
+            if keyword:
+                self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str):
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = nxt
+        self._output[node] += (keyword,)
+
+    def _link(self):
+        """Breadth-first fail links; each node also reports its suffixes' keywords."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield ``(start, keyword)`` for every occurrence, overlapping ones included."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword in output[node]:
+                yield end - len(keyword), keyword
+
+    def found(self, text: str) -> set:
+        """Keywords that occur anywhere in ``text``."""
+        return {keyword for _, keyword in self.finditer(text)}
@@ -1,17 +1,235 @@
-from functools import lru_cache
-from transformers import pipeline, AutoTokenizer, AutoModel
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from ..config.config import Config
+from .quantization import QUANTIZATION_MODES, quantize
+
+NER_MODEL = "dbmdz/bert-large-cased-finetuned-conll03-english"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def model_bytes(value: Any) -> int:
+    """Bytes held by the weights and buffers of a model, pipeline or tuple of them."""
+    if isinstance(value, (tuple, list)):
+        return sum(model_bytes(item) for item in value)
+    # Pipelines keep their torch module in .model
+    module = value if hasattr(value, 'state_dict') else getattr(value, 'model', None)
+    if not hasattr(module, 'state_dict'):
+        return 0
+    # The state dict also holds quantized weights, which aren't parameters
+    return _tensor_bytes(module.state_dict().values(), set())
+
+
+def _tensor_bytes(values, seen: set) -> int:
+    total = 0
+    for value in values:
+        if isinstance(value, (tuple, list)):
+            total += _tensor_bytes(value, seen)
+        elif hasattr(value, 'numel'):
+            # Tied weights appear under several names
+            ptr = value.data_ptr() if hasattr(value, 'data_ptr') else id(value)
+            if ptr not in seen:
+                seen.add(ptr)
+                total += value.numel() * value.element_size()
+    return total
+
 
 class ModelCache:
-    @lru_cache(maxsize=None)
-    def get_ner_pipeline():
-        return pipeline("ner", model="dbmdz/bert-large-cased-finetuned-conll03-english")
-        
-    @lru_cache(maxsize=None)
-    def get_sentiment_pipeline():
-        return pipeline("sentiment-analysis")
-        
-    @lru_cache(maxsize=None)
-    def get_transformer_model(model_name="sentence-transformers/all-MiniLM-L6-v2"):
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModel.from_pretrained(model_name)
-        return tokenizer, model 
\ No newline at end of file
+    """Process-wide registry of the transformer models, loaded on first use.
+
+    Each model is registered by name with a loader and loaded at most once,
+    even when several threads ask for it at the same time. Callers hold a
+    model through ``use`` while running it; once the loaded weights exceed
+    ``max_bytes`` (0 for no limit), models nobody is using are evicted least
+    recently used first and reloaded on their next use. With ``quantization``
+    set to ``'int8'`` every model is dynamically quantized after loading.
+
+    ``preload`` loads, warms up and pins models ahead of the first request,
+    e.g. in a pre-fork server's master so workers share the weights
+    copy-on-write instead of each loading its own.
+    """
+
+    def __init__(self, max_bytes: int = 0, quantization: str = 'none'):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization}")
+        self.max_bytes = max_bytes
+        self.quantization = quantization
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._pinned = set()
+        self.warmed = False
+        self._counters = {'loads': 0, 'hits': 0, 'evictions': 0}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self._lock:
+            self._loaders[name] = loader
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """Lend out a model; it is not evicted until the block exits."""
+        value = self._acquire(name)
+        try:
+            yield value
+        finally:
+            self._release(name)
+
+    def get(self, name: str) -> Any:
+        """Return a model without holding it; prefer ``use`` for long work."""
+        with self.use(name) as value:
+            return value
+
+    def get_ner_pipeline(self):
+        return self.get('ner')
+
+    def get_sentiment_pipeline(self):
+        return self.get('sentiment')
+
+    def get_transformer_model(self, model_name: str = EMBEDDING_MODEL):
+        with self.use_transformer(model_name) as loaded:
+            return loaded
+
+    def use_transformer(self, model_name: str = EMBEDDING_MODEL):
+        """Lend out ``(tokenizer, model)`` for any Hugging Face model name."""
+        with self._lock:
+            self._loaders.setdefault(model_name, lambda: load_transformer(model_name))
+        return self.use(model_name)
+
+    def preload(self, names: Optional[Iterable[str]] = None):
+        """Load, warm up and pin ``names`` (all registered models by default)."""
+        for name in list(names or self._loaders):
+            with self.use(name) as value:
+                _warm_up(value)
+                with self._lock:
+                    # Evicting a shared model would make every worker reload its own copy
+                    self._pinned.add(name)
+        self.warmed = True
+
+    def evict(self, name: str) -> bool:
+        """Drop a loaded model unless it is in use or pinned."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry['leases'] or name in self._pinned:
+                return False
+            del self._entries[name]
+            self._counters['evictions'] += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                'max_bytes': self.max_bytes,
+                'quantization': self.quantization,
+                'warmed': self.warmed,
+                'total_bytes': sum(entry['bytes'] for entry in self._entries.values()),
+                'models': {
+                    name: {'bytes': entry['bytes'], 'in_use': entry['leases'], 'pinned': name in self._pinned}
+                    for name, entry in self._entries.items()
+                },
+            }
+
+    def _lease(self, name: str):
+        """Lease a loaded model or return None; caller holds the lock."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        entry['leases'] += 1
+        self._entries.move_to_end(name)
+        self._counters['hits'] += 1
+        return entry
+
+    def _acquire(self, name: str) -> Any:
+        with self._lock:
+            entry = self._lease(name)
+            if entry is not None:
+                return entry['value']
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model: {name}")
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # One thread loads, the others wait and then find it loaded
+        with load_lock:
+            with self._lock:
+                entry = self._lease(name)
+                if entry is not None:
+                    return entry['value']
+            value = quantize(self._loaders[name](), self.quantization)
+            size = model_bytes(value)
+            with self._lock:
+                self._entries[name] = {'value': value, 'bytes': size, 'leases': 1}
+                self._counters['loads'] += 1
+                self._evict_over_ceiling()
+        print(f"Loaded model {name} ({size / 2 ** 20:.1f} MiB)")
+        return value
+
+    def _release(self, name: str):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry['leases'] -= 1
+            self._evict_over_ceiling()
+
+    def _evict_over_ceiling(self):
+        """Evict idle models, least recently used first; caller holds the lock."""
+        if not self.max_bytes:
+            return
+        total = sum(entry['bytes'] for entry in self._entries.values())
+        for name in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            entry = self._entries[name]
+            if entry['leases'] or name in self._pinned:
+                continue
+            del self._entries[name]
+            total -= entry['bytes']
+            self._counters['evictions'] += 1
+
+
+def _modules(value: Any) -> list:
+    """Torch modules inside a model, pipeline or tuple of them."""
+    if isinstance(value, (tuple, list)):
+        return [module for item in value for module in _modules(item)]
+    module = value if hasattr(value, 'state_dict') else getattr(value, 'model', None)
+    return [module] if hasattr(module, 'state_dict') else []
+
+
+def _warm_up(value: Any):
+    """Run one inference so lazy allocations happen now, and freeze the weights."""
+    for module in _modules(value):
+        module.eval()
+        module.requires_grad_(False)
+    if isinstance(value, tuple):
+        tokenizer, model = value
+        import torch
+        with torch.no_grad():
+            model(**tokenizer("warm up", return_tensors="pt"))
+    elif callable(value):
+        value("warm up")
+
+
+def load_ner_pipeline():
+    from transformers import pipeline
+    return pipeline("ner", model=NER_MODEL, aggregation_strategy=Config.NER_AGGREGATION)
+
+
+def load_sentiment_pipeline():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis")
+
+
+def load_transformer(model_name: str):
+    from transformers import AutoTokenizer, AutoModel
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    return tokenizer, model
+
+
+# Shared by ResumeParser, JobAnalyzer, ResumeScorer and the semantic cache
+MODEL_CACHE = ModelCache(max_bytes=Config.MODEL_CACHE_MAX_BYTES, quantization=Config.MODEL_QUANTIZATION)
+MODEL_CACHE.register('ner', load_ner_pipeline)
+MODEL_CACHE.register('sentiment', load_sentiment_pipeline)
+MODEL_CACHE.register(EMBEDDING_MODEL, lambda: load_transformer(EMBEDDING_MODEL))
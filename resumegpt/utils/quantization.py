@@ -0,0 +1,59 @@
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+QUANTIZATION_MODES = ('none', 'int8')
+
+
+def quantize(value: Any, mode: str = 'int8') -> Any:
+    """Dynamically quantize the Linear layers of a model, pipeline or tuple of them.
+
+    Weights are stored as int8 and activations quantized on the fly, which
+    suits CPU-only hosts: about a quarter of the weight memory and faster
+    matrix multiplies, for a small accuracy loss (see ``embedding_drift`` and
+    ``entity_f1``). Tokenizers and other values are returned unchanged.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    if mode == 'none':
+        return value
+    if isinstance(value, tuple):
+        return tuple(quantize(item, mode) for item in value)
+
+    import torch
+    if isinstance(value, torch.nn.Module):
+        return torch.ao.quantization.quantize_dynamic(value.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+    # Pipelines keep their torch module in .model
+    if isinstance(getattr(value, 'model', None), torch.nn.Module):
+        value.model = quantize(value.model, mode)
+    return value
+
+
+def embedding_drift(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """Cosine similarity between matching rows of two embedding matrices."""
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = np.sum(reference * candidate, axis=1)
+    return {'mean_cosine': float(cosines.mean()), 'min_cosine': float(cosines.min())}
+
+
+def _entity_set(entities: Iterable[Dict[str, Any]]) -> set:
+    return {(e.get('entity_group') or e.get('entity'), e['start'], e['end']) for e in entities}
+
+
+def entity_f1(reference: Sequence[List[Dict[str, Any]]], candidate: Sequence[List[Dict[str, Any]]]) -> Dict[str, float]:
+    """Precision, recall and F1 of candidate NER output against a reference.
+
+    Entities match when label and character span are equal; texts are paired
+    by position.
+    """
+    true_positive = predicted = expected = 0
+    for ref, cand in zip(reference, candidate):
+        ref_set, cand_set = _entity_set(ref), _entity_set(cand)
+        true_positive += len(ref_set & cand_set)
+        predicted += len(cand_set)
+        expected += len(ref_set)
+    precision = true_positive / predicted if predicted else 1.0
+    recall = true_positive / expected if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': precision, 'recall': recall, 'f1': f1}
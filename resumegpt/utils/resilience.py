@@ -0,0 +1,164 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Class names of errors worth retrying: timeouts, dropped connections,
+# rate limiting and 5xx responses from the Google and httpx client stacks.
+RETRYABLE_ERROR_NAMES = frozenset({
+    'TimeoutError', 'ConnectionError', 'DeadlineExceeded', 'ServiceUnavailable',
+    'ResourceExhausted', 'InternalServerError', 'TooManyRequests', 'BadGateway',
+    'GatewayTimeout', 'TransportError', 'RemoteProtocolError', 'ServerError',
+})
+
+_current_deadline: ContextVar[Optional['Deadline']] = ContextVar('resumegpt_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The time budget for a request ran out."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The backend is considered unhealthy and calls are being refused."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM backend unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for transient backend failures, judged by exception class name."""
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given 1-based retry number."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class Deadline:
+    """A point in time by which a request has to be finished."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @classmethod
+    def within(cls, seconds: float) -> 'Deadline':
+        """A deadline ``seconds`` from now, or the current scope's if sooner."""
+        deadline = cls(seconds)
+        scoped = _current_deadline.get()
+        if scoped is not None and scoped.expires_at < deadline.expires_at:
+            return scoped
+        return deadline
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Share one time budget between every model call made inside the block.
+
+    Nested scopes can only shorten the budget, never extend it.
+    """
+    deadline = Deadline.within(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies for picking a hedging delay."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th percentile (0-100), or None until enough samples exist."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """Fail fast while a backend keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused with ``CircuitOpenError`` for ``reset_timeout``
+    seconds. Then a single trial call is let through: success closes the
+    circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise ``CircuitOpenError`` unless a call may go ahead now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            retry_after = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and retry_after <= 0:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(max(retry_after, 0.0))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'opened': self.opened,
+                'rejected': self.rejected,
+            }
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TailoringCache:
+    """Two-tier cache for tailoring results keyed by content hash.
+
+    The first tier is an in-process LRU bounded by entry count and total
+    size; the second is a SQLite file shared across processes and restarts,
+    whose entries expire after ``ttl`` seconds. Values are stored as JSON so
+    every ``get`` returns a fresh copy.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        db_path: Optional[str] = None,
+        ttl: float = 7 * 24 * 3600
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db_ready = False
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+
+    @staticmethod
+    def make_key(job_text: str, resume_json: str, model_name: str, temperature: float) -> str:
+        """Hash everything that determines the model output."""
+        normalized_job = re.sub(r'\s+', ' ', job_text or '').strip()
+        payload = json.dumps([normalized_job, resume_json, model_name, float(temperature)])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return json.loads(raw)
+
+        raw = self._disk_get(key)
+        with self._lock:
+            if raw is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+            self._remember(key, raw)
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any):
+        raw = json.dumps(value)
+        with self._lock:
+            self._remember(key, raw)
+            self._counters['stores'] += 1
+        self._disk_set(key, raw)
+
+    def evict_expired(self) -> int:
+        """Delete expired rows from the disk tier and return how many went."""
+        if not self.db_path:
+            return 0
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),)).rowcount
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+            }
+
+    def _remember(self, key: str, raw: str):
+        """Insert into the LRU tier; caller holds the lock."""
+        if len(raw) > self.max_bytes or self.max_entries <= 0:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = raw
+        self._memory_bytes += len(raw)
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._db_ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        if not self._db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            self._db_ready = True
+        return conn
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if not self.db_path:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value FROM results WHERE key = ? AND expires_at >= ?",
+                    (key, time.time())
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Result cache read failed: {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, raw: str):
+        if not self.db_path:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, raw, time.time() + self.ttl)
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Result cache write failed: {str(e)}")
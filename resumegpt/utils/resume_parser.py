@@ -1,18 +1,12 @@
 from typing import Dict, Any, Union
 import re
 import yaml
-from PyPDF2 import PdfReader
-from docx import Document
-import textract
-from transformers import pipeline, AutoTokenizer, AutoModel
-import torch
+from .model_cache import MODEL_CACHE, ModelCache
 
 class ResumeParser:
-    def __init__(self):
-        # Initialize transformers models
-        self.ner_pipeline = pipeline("ner", model="dbmdz/bert-large-cased-finetuned-conll03-english")
-        self.tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
-        self.model = AutoModel.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
+    def __init__(self, models: ModelCache = None):
+        # NER comes from the shared registry, loaded on first use
+        self.models = models or MODEL_CACHE
         
     def parse_resume(self, file_path: str) -> Dict[str, Any]:
         """Parse resume from various file formats into structured data."""
@@ -55,6 +49,8 @@ class ResumeParser:
 
     def parse_pdf_resume(self, file_path: str) -> Dict[str, Any]:
         """Parse PDF resume into structured data."""
+        # Document libraries are imported on first use to keep startup fast
+        from PyPDF2 import PdfReader
         try:
             reader = PdfReader(file_path)
             text = ""
@@ -68,6 +64,7 @@ class ResumeParser:
 
     def parse_word_resume(self, file_path: str) -> Dict[str, Any]:
         """Parse Word document resume into structured data."""
+        from docx import Document
         try:
             doc = Document(file_path)
             text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
@@ -99,7 +96,8 @@ class ResumeParser:
         
         # Use NER pipeline for name and location
         text = sections.get('basic', '')
-        entities = self.ner_pipeline(text)
+        with self.models.use('ner') as ner_pipeline:
+            entities = ner_pipeline(text)
         
         for entity in entities:
             if entity['entity_group'] == 'PER':
@@ -123,5 +121,6 @@ class ResumeParser:
 
     def extract_entities(self, text):
         """Extract named entities using transformers NER pipeline."""
-        entities = self.ner_pipeline(text)
+        with self.models.use('ner') as ner_pipeline:
+            entities = ner_pipeline(text)
         return [(entity['word'], entity['entity_group']) for entity in entities] 
\ No newline at end of file
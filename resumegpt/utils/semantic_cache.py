@@ -0,0 +1,150 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def minilm_embedder() -> Callable[[str], np.ndarray]:
+    """Embed text with ``ResumeScorer.embed_many``.
+
+    Postings share the scorer's MiniLM model, pooling and embedding store,
+    so the lookup and the later store of one posting embed it once. The
+    scorer is created on the first call, not when the embedder is built.
+    """
+    scorer = None
+
+    def embed(text: str) -> np.ndarray:
+        nonlocal scorer
+        if scorer is None:
+            # Imported here: the services package imports the utils
+            from ..services.resume_scorer import ResumeScorer
+            scorer = ResumeScorer()
+        return scorer.embed_many([text])[0]
+
+    return embed
+
+
+class SemanticCache:
+    """Reuse results across near-duplicate job postings.
+
+    The same role is often posted on several job boards with slightly
+    different text, which defeats exact-hash caching. Each posting is
+    embedded and compared by cosine similarity with the postings seen
+    before; if the nearest one scores at least ``threshold`` its stored
+    values are reused. Embedding neighbours that share fewer than
+    ``min_overlap`` of their words (Jaccard) are treated as false
+    positives and overridden, e.g. two different roles on one company
+    template.
+
+    Memory is bounded: at most ``max_entries`` postings, each holding at
+    most ``values_per_entry`` values (parsed posting, tailoring results
+    per resume), both evicted least recently used first.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], np.ndarray],
+        threshold: float = 0.92,
+        min_overlap: float = 0.6,
+        max_entries: int = 1024,
+        values_per_entry: int = 16
+    ):
+        self.embed = embed
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.max_entries = max_entries
+        self.values_per_entry = values_per_entry
+        self._vectors: Optional[np.ndarray] = None
+        self._words: List[Optional[frozenset]] = [None] * max_entries
+        self._values: List[Optional["OrderedDict[str, Any]"]] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'false_positive_overrides': 0, 'stores': 0, 'evictions': 0}
+
+    def get(self, text: str, key: str) -> Optional[Any]:
+        """Return the value stored under ``key`` for ``text`` or a near duplicate."""
+        vector, words = self._features(text)
+        with self._lock:
+            slot = self._nearest(vector, words)
+            values = self._values[slot] if slot is not None else None
+            if values is None or key not in values:
+                self._counters['misses'] += 1
+                return None
+            values.move_to_end(key)
+            self._touch(slot)
+            self._counters['hits'] += 1
+            return values[key]
+
+    def set(self, text: str, key: str, value: Any):
+        vector, words = self._features(text)
+        with self._lock:
+            slot = self._nearest(vector, words, count=False)
+            if slot is None:
+                slot = self._allocate(vector, words)
+            values = self._values[slot]
+            values[key] = value
+            values.move_to_end(key)
+            while len(values) > self.values_per_entry:
+                values.popitem(last=False)
+            self._touch(slot)
+            self._counters['stores'] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                'entries': self._size,
+                'vector_bytes': 0 if self._vectors is None else self._vectors.nbytes,
+            }
+
+    def _features(self, text: str):
+        vector = np.asarray(self.embed(text), dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector, frozenset(WORD_PATTERN.findall(text.lower()))
+
+    def _nearest(self, vector: np.ndarray, words: frozenset, count: bool = True) -> Optional[int]:
+        """Slot of the closest stored posting above the threshold; caller holds the lock."""
+        if not self._size:
+            return None
+        similarities = self._vectors[:self._size] @ vector
+        slot = int(np.argmax(similarities))
+        if similarities[slot] < self.threshold:
+            return None
+        if _jaccard(words, self._words[slot]) < self.min_overlap:
+            if count:
+                self._counters['false_positive_overrides'] += 1
+            return None
+        return slot
+
+    def _allocate(self, vector: np.ndarray, words: frozenset) -> int:
+        """Store a new posting, evicting the least recently used if full."""
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        if self._size < self.max_entries:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(np.argmin(self._last_used))
+            self._counters['evictions'] += 1
+        self._vectors[slot] = vector
+        self._words[slot] = words
+        self._values[slot] = OrderedDict()
+        return slot
+
+    def _touch(self, slot: int):
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
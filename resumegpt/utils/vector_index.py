@@ -0,0 +1,222 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: ``k`` unit-length centroids for L2-normalized ``vectors``."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Reseed lists that ended up empty with random vectors
+        empty = norms[:, 0] == 0
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = sums / norms
+    return centroids.astype(np.float32)
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+    """Index of the nearest centroid for each vector, in chunks to bound memory."""
+    return np.concatenate([
+        np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), chunk_size)
+    ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+
+class _InvertedList:
+    """Vectors of one cluster, stored contiguously so a probe is one matrix product."""
+
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.ids: List[str] = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, key: str, vector: np.ndarray) -> int:
+        size = len(self.ids)
+        if size == len(self.vectors):
+            grown = np.zeros((max(16, size * 2), self.vectors.shape[1]), dtype=np.float32)
+            grown[:size] = self.vectors
+            self.vectors = grown
+        self.vectors[size] = vector
+        self.ids.append(key)
+        return size
+
+    def pop(self, position: int) -> Optional[str]:
+        """Remove a row by moving the last one into it; returns the moved id, if any."""
+        last = len(self.ids) - 1
+        moved = None
+        if position != last:
+            self.vectors[position] = self.vectors[last]
+            self.ids[position] = moved = self.ids[last]
+        self.ids.pop()
+        return moved
+
+
+class IVFIndex:
+    """Inverted-file index over L2-normalized vectors, searched by inner product.
+
+    Vectors are clustered with k-means into ``nlist`` lists (about the square
+    root of the size when ``nlist`` is 0); a search scores the centroids,
+    then only the vectors of the ``nprobe`` nearest lists. Until the index
+    holds ``train_threshold`` vectors it is a single list searched exactly.
+    Insertion assigns to the nearest centroid, deletion swaps the last row
+    of a list into the gap, and the clustering is redone once the index has
+    grown ``retrain_growth`` times since it was last trained.
+    """
+
+    def __init__(self, dim: int, nlist: int = 0, nprobe: int = 8,
+                 train_threshold: int = 1024, retrain_growth: float = 4.0):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.retrain_growth = retrain_growth
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+        self.trained_size = 0
+        self._lists = [_InvertedList(dim)]
+        self._where: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key: str):
+        return key in self._where
+
+    def keys(self) -> List[str]:
+        return list(self._where)
+
+    @property
+    def trained(self) -> bool:
+        return len(self.centroids) > 0
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray):
+        """Insert vectors, replacing any already stored under the same keys."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+        lists = assign(vectors, self.centroids) if self.trained else np.zeros(len(keys), dtype=np.int64)
+        for key, vector, list_no in zip(keys, vectors, lists):
+            if key in self._where:
+                self.remove([key])
+            self._where[key] = (int(list_no), self._lists[list_no].append(key, vector))
+        if self._needs_training():
+            self.train()
+
+    def remove(self, keys: Sequence[str]) -> int:
+        """Delete vectors by key; returns how many were stored."""
+        removed = 0
+        for key in keys:
+            where = self._where.pop(key, None)
+            if where is None:
+                continue
+            list_no, position = where
+            moved = self._lists[list_no].pop(position)
+            if moved is not None:
+                self._where[moved] = (list_no, position)
+            removed += 1
+        return removed
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        where = self._where.get(key)
+        if where is None:
+            return None
+        list_no, position = where
+        return self._lists[list_no].vectors[position].copy()
+
+    def train(self, iterations: int = 10, sample_size: int = 256):
+        """Cluster the stored vectors (at most ``sample_size`` per list) and redistribute them."""
+        keys, vectors = self._items()
+        nlist = self.nlist or max(1, int(round(np.sqrt(len(keys)))))
+        if len(keys) < nlist:
+            return
+        sample = vectors
+        if len(vectors) > nlist * sample_size:
+            sample = vectors[np.random.default_rng(0).choice(len(vectors), nlist * sample_size, replace=False)]
+        self.centroids = kmeans(sample, nlist, iterations)
+        self.trained_size = len(keys)
+        self._lists = [_InvertedList(self.dim) for _ in range(nlist)]
+        self._where = {}
+        self.add(keys, vectors)
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None,
+               exclude: Sequence[str] = ()) -> List[Tuple[str, float]]:
+        """The ``k`` stored keys with the highest inner product with ``query``, best first."""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        nprobe = nprobe or self.nprobe
+        if self.trained and nprobe < len(self._lists):
+            probed = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        else:
+            probed = range(len(self._lists))
+        probed = [self._lists[list_no] for list_no in probed if len(self._lists[list_no])]
+        if not probed:
+            return []
+
+        scores = np.concatenate([inverted.vectors[:len(inverted)] @ query for inverted in probed])
+        ids = [key for inverted in probed for key in inverted.ids]
+        wanted = min(k + len(exclude), len(ids))
+        best = np.argpartition(-scores, wanted - 1)[:wanted] if wanted < len(ids) else np.arange(len(ids))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        excluded = set(exclude)
+        return [(ids[i], float(scores[i])) for i in best if ids[i] not in excluded][:k]
+
+    def stats(self) -> Dict[str, int]:
+        sizes = [len(inverted) for inverted in self._lists]
+        return {
+            'vectors': len(self),
+            'lists': len(self._lists) if self.trained else 0,
+            'largest_list': max(sizes),
+            'nprobe': self.nprobe,
+            'trained_size': self.trained_size,
+        }
+
+    def save(self, path: str):
+        """Write the index to ``path`` atomically (NumPy ``.npz`` format)."""
+        keys, vectors = self._items()
+        offsets = np.cumsum([0] + [len(inverted) for inverted in self._lists])
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            np.savez(f, centroids=self.centroids, vectors=vectors, offsets=offsets,
+                     ids=np.array(keys, dtype=np.str_),
+                     settings=np.array([self.dim, self.nlist, self.nprobe, self.train_threshold,
+                                        self.trained_size], dtype=np.int64),
+                     retrain_growth=np.float64(self.retrain_growth))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'IVFIndex':
+        with np.load(path) as data:
+            dim, nlist, nprobe, train_threshold, trained_size = (int(value) for value in data['settings'])
+            index = cls(dim, nlist=nlist, nprobe=nprobe, train_threshold=train_threshold,
+                        retrain_growth=float(data['retrain_growth']))
+            index.centroids = data['centroids'].astype(np.float32)
+            index.trained_size = trained_size
+            offsets, vectors, ids = data['offsets'], data['vectors'], data['ids'].tolist()
+        index._lists = []
+        for list_no in range(len(offsets) - 1):
+            inverted = _InvertedList(dim)
+            inverted.vectors = vectors[offsets[list_no]:offsets[list_no + 1]].copy()
+            inverted.ids = ids[offsets[list_no]:offsets[list_no + 1]]
+            index._lists.append(inverted)
+            for position, key in enumerate(inverted.ids):
+                index._where[key] = (list_no, position)
+        return index
+
+    def _needs_training(self) -> bool:
+        if not self.trained:
+            return len(self) >= self.train_threshold
+        return len(self) >= self.trained_size * self.retrain_growth
+
+    def _items(self) -> Tuple[List[str], np.ndarray]:
+        """All keys and vectors, in list order."""
+        keys = [key for inverted in self._lists for key in inverted.ids]
+        vectors = [inverted.vectors[:len(inverted)] for inverted in self._lists]
+        return keys, np.concatenate(vectors) if keys else np.zeros((0, self.dim), dtype=np.float32)
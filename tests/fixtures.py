@@ -0,0 +1,29 @@
+"""Resume and model fixtures shared by the tailoring tests."""
+from resumegpt.services.llm_backends import FakeChatBackend
+
+
+RESUME = {
+    "name": "Jane Doe",
+    "skills": ["Python", "Flask"],
+    "experience": [
+        {"title": "Engineer", "company": "Acme", "description": "Built APIs"}
+    ],
+    "education": [
+        {"degree": "BS Computer Science", "school": "State University", "description": "Graduated 2020"}
+    ],
+}
+
+
+def resume(**fields):
+    """``RESUME`` with some fields replaced."""
+    return {**RESUME, **fields}
+
+
+def fake_model(latency=0.0, **kwargs):
+    """A ``FakeChatBackend`` that answers after exactly ``latency`` seconds.
+
+    Its ``usage()["calls"]`` counts the model calls made.
+    """
+    kwargs.setdefault("latency_distribution", "constant")
+    kwargs.setdefault("tokens_per_sec", 1e9)
+    return FakeChatBackend(latency=latency, **kwargs)
@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from resumegpt.app import create_app
+from resumegpt.models.resume import Resume
+from resumegpt.services.llm_client import LLMClientRegistry
+from resumegpt.services.resume_improver import ResumeImprover
+
+from tests.fixtures import RESUME
+
+
+class SlowFakeModel:
+    """Fake chat model whose latency is set per posting via a ``delay=`` marker."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if "FAIL" in prompt:
+                raise RuntimeError("model unavailable")
+            delay = float(prompt.split("delay=")[1].split()[0])
+            time.sleep(delay)
+            return SimpleNamespace(content=json.dumps({
+                "tailored_resume": RESUME,
+                "match_score": int(delay * 100),
+                "improvements": [],
+            }))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestTailorMany(unittest.TestCase):
+    def test_yields_in_completion_order_with_errors(self):
+        model = SlowFakeModel()
+        improver = ResumeImprover(model=model)
+        postings = ["delay=0.3 ", "delay=0.05 ", "FAIL", "delay=0.15 "]
+
+        results = list(improver.tailor_many(Resume(**RESUME), postings, max_concurrency=4))
+
+        self.assertEqual([index for index, _, _ in results], [2, 1, 3, 0])
+        self.assertEqual(results[0][2], "model unavailable")
+        self.assertEqual(results[1][1]["match_score"], 5)
+
+    def test_respects_concurrency_limit(self):
+        model = SlowFakeModel()
+        improver = ResumeImprover(model=model)
+        list(improver.tailor_many(Resume(**RESUME), [f"delay=0.05 job {i}" for i in range(8)], max_concurrency=3))
+        self.assertEqual(model.peak, 3)
+
+
+class TestBatchEndpoint(unittest.TestCase):
+    def setUp(self):
+        app = create_app()
+        self.model = SlowFakeModel()
+        app.extensions["llm_clients"] = LLMClientRegistry(factory=lambda name, temperature: self.model)
+        app.extensions["result_cache"] = None
+        self.client = app.test_client()
+
+    def test_streams_per_job_results(self):
+        response = self.client.post("/api/tailor-resume/batch", json={
+            "resumeData": RESUME,
+            "jobHtml": ["delay=0.1 ", "FAIL"],
+        })
+        frames = response.get_data(as_text=True).strip().split("\n\n")
+        events = [(f.split("\n")[0][7:], json.loads(f.split("\n")[1][6:])) for f in frames]
+
+        self.assertEqual(events[0][1], {"index": 1, "success": False, "error": "model unavailable"})
+        self.assertTrue(events[1][1]["success"])
+        self.assertEqual(events[-1], ("done", {"total": 2, "succeeded": 1, "failed": 1}))
+
+    def test_validates_resume_once_up_front(self):
+        response = self.client.post("/api/tailor-resume/batch", json={
+            "resumeData": {"name": "Jane Doe"},
+            "jobHtml": ["delay=0.1 "],
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid resumeData", response.get_json()["error"])
+
+    def test_requires_list_of_postings(self):
+        response = self.client.post("/api/tailor-resume/batch", json={
+            "resumeData": RESUME,
+            "jobHtml": "<p>one posting</p>",
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
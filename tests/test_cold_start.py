@@ -0,0 +1,28 @@
+import subprocess
+import sys
+import unittest
+
+# Modules that pay seconds of import time and aren't needed to serve tailoring requests
+HEAVY_MODULES = ("torch", "transformers", "sklearn", "PyPDF2", "docx", "textract")
+
+IMPORTS = [
+    "resumegpt.app",
+    "resumegpt.models.job_post",
+    "resumegpt.services.resume_scorer",
+    "resumegpt.utils.model_cache",
+    "resumegpt.utils.resume_parser",
+    "resumegpt.utils.semantic_cache",
+]
+
+
+class TestColdStart(unittest.TestCase):
+    def test_app_imports_skip_ml_and_document_stacks(self):
+        script = "import sys\n" + "".join(f"import {name}\n" for name in IMPORTS) + (
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from resumegpt.config.config import Config
+from resumegpt.services import resume_scorer
+from resumegpt.services.resume_scorer import ResumeScorer
+from resumegpt.utils import embedding_store
+from resumegpt.utils.embedding_store import EmbeddingStore
+from resumegpt.utils.model_cache import EMBEDDING_MODEL, ModelCache
+
+
+def keys(*texts):
+    return [EmbeddingStore.key(text, "test") for text in texts]
+
+
+def append_rows(path, worker, count):
+    store = EmbeddingStore(path)
+    for i in range(count):
+        store.put_many(keys(f"{worker}-{i}"), np.full((1, 4), worker, dtype=np.float32))
+
+
+class TestEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "embeddings")
+
+    def test_batch_round_trip_and_persistence(self):
+        store = EmbeddingStore(self.path)
+        self.assertEqual(store.get_many(keys("a", "b")), [None, None])
+        store.put_many(keys("a", "b"), np.arange(8).reshape(2, 4))
+
+        reopened = EmbeddingStore(self.path)
+        a, missing, b = reopened.get_many(keys("a", "z", "b"))
+        np.testing.assert_array_equal(a, [0, 1, 2, 3])
+        np.testing.assert_array_equal(b, [4, 5, 6, 7])
+        self.assertIsNone(missing)
+        self.assertEqual(reopened.stats()["disk_hits"], 2)
+        self.assertEqual(os.path.getsize(self.path + ".f32"), 2 * 4 * 4)
+
+    def test_sees_rows_added_by_other_writers(self):
+        reader = EmbeddingStore(self.path)
+        EmbeddingStore(self.path).put_many(keys("a"), np.ones((1, 4)))
+        np.testing.assert_array_equal(reader.get_many(keys("a"))[0], np.ones(4))
+
+    def test_concurrent_processes_append_safely(self):
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=append_rows, args=(self.path, w, 25)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        store = EmbeddingStore(self.path)
+        self.assertEqual(store.stats()["rows"], 100)
+        for w in range(4):
+            vectors = store.get_many(keys(*(f"{w}-{i}" for i in range(25))))
+            self.assertTrue(all((vector == w).all() for vector in vectors))
+
+    def test_hot_tier_is_bounded(self):
+        store = EmbeddingStore(self.path, hot_entries=2)
+        store.put_many(keys("a", "b", "c"), np.zeros((3, 4)))
+        self.assertEqual(store.stats()["hot_entries"], 2)
+        store.get_many(keys("b", "c"))
+        self.assertEqual(store.stats()["hot_hits"], 2)
+
+    def test_compaction_drops_duplicates_and_old_rows(self):
+        first, second = EmbeddingStore(self.path), EmbeddingStore(self.path)
+        first.put_many(keys("a", "b"), np.zeros((2, 4)))
+        # The second writer hasn't seen "a" in memory, but the file lock makes it re-check
+        second.put_many(keys("a", "c"), np.ones((2, 4)))
+        self.assertEqual(first.stats()["rows"], 2)
+        self.assertEqual(first.get_many(keys("c"))[0].tolist(), [1, 1, 1, 1])
+
+        self.assertEqual(first.compact(max_rows=2), 1)
+        self.assertEqual(os.path.getsize(self.path + ".f32"), 2 * 4 * 4)
+        fresh = EmbeddingStore(self.path, hot_entries=0)
+        a, b, c = fresh.get_many(keys("a", "b", "c"))
+        self.assertIsNone(a)
+        self.assertIsNotNone(b)
+        self.assertIsNotNone(c)
+        # Other open stores follow the rewritten files
+        self.assertIsNone(EmbeddingStore(self.path, hot_entries=0).get_many(keys("a"))[0])
+        second.put_many(keys("d"), np.ones((1, 4)))
+        self.assertEqual(second.stats()["rows"], 3)
+
+    def test_ignores_vectors_without_keys(self):
+        store = EmbeddingStore(self.path)
+        store.put_many(keys("a"), np.ones((1, 4)))
+        # A writer that died after the vector but before the key
+        with open(self.path + ".f32", "ab") as f:
+            f.write(np.zeros(4, dtype=np.float32).tobytes())
+        store.put_many(keys("b"), np.full((1, 4), 2.0))
+        fresh = EmbeddingStore(self.path, hot_entries=0)
+        self.assertEqual(fresh.get_many(keys("b"))[0].tolist(), [2, 2, 2, 2])
+
+    def test_rejects_other_dimensions(self):
+        store = EmbeddingStore(self.path)
+        store.put_many(keys("a"), np.ones((1, 4)))
+        with self.assertRaises(ValueError):
+            store.put_many(keys("b"), np.ones((1, 8)))
+
+
+class CountingEncoder:
+    """Tokenizer and model pair returning a fixed hidden state, counting forward passes."""
+
+    def __init__(self):
+        self.forward_passes = 0
+
+    def tokenizer(self, texts, **kwargs):
+        import torch
+        return {"attention_mask": torch.ones(len(texts), 3)}
+
+    def model(self, attention_mask):
+        import torch
+        self.forward_passes += 1
+        return type("Output", (), {"last_hidden_state": torch.ones(len(attention_mask), 3, 4)})()
+
+
+class TestScorerEmbeddingStore(unittest.TestCase):
+    def test_store_hits_skip_the_model(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        encoder = CountingEncoder()
+        models = ModelCache()
+        models.register(EMBEDDING_MODEL, lambda: (encoder.tokenizer, encoder.model))
+        store = EmbeddingStore(os.path.join(directory, "embeddings"))
+
+        first = ResumeScorer(models=models, store=store)._get_embeddings("Built APIs")
+        again = ResumeScorer(models=models, store=EmbeddingStore(store.path))._get_embeddings("Built APIs")
+
+        self.assertEqual(encoder.forward_passes, 1)
+        self.assertEqual(first.shape, (1, 4))
+        np.testing.assert_array_equal(first, again)
+
+
+class TestWithoutFcntl(unittest.TestCase):
+    def test_module_imports_without_fcntl(self):
+        # A separate copy, so the module the rest of the tests use is untouched
+        spec = importlib.util.spec_from_file_location("embedding_store_copy", embedding_store.__file__)
+        module = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(sys.modules, {"fcntl": None}):
+            spec.loader.exec_module(module)
+        self.assertFalse(module.SUPPORTED)
+        with self.assertRaises(OSError):
+            module.EmbeddingStore(os.path.join(tempfile.gettempdir(), "unused"))
+
+    def test_scorer_runs_without_the_store(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "embeddings")
+        with mock.patch.object(embedding_store, "SUPPORTED", False), \
+                mock.patch.object(Config, "EMBEDDING_STORE_PATH", path):
+            self.assertIsNone(resume_scorer.shared_embedding_store.__wrapped__())
+        self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
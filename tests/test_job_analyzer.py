@@ -0,0 +1,201 @@
+import random
+import unittest
+from unittest import mock
+
+from resumegpt.config.config import Config
+from resumegpt.models.job_post import (
+    INDICATOR_MATCHER, REQUIREMENT_INDICATORS, SENIORITY_INDICATORS, AnalysisDocument, JobAnalyzer,
+    SentimentCache
+)
+from resumegpt.utils.keyword_matcher import KeywordMatcher
+
+
+POSTING = ("Strong programming skills in Python and Django. Excellent communication with Acme partners. "
+           "We offer free lunch. Experience with software on AWS")
+
+ENTITIES = {"Python": "MISC", "Django": "MISC", "Acme": "ORG", "AWS": "ORG"}
+
+
+class FakeNER:
+    """Tags known words like an aggregated token classification pipeline."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _tag(self, sentence):
+        return [{"entity_group": ENTITIES[word], "word": f" {word}", "score": 0.9}
+                for word in sentence.replace(",", " ").split() if word in ENTITIES]
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append((inputs, batch_size))
+        if isinstance(inputs, str):
+            return self._tag(inputs)
+        return [self._tag(sentence) for sentence in inputs]
+
+
+class FakeSentiment:
+    """Scores a sentence by its length so repeated sentences score alike."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append(list(inputs))
+        return [{"label": "POSITIVE", "score": len(sentence) / 100} for sentence in inputs]
+
+
+def make_analyzer(ner, sentiment=None, cache=None):
+    return JobAnalyzer(ner_pipeline=ner, sentiment_pipeline=sentiment, sentiment_cache=cache)
+
+
+class TestExtractSkills(unittest.TestCase):
+    def test_runs_ner_once_for_all_sentences(self):
+        ner = FakeNER()
+        with mock.patch.object(Config, "NER_BATCH_SIZE", 4):
+            skills = make_analyzer(ner).extract_skills(POSTING)
+
+        self.assertEqual(len(ner.calls), 1)
+        sentences, batch_size = ner.calls[0]
+        self.assertEqual(len(sentences), 3)
+        self.assertEqual(batch_size, 4)
+        self.assertEqual(skills, {"technical": ["Python", "Django", "AWS"], "soft": []})
+
+    def test_accepts_unaggregated_entities(self):
+        ner = mock.Mock(return_value=[[{"entity": "B-ORG", "word": "Acme"}, {"entity": "O", "word": "on"}]])
+        skills = make_analyzer(ner).extract_skills("Software at Acme.")
+        self.assertEqual(skills["technical"], ["Acme"])
+
+    def test_skips_ner_without_candidate_sentences(self):
+        ner = FakeNER()
+        skills = make_analyzer(ner).extract_skills("We offer free lunch. And a gym.")
+        self.assertEqual(skills, {"technical": [], "soft": []})
+        self.assertEqual(ner.calls, [])
+
+
+class TestAtsKeywords(unittest.TestCase):
+    POSTING = ("Acme is hiring a senior backend engineer to join our team. "
+               "Strong programming skills in Python and Django. "
+               "You will deploy our software on AWS and mentor junior developers. "
+               "Excellent communication skills. Experience with Python in production is a must. "
+               "We offer free lunch.")
+
+    def test_includes_extracted_skills(self):
+        keywords = make_analyzer(FakeNER()).extract_ats_keywords(self.POSTING)
+        self.assertEqual(keywords, ["Python", "Django", "AWS", "senior", "team", "programming",
+                                    "junior", "software", "communication"])
+
+    def test_reuses_given_skills(self):
+        ner = FakeNER()
+        analyzer = make_analyzer(ner)
+        doc = AnalysisDocument(self.POSTING)
+        skills = analyzer.extract_skills(doc)
+        keywords = analyzer.extract_ats_keywords(doc, skills)
+
+        self.assertEqual(len(ner.calls), 1)
+        self.assertEqual(keywords[:3], skills["technical"])
+
+
+class TestCompanyCulture(unittest.TestCase):
+    POSTING = ("Our innovative team values mentorship. We are a collaborative team. "
+               "Learning budget included. Our innovative team values mentorship")
+
+    def test_scores_each_sentence_once_in_one_batch(self):
+        sentiment = FakeSentiment()
+        scores = make_analyzer(FakeNER(), sentiment, SentimentCache()).analyze_company_culture(self.POSTING)
+
+        self.assertEqual(len(sentiment.calls), 1)
+        self.assertEqual(sentiment.calls[0], ["Our innovative team values mentorship",
+                                              "We are a collaborative team", "Learning budget included"])
+        self.assertAlmostEqual(scores["innovation"], 0.37)
+        # Averaged per occurrence, like scoring every relevant sentence
+        self.assertAlmostEqual(scores["collaboration"], (0.37 + 0.27 + 0.37) / 3)
+        self.assertAlmostEqual(scores["growth"], (0.37 + 0.24 + 0.37) / 3)
+
+    def test_reuses_sentence_scores_across_postings(self):
+        sentiment = FakeSentiment()
+        cache = SentimentCache()
+        analyzer = make_analyzer(FakeNER(), sentiment, cache)
+        first = analyzer.analyze_company_culture(self.POSTING)
+        second = analyzer.analyze_company_culture("Great pay. We are a collaborative team. Mentorship for all.")
+
+        self.assertEqual(sentiment.calls[1], ["Mentorship for all"])
+        self.assertAlmostEqual(second["collaboration"], 0.27)
+        self.assertEqual(analyzer.analyze_company_culture(self.POSTING), first)
+        self.assertEqual(len(sentiment.calls), 2)
+
+    def test_sentiment_cache_is_bounded(self):
+        cache = SentimentCache(max_entries=2)
+        cache.set("first", 0.1)
+        cache.set("second", 0.2)
+        cache.get("first")
+        cache.set("third", 0.3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("first"), 0.1)
+
+    def test_no_sentiment_pass_without_culture_sentences(self):
+        sentiment = FakeSentiment()
+        scores = make_analyzer(FakeNER(), sentiment, SentimentCache()).analyze_company_culture("Free snacks.")
+        self.assertEqual(scores, {"innovation": 0.0, "collaboration": 0.0, "growth": 0.0})
+        self.assertEqual(sentiment.calls, [])
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_finds_overlapping_keywords(self):
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        self.assertEqual(sorted(matcher.finditer("ushers")), [(1, "she"), (2, "he"), (2, "hers")])
+
+    def test_matches_like_substring_search(self):
+        rng = random.Random(3)
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+        matcher = KeywordMatcher(keywords)
+        for _ in range(50):
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 40)))
+            self.assertEqual(matcher.found(text), {kw for kw in keywords if kw in text})
+
+
+class TestAnalysisDocument(unittest.TestCase):
+    TEXT = ("Senior Engineer. You MUST know Python. Our team is innovative. "
+            "We need mentorship from a lead. Free snacks")
+
+    def test_splits_once_with_offsets(self):
+        doc = AnalysisDocument(self.TEXT)
+        self.assertEqual(doc.sentences, self.TEXT.split("."))
+        for sentence, offset in zip(doc.sentences, doc.offsets):
+            self.assertEqual(self.TEXT[offset:offset + len(sentence)], sentence)
+        self.assertEqual(doc.keywords[1], {"must"})
+        self.assertEqual(doc.sentences_with(["team", "lead"]), [2, 3])
+
+    def test_analyzers_match_naive_scans(self):
+        analyzer = make_analyzer(FakeNER())
+        doc = AnalysisDocument(self.TEXT)
+        naive = [sent.strip() for sent in self.TEXT.split(".")
+                 if any(kw in sent.lower() for kw in REQUIREMENT_INDICATORS)]
+        self.assertEqual(analyzer.extract_requirements(doc), naive)
+        self.assertEqual(analyzer.extract_requirements(self.TEXT), naive)
+        self.assertEqual(analyzer.determine_seniority(doc), "senior")
+        self.assertEqual(analyzer.determine_seniority("A mid-level role"), "mid")
+        self.assertEqual(analyzer.determine_seniority("Any level"), "not_specified")
+
+    def test_analyze_job_posting(self):
+        ner, sentiment = FakeNER(), FakeSentiment()
+        analysis = make_analyzer(ner, sentiment, SentimentCache()).analyze_job_posting(self.TEXT)
+
+        self.assertEqual(analysis["requirements"], ["You MUST know Python", "We need mentorship from a lead"])
+        self.assertEqual(analysis["skills"], {"technical": [], "soft": []})
+        self.assertEqual(set(analysis["company_culture"]), {"innovation", "collaboration", "growth"})
+        self.assertEqual(analysis["keywords"], ["senior", "innovative", "team", "lead", "mentorship"])
+        self.assertEqual(analysis["seniority_level"], "senior")
+        # One sentiment batch, and no NER pass without skill sentences
+        self.assertEqual(len(sentiment.calls), 1)
+        self.assertEqual(ner.calls, [])
+
+    def test_shared_matcher_covers_every_indicator(self):
+        for indicators in SENIORITY_INDICATORS.values():
+            for indicator in indicators:
+                self.assertIn(indicator, INDICATOR_MATCHER.found(indicator))
+
+
+if __name__ == "__main__":
+    unittest.main()
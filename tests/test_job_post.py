@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from resumegpt.models.job_post import JobDescription, JobPost
+from resumegpt.utils.single_flight import SingleFlight
+
+
+POSTING = "<div><h1>Backend Engineer</h1><p>Initech needs Python and SQL experience.</p></div>"
+
+
+class FakeExtractor:
+    """Answers the JobPost prompts with fixed values, sync or async."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt):
+        if "company name" in prompt and "following lists" not in prompt:
+            return "Initech"
+        if "job title" in prompt and "following lists" not in prompt:
+            return "Backend Engineer"
+        return "- Python\n- SQL"
+
+    def _enter(self):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def invoke(self, prompt):
+        self._enter()
+        time.sleep(self.latency)
+        self._exit()
+        return SimpleNamespace(content=self._answer(prompt))
+
+    async def ainvoke(self, prompt):
+        self._enter()
+        await asyncio.sleep(self.latency)
+        self._exit()
+        return SimpleNamespace(content=self._answer(prompt))
+
+    def with_structured_output(self, schema):
+        extractor = self
+
+        class Structured:
+            def invoke(self, prompt):
+                extractor._enter()
+                time.sleep(extractor.latency)
+                extractor._exit()
+                return schema(
+                    company="Initech",
+                    job_title="Backend Engineer",
+                    skills={"technical_skills": ["Python", "SQL"], "non_technical_skills": ["Python", "SQL"],
+                            "ats_keywords": ["Python", "SQL"]},
+                    requirements={"qualifications": ["Python", "SQL"], "duties": ["Python", "SQL"]},
+                )
+
+        return Structured()
+
+
+class TestJobPostParseModes(unittest.TestCase):
+    def parse(self, mode, model):
+        return JobPost(POSTING, llm=model, flights=SingleFlight()).parse_job_post(mode=mode)
+
+    def test_modes_produce_the_same_description(self):
+        serial = self.parse("serial", FakeExtractor(0))
+        self.assertEqual(serial["company"], "Initech")
+        self.assertEqual(serial["skills"]["technical_skills"], ["Python", "SQL"])
+        self.assertEqual(self.parse("concurrent", FakeExtractor(0)), serial)
+        self.assertEqual(self.parse("structured", FakeExtractor(0)), serial)
+
+    def test_concurrent_mode_overlaps_calls(self):
+        model = FakeExtractor(latency=0.1)
+        start = time.perf_counter()
+        self.parse("concurrent", model)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(model.calls, 7)
+        self.assertEqual(model.peak, 7)
+        self.assertLess(elapsed, 0.4)
+
+    def test_structured_mode_makes_one_call(self):
+        model = FakeExtractor()
+        self.parse("structured", model)
+        self.assertEqual(model.calls, 1)
+
+    def test_rejects_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.parse("parallel", FakeExtractor(0))
+
+    def test_parsed_job_is_kept(self):
+        post = JobPost(POSTING, llm=FakeExtractor(0), flights=SingleFlight())
+        post.parse_job_post(mode="structured")
+        self.assertIsInstance(post.parsed_job, JobDescription)
+
+
+class TestListItemParsing(unittest.TestCase):
+    def test_parses_json_array_answers(self):
+        content = 'Sure:\n```json\n["Python", "SQL, ideally Postgres"]\n```'
+        self.assertEqual(JobPost._parse_list_items(content), ["Python", "SQL, ideally Postgres"])
+
+    def test_falls_back_to_bullets(self):
+        self.assertEqual(JobPost._parse_list_items("- Python [required]\n- SQL"), ["Python [required]", "SQL"])
+
+
+if __name__ == "__main__":
+    unittest.main()
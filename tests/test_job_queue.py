@@ -0,0 +1,200 @@
+import multiprocessing
+import threading
+import time
+import unittest
+
+from resumegpt.app import create_app
+from resumegpt.services.job_queue import JobQueue, QueueFullError
+from resumegpt.services.llm_client import LLMClientRegistry
+
+from tests.fixtures import RESUME, fake_model
+
+
+class TestJobQueue(unittest.TestCase):
+    def test_runs_jobs_and_records_results(self):
+        jobs = JobQueue(max_workers=2, max_queue_size=4)
+        ok = jobs.submit(lambda x: x * 2, 21)
+        failed = jobs.submit(lambda: 1 / 0)
+        jobs.shutdown()
+
+        self.assertEqual(jobs.get(ok.id).status, "succeeded")
+        self.assertEqual(jobs.get(ok.id).result, 42)
+        self.assertEqual(jobs.get(failed.id).status, "failed")
+        self.assertIn("division", jobs.get(failed.id).error)
+
+    def test_rejects_when_full(self):
+        release = threading.Event()
+        jobs = JobQueue(max_workers=1, max_queue_size=1)
+        jobs.submit(release.wait)
+        time.sleep(0.05)  # let the worker pick up the first job
+        jobs.submit(release.wait)
+        with self.assertRaises(QueueFullError):
+            jobs.submit(release.wait)
+        self.assertEqual(jobs.stats()["rejected"], 1)
+        release.set()
+        jobs.shutdown()
+
+    def test_shutdown_does_not_block_on_a_full_queue(self):
+        release = threading.Event()
+        jobs = JobQueue(max_workers=1, max_queue_size=1)
+        first = jobs.submit(release.wait)
+        time.sleep(0.05)  # let the worker pick up the first job
+        queued = jobs.submit(lambda: "queued")
+
+        start = time.monotonic()
+        jobs.shutdown(wait=False)
+        self.assertLess(time.monotonic() - start, 0.5)
+        with self.assertRaises(RuntimeError):
+            jobs.submit(lambda: None)
+
+        release.set()
+        jobs.shutdown()
+        self.assertEqual((first.status, queued.status, queued.result), ("succeeded", "succeeded", "queued"))
+
+    def test_shutdown_without_workers(self):
+        jobs = JobQueue(max_workers=1)
+        jobs.shutdown()
+        self.assertEqual(jobs.stats()["queued"], 0)
+
+    def test_jobs_complete_after_fork(self):
+        jobs = JobQueue(max_workers=1, max_queue_size=4)
+        jobs.submit(lambda: None)  # the parent's workers are running
+        unused = JobQueue(max_workers=1, max_queue_size=4)
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+
+        def child():
+            statuses = []
+            for queue in (jobs, unused):
+                job = queue.submit(lambda x: x + 1, 1)
+                deadline = time.monotonic() + 5
+                while not job.done and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                statuses.append((job.status, job.result, queue.stats()["completed"]))
+            results.put(statuses)
+
+        process = ctx.Process(target=child)
+        process.start()
+        statuses = results.get(timeout=10)
+        process.join()
+        self.assertEqual(statuses, [("succeeded", 2, 1), ("succeeded", 2, 1)])
+        jobs.shutdown()
+
+    def test_concurrent_first_submits_after_fork_keep_every_job(self):
+        jobs = JobQueue(max_workers=2, max_queue_size=64)
+        jobs.submit(lambda: None)
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+
+        def child():
+            start = threading.Barrier(8)
+            submitted = []
+
+            def submit():
+                start.wait()
+                submitted.append(jobs.submit(lambda: "done"))
+
+            threads = [threading.Thread(target=submit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            deadline = time.monotonic() + 5
+            while not all(job.done for job in submitted) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            results.put([jobs.get(job.id) is job and job.status for job in submitted])
+
+        process = ctx.Process(target=child)
+        process.start()
+        statuses = results.get(timeout=10)
+        process.join()
+        self.assertEqual(statuses, ["succeeded"] * 8)
+        jobs.shutdown()
+
+    def test_preloaded_wsgi_app_is_built_per_process(self):
+        import wsgi
+        entry = wsgi.PerProcessApp()
+        parent_app = entry.get()
+        self.assertIs(entry.get(), parent_app)
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+
+        def child():
+            client = entry.get().test_client()
+            results.put((entry.get() is not parent_app, client.get("/api/stats").status_code))
+
+        process = ctx.Process(target=child)
+        process.start()
+        self.assertEqual(results.get(timeout=10), (True, 200))
+        process.join()
+
+
+class TestAsyncTailorEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.model = fake_model(latency=0.2)
+        self.app.extensions["llm_clients"] = LLMClientRegistry(
+            max_connections=16, factory=lambda name, temperature: self.model
+        )
+        self.app.extensions["result_cache"] = None
+
+    def _submit(self, job_html="<p>Python developer</p>"):
+        return self.client.post(
+            "/api/tailor-resume?async=1",
+            json={"jobHtml": job_html, "resumeData": RESUME},
+        )
+
+    def _wait_for(self, job_ids, timeout=10):
+        deadline = time.time() + timeout
+        pending = set(job_ids)
+        while pending and time.time() < deadline:
+            for job_id in list(pending):
+                body = self.client.get(f"/api/jobs/{job_id}").get_json()
+                if body["status"] in ("succeeded", "failed"):
+                    pending.discard(job_id)
+            time.sleep(0.01)
+        return pending
+
+    def test_returns_job_and_result(self):
+        response = self._submit()
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()["jobId"]
+        self.assertEqual(response.headers["Location"], f"/api/jobs/{job_id}")
+
+        self.assertFalse(self._wait_for([job_id]))
+        body = self.client.get(f"/api/jobs/{job_id}").get_json()
+        self.assertTrue(body["success"])
+        self.assertEqual(body["data"]["tailored_resume"]["name"], RESUME["name"])
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get("/api/jobs/missing").status_code, 404)
+
+    def test_backpressure(self):
+        self.app.extensions["job_queue"] = JobQueue(max_workers=1, max_queue_size=1)
+        codes = [self._submit().status_code for _ in range(4)]
+        self.assertIn(429, codes)
+        self.assertEqual(codes[0], 202)
+
+    def test_throughput_under_concurrent_load(self):
+        n_requests = 16
+        workers = 8
+        self.app.extensions["job_queue"] = JobQueue(max_workers=workers, max_queue_size=n_requests)
+
+        start = time.time()
+        job_ids = [self._submit(f"<p>Python developer #{i}</p>").get_json()["jobId"]
+                   for i in range(n_requests)]
+        accepted = time.time() - start
+        self.assertFalse(self._wait_for(job_ids))
+        elapsed = time.time() - start
+
+        serial = n_requests * self.model.latency
+        # Accepting work never waits on the model...
+        self.assertLess(accepted, self.model.latency)
+        # ...and the pool runs requests side by side instead of one at a time.
+        self.assertLess(elapsed, serial / 2)
+        self.assertEqual(self.model.usage()["calls"], n_requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from resumegpt.config.config import Config
+from resumegpt.models.job_post import JobDescription, JobPost
+from resumegpt.models.resume import TailoredResume
+from resumegpt.services.llm_backends import FakeChatBackend, LLMBackend, ServiceUnavailable, create_chat_model
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.resilience import is_retryable
+from resumegpt.utils.single_flight import SingleFlight
+
+from tests.fixtures import fake_model, resume
+
+
+RESUME = resume(skills=["Go", "Python", "SQL"])
+
+POSTING = ("<div><h2>Backend Engineer at Initech</h2><p>You will build Python services.</p>"
+           "<p>Must know SQL.</p><p>Strong communication skills.</p></div>")
+
+
+class TestBackendSelection(unittest.TestCase):
+    def test_backend_comes_from_config(self):
+        with mock.patch.object(Config, "LLM_BACKEND", "fake"):
+            model = create_chat_model("gemini-test", 0.3)
+        self.assertIsInstance(model, FakeChatBackend)
+        self.assertEqual((model.model, model.temperature), ("fake-gemini-test", 0.3))
+
+    def test_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_chat_model(backend="nope")
+
+    def test_backends_must_implement_the_interface(self):
+        class Partial(LLMBackend):
+            def invoke(self, prompt, **kwargs):
+                return None
+
+        with self.assertRaises(TypeError):
+            Partial("model", 0.0)
+
+
+class TestFakeChatBackend(unittest.TestCase):
+    def test_tailoring_output_is_schema_valid(self):
+        improver = ResumeImprover(model=fake_model(), flights=SingleFlight())
+        result = improver.process_resume(RESUME, POSTING)
+
+        TailoredResume(**result)
+        # Skills named in the posting are moved to the front
+        self.assertEqual(result["tailored_resume"]["skills"], ["Python", "SQL", "Go"])
+        self.assertEqual(result["match_score"], 67)
+
+    def test_job_post_modes_work_offline(self):
+        for mode in ("serial", "concurrent", "structured"):
+            parsed = JobPost(POSTING, llm=fake_model(), flights=SingleFlight()).parse_job_post(mode=mode)
+            JobDescription(**parsed)
+            self.assertEqual(parsed["company"], "Initech")
+            self.assertEqual(parsed["job_title"], "Backend Engineer")
+            self.assertTrue(parsed["skills"]["technical_skills"])
+
+    def test_deterministic_for_same_seed(self):
+        prompt = "Extract the duties from this job posting.\n        Job Posting: One. Two. Three. Four. Five. Six."
+        first = FakeChatBackend(seed=7)._plan(prompt)
+        self.assertEqual(FakeChatBackend(seed=7)._plan(prompt), first)
+        self.assertNotEqual(FakeChatBackend(seed=8)._plan(prompt)[1], first[1])
+
+    def test_call_counts_are_bounded(self):
+        backend = fake_model()
+        backend.max_tracked_prompts = 2
+        for prompt in ("first " * 500, "second", "third"):
+            backend._plan(prompt)
+
+        self.assertEqual(len(backend._seen), 2)
+        self.assertTrue(all(len(key) == 32 for key in backend._seen))
+
+    def test_stream_matches_invoke_and_reports_usage(self):
+        backend = fake_model()
+        prompt = "What is the job title in this job posting? Return only the title.\nData Engineer at Initech"
+        streamed = "".join(chunk.content for chunk in backend.stream(prompt))
+        message = backend.invoke(prompt)
+
+        self.assertEqual(streamed, message.content)
+        self.assertEqual(message.content, "Data Engineer")
+        self.assertEqual(message.usage_metadata["output_tokens"], 2)
+        self.assertEqual(backend.usage()["calls"], 2)
+        self.assertEqual(backend.usage()["output_tokens"], 4)
+
+    def test_latency_follows_tokens_per_sec(self):
+        backend = FakeChatBackend(latency=0.05, latency_distribution="constant", tokens_per_sec=100)
+        improver = ResumeImprover(model=backend, flights=SingleFlight())
+        start = time.perf_counter()
+        improver.process_resume(RESUME, POSTING)
+        elapsed = time.perf_counter() - start
+
+        expected = 0.05 + backend.usage()["output_tokens"] / 100
+        self.assertGreaterEqual(elapsed, expected * 0.9)
+        self.assertLess(elapsed, expected + 0.5)
+
+    def test_async_structured_output(self):
+        backend = fake_model()
+        structured = backend.with_structured_output(JobDescription)
+        parsed = asyncio.run(structured.ainvoke("Extract the company name.\nJob Posting: Join Initech as a dev."))
+        self.assertIsInstance(parsed, JobDescription)
+        self.assertEqual(backend.usage()["calls"], 1)
+
+    def test_injected_errors_are_retryable(self):
+        backend = fake_model(error_rate=1.0)
+        with self.assertRaises(ServiceUnavailable) as caught:
+            backend.invoke("hi")
+        self.assertTrue(is_retryable(caught.exception))
+
+    def test_rejects_unknown_latency_distribution(self):
+        with self.assertRaises(ValueError):
+            FakeChatBackend(latency_distribution="pareto")
+
+
+if __name__ == "__main__":
+    unittest.main()
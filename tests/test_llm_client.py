@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from resumegpt.app import create_app
+from resumegpt.services.llm_client import LLMClientRegistry, PooledChatModel
+
+
+class CountingModel:
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(content=prompt)
+
+    async def ainvoke(self, prompt):
+        return SimpleNamespace(content=prompt)
+
+
+class TestLLMClientRegistry(unittest.TestCase):
+    def test_reuses_one_client_per_model(self):
+        built = []
+        registry = LLMClientRegistry(factory=lambda name, temperature: built.append(name) or CountingModel())
+
+        first = registry.get("gemini-test", 0.2)
+        self.assertIs(registry.get("gemini-test", 0.2), first)
+        self.assertIsNot(registry.get("gemini-test", 0.7), first)
+
+        self.assertEqual(len(built), 2)
+        self.assertEqual(registry.stats()["created"], 2)
+        self.assertEqual(registry.stats()["reused"], 1)
+
+    def test_bounds_concurrent_calls(self):
+        model = CountingModel()
+        registry = LLMClientRegistry(max_connections=2, factory=lambda name, temperature: model)
+        client = registry.get()
+
+        threads = [threading.Thread(target=client.invoke, args=("hi",)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.02)
+        self.assertEqual(registry.stats()["in_flight"], 2)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(model.peak, 2)
+        self.assertEqual(registry.stats()["calls"], 6)
+        self.assertEqual(registry.stats()["in_flight"], 0)
+
+    def test_cancelled_wait_returns_its_slot(self):
+        client = PooledChatModel(CountingModel(), max_connections=1)
+
+        async def scenario():
+            client._slots.acquire()  # Hold the only slot
+            waiting = asyncio.ensure_future(client.ainvoke("hi"))
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+            client._slots.release()
+            # The cancelled waiter's thread takes the slot, then gives it back
+            reply = await asyncio.wait_for(client.ainvoke("again"), 2)
+            self.assertEqual(reply.content, "again")
+
+        asyncio.run(scenario())
+        self.assertEqual(client.in_flight, 0)
+        self.assertTrue(client._slots.acquire(timeout=1))
+
+    def test_warm_up_failure_does_not_raise(self):
+        def broken(name, temperature):
+            raise ValueError("API key required")
+        self.assertFalse(LLMClientRegistry(factory=broken).warm_up())
+
+    def test_stats_endpoint(self):
+        app = create_app()
+        app.extensions["llm_clients"] = LLMClientRegistry(factory=lambda name, temperature: CountingModel())
+        body = app.test_client().get("/api/stats").get_json()
+        self.assertIn("pool_size", body["llm_clients"])
+        self.assertIn("queued", body["job_queue"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from resumegpt.app import create_app
+from resumegpt.config.config import Config
+from resumegpt.models.job_post import JobAnalyzer, SentimentCache
+from resumegpt.utils.model_cache import MODEL_CACHE, ModelCache, model_bytes
+
+
+class FakeTensor:
+    def __init__(self, count):
+        self.count = count
+
+    def numel(self):
+        return self.count
+
+    def element_size(self):
+        return 4
+
+
+class FakeModel:
+    """Holds ``size`` bytes of float32 weights and tags every word as MISC."""
+
+    def __init__(self, size):
+        self.weights = [FakeTensor(size // 4)]
+        self.calls = []
+        self.frozen = False
+
+    def eval(self):
+        return self
+
+    def requires_grad_(self, flag):
+        self.frozen = not flag
+        return self
+
+    def state_dict(self):
+        return {"weight": self.weights[0]}
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append(inputs)
+        if isinstance(inputs, str):
+            return []
+        return [[{"entity_group": "MISC", "word": word} for word in sent.split()[-1:]] for sent in inputs]
+
+
+class CountingLoader:
+    def __init__(self, size=400, delay=0.0):
+        self.size = size
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return FakeModel(self.size)
+
+
+class TestModelCache(unittest.TestCase):
+    def test_loads_lazily_and_once(self):
+        cache = ModelCache()
+        loader = CountingLoader(delay=0.05)
+        cache.register("ner", loader)
+        self.assertEqual(loader.calls, 0)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("ner"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(loader.calls, 1)
+        self.assertTrue(all(model is results[0] for model in results))
+        stats = cache.stats()
+        self.assertEqual((stats["loads"], stats["hits"]), (1, 7))
+        self.assertEqual(stats["models"]["ner"], {"bytes": 400, "in_use": 0, "pinned": False})
+
+    def test_evicts_least_recently_used_idle_model(self):
+        cache = ModelCache(max_bytes=1000)
+        loaders = {name: CountingLoader(size=400) for name in ("a", "b", "c")}
+        for name, loader in loaders.items():
+            cache.register(name, loader)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+
+        self.assertEqual(set(cache.stats()["models"]), {"a", "c"})
+        self.assertEqual(cache.stats()["total_bytes"], 800)
+        cache.get("b")
+        self.assertEqual(loaders["b"].calls, 2)
+
+    def test_models_in_use_are_not_evicted(self):
+        cache = ModelCache(max_bytes=500)
+        cache.register("a", CountingLoader(size=400))
+        cache.register("b", CountingLoader(size=400))
+        with cache.use("a"):
+            with cache.use("b"):
+                # Over the ceiling, but both are busy
+                self.assertEqual(cache.stats()["total_bytes"], 800)
+            self.assertEqual(set(cache.stats()["models"]), {"a"})
+        self.assertFalse(cache.evict("b"))
+        self.assertTrue(cache.evict("a"))
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            ModelCache().get("nope")
+
+    def test_model_bytes_of_pipelines_and_tuples(self):
+        pipeline = type("Pipeline", (), {"model": FakeModel(800)})()
+        self.assertEqual(model_bytes(pipeline), 800)
+        self.assertEqual(model_bytes((object(), FakeModel(400))), 400)
+
+    def test_importing_loads_nothing(self):
+        self.assertEqual(MODEL_CACHE.stats()["models"], {})
+
+
+class TestPreload(unittest.TestCase):
+    def test_preload_warms_and_pins_every_model(self):
+        cache = ModelCache(max_bytes=500)
+        loaders = {name: CountingLoader(size=400) for name in ("a", "b")}
+        for name, loader in loaders.items():
+            cache.register(name, loader)
+        self.assertFalse(cache.warmed)
+        cache.preload()
+
+        self.assertTrue(cache.warmed)
+        models = {name: cache.get(name) for name in loaders}
+        self.assertTrue(all(model.calls == ["warm up"] and model.frozen for model in models.values()))
+        # Pinned models stay loaded even over the ceiling
+        self.assertEqual(cache.stats()["total_bytes"], 800)
+        self.assertFalse(cache.evict("a"))
+        self.assertEqual([loader.calls for loader in loaders.values()], [1, 1])
+
+    def test_ready_endpoint_waits_for_preload(self):
+        cache = ModelCache()
+        cache.register("ner", CountingLoader())
+        client = create_app().test_client()
+        with mock.patch("resumegpt.services.api_handler.MODEL_CACHE", cache), \
+                mock.patch.object(Config, "MODEL_PRELOAD", True):
+            self.assertEqual(client.get("/api/ready").status_code, 503)
+            cache.preload()
+            response = client.get("/api/ready")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"ready": True, "models": ["ner"]})
+
+    def test_ready_without_preload(self):
+        self.assertEqual(create_app().test_client().get("/api/ready").status_code, 200)
+
+
+class TestSharedModels(unittest.TestCase):
+    def test_analyzers_share_one_ner_model(self):
+        cache = ModelCache()
+        loader = CountingLoader()
+        cache.register("ner", loader)
+        for _ in range(2):
+            analyzer = JobAnalyzer(models=cache, sentiment_cache=SentimentCache())
+            skills = analyzer.extract_skills("Strong programming in Python.")
+            self.assertEqual(skills["technical"], ["Python"])
+        self.assertEqual(loader.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
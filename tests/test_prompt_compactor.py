@@ -0,0 +1,138 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from resumegpt.app import create_app
+from resumegpt.config.config import Config
+from resumegpt.models.resume import Resume
+from resumegpt.services.llm_client import LLMClientRegistry
+from resumegpt.services.prompt_compactor import PromptCompactor, estimate_tokens
+from resumegpt.services.resume_improver import ResumeImprover
+
+from tests.fixtures import fake_model, resume
+
+
+RESUME = resume(
+    skills=["Python", "Flask", "PostgreSQL", "Docker"],
+    experience=[
+        {"title": "Backend Engineer", "company": "Acme", "description": "Built REST APIs with Flask and PostgreSQL"}
+    ],
+)
+
+POSTING = """
+<div class="jobs-description__content">
+  <h2>Senior Backend Engineer at Initech</h2>
+  <p>We are looking for an engineer to build <b>Python</b> services.</p>
+  <ul>
+    <li>5+ years of experience with Python and Flask</li>
+    <li>Strong PostgreSQL knowledge</li>
+    <li>Experience running Docker in production</li>
+  </ul>
+  <p>Our office has a great view of the river.</p>
+  <p>We offer medical, dental and vision insurance, 401(k) matching and paid time off.</p>
+  <p>Initech is an equal opportunity employer. All applicants will be considered without regard to race, color, religion or national origin.</p>
+  <script>trackView()</script>
+</div>
+"""
+
+
+def recording_model():
+    """Fake model whose prompts are recorded by ``model.stream``."""
+    model = fake_model()
+    model.stream = mock.Mock(wraps=model.stream)
+    return model
+
+
+class TestPromptCompactor(unittest.TestCase):
+    def setUp(self):
+        self.resume = Resume(**RESUME)
+
+    def test_strips_markup_and_boilerplate(self):
+        text, stats = PromptCompactor(token_budget=1000).compact(POSTING, self.resume)
+
+        self.assertNotIn("<", text)
+        self.assertNotIn("trackView", text)
+        self.assertNotIn("equal opportunity", text)
+        self.assertNotIn("401(k)", text)
+        self.assertIn("Strong PostgreSQL knowledge", text)
+        self.assertEqual(stats["boilerplate_dropped"], 3)
+        self.assertLess(stats["tokens_after"], stats["tokens_before"])
+
+    def test_keeps_requirements_that_mention_benefit_terms(self):
+        requirements = [
+            "We are hiring a dental hygienist for our downtown clinic.",
+            "Sell health and life insurance plans to small businesses.",
+            "Process medical, dental and vision insurance claims.",
+            "Experience supporting users with disabilities.",
+            "Conduct background checks on new vendors.",
+            "Manage the employee perks program.",
+        ]
+        boilerplate = [
+            "We offer competitive dental and vision coverage.",
+            "This offer is contingent upon a background check.",
+            "We do not discriminate on the basis of age or disability.",
+        ]
+        posting = "".join(f"<p>{sentence}</p>" for sentence in requirements + boilerplate)
+
+        text, stats = PromptCompactor(token_budget=1000).compact(posting, self.resume)
+
+        self.assertEqual(text.split("\n"), requirements)
+        self.assertEqual(stats["boilerplate_dropped"], len(boilerplate))
+
+    def test_enforces_budget_keeping_relevant_sentences(self):
+        filler = "".join(f"<p>Team lunch number {i} happens on a Friday.</p>" for i in range(40))
+        posting = POSTING.replace("<p>Our office", filler + "<p>Our office")
+
+        text, stats = PromptCompactor(token_budget=60).compact(posting, self.resume)
+
+        self.assertLessEqual(stats["tokens_after"], 60 + 5)  # joins add newlines only
+        self.assertLessEqual(estimate_tokens(text), 60)
+        self.assertIn("Strong PostgreSQL knowledge", text)
+        self.assertIn("Experience running Docker in production", text)
+        self.assertNotIn("Team lunch number 30", text)
+        # Kept sentences stay in their original order
+        self.assertLess(text.index("Python and Flask"), text.index("Docker"))
+
+    def test_improver_sends_compacted_prompt(self):
+        model = recording_model()
+        improver = ResumeImprover(model=model, compactor=PromptCompactor(token_budget=1000))
+        _, stats = improver.tailor_with_stats(Resume(**RESUME), POSTING)
+
+        self.assertNotIn("<li>", model.stream.call_args.args[0])
+        self.assertNotIn("dental", model.stream.call_args.args[0])
+        self.assertEqual(stats["sentences_kept"], 6)
+
+    def test_compaction_is_opt_in(self):
+        model = recording_model()
+        improver = ResumeImprover(model=model)
+        _, stats = improver.tailor_with_stats(Resume(**RESUME), POSTING)
+
+        self.assertIsNone(improver.compactor)
+        self.assertIsNone(stats)
+        self.assertIn("<li>", model.stream.call_args.args[0])
+
+    def test_concurrent_calls_get_their_own_stats(self):
+        improver = ResumeImprover(model=recording_model(), compactor=PromptCompactor(token_budget=1000))
+        postings = [POSTING, POSTING.replace("<li>Strong PostgreSQL knowledge</li>", "")]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(
+                lambda posting: improver.tailor_with_stats(Resume(**RESUME), posting, use_cache=False),
+                postings * 4,
+            ))
+
+        self.assertEqual([stats["sentences_kept"] for _, stats in results], [6, 5] * 4)
+
+    @mock.patch.object(Config, "PROMPT_COMPACTION", True)
+    def test_endpoint_reports_token_counts(self):
+        app = create_app()
+        app.extensions["llm_clients"] = LLMClientRegistry(factory=lambda name, temperature: recording_model())
+        app.extensions["result_cache"] = None
+        body = app.test_client().post("/api/tailor-resume", json={
+            "jobHtml": POSTING,
+            "resumeData": RESUME,
+        }).get_json()
+        self.assertGreater(body["promptStats"]["tokens_before"], body["promptStats"]["tokens_after"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from resumegpt.utils.embeddings import mean_pooled
+from resumegpt.utils.model_cache import ModelCache, model_bytes
+from resumegpt.utils.quantization import embedding_drift, entity_f1, quantize
+
+WORDS = "we need python engineers who write software and lead teams at acme in berlin".split()
+TEXTS = ["we need python engineers", "who write software", "and lead teams at acme in berlin"]
+
+
+def tiny_bert(token_classification=False):
+    """Randomly initialised BERT and a word-level tokenizer, built offline."""
+    import torch
+    from transformers import BertConfig, BertForTokenClassification, BertModel, BertTokenizerFast
+
+    torch.manual_seed(0)
+    vocab_file = os.path.join(tempfile.mkdtemp(), "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS))
+    config = BertConfig(vocab_size=len(WORDS) + 5, hidden_size=128, num_hidden_layers=2,
+                        num_attention_heads=2, intermediate_size=512, num_labels=3,
+                        id2label={0: "O", 1: "B-ORG", 2: "B-LOC"}, label2id={"O": 0, "B-ORG": 1, "B-LOC": 2})
+    model = (BertForTokenClassification if token_classification else BertModel)(config).eval()
+    return BertTokenizerFast(vocab_file=vocab_file), model
+
+
+class TestQuantize(unittest.TestCase):
+    def test_int8_shrinks_model_and_keeps_embeddings_close(self):
+        tokenizer, model = tiny_bert()
+        reference = mean_pooled(tokenizer, model, TEXTS)
+        fp32_bytes = model_bytes(model)
+
+        quantized = quantize(model)
+        self.assertLess(model_bytes(quantized), fp32_bytes * 0.6)
+        drift = embedding_drift(reference, mean_pooled(tokenizer, quantized, TEXTS))
+        self.assertGreater(drift["min_cosine"], 0.95)
+
+    def test_quantizes_pipeline_model_in_place(self):
+        from transformers import pipeline
+        tokenizer, model = tiny_bert(token_classification=True)
+        ner = pipeline("ner", model=model, tokenizer=tokenizer)
+        fp32_bytes = model_bytes(ner)
+        self.assertIs(quantize(ner), ner)
+        self.assertLess(model_bytes(ner), fp32_bytes)
+        self.assertIsInstance(ner(TEXTS), list)
+
+    def test_none_and_unknown_modes(self):
+        value = object()
+        self.assertIs(quantize(value, "none"), value)
+        with self.assertRaises(ValueError):
+            quantize(value, "int4")
+        with self.assertRaises(ValueError):
+            ModelCache(quantization="int4")
+
+    def test_registry_quantizes_on_load(self):
+        cache = ModelCache(quantization="int8")
+        cache.register("minilm", tiny_bert)
+        tokenizer, model = cache.get("minilm")
+        self.assertEqual(type(model.encoder.layer[0].intermediate.dense).__name__, "Linear")
+        self.assertIn("quantized", type(model.encoder.layer[0].intermediate.dense).__module__)
+        self.assertEqual(cache.stats()["quantization"], "int8")
+
+
+class TestParityMetrics(unittest.TestCase):
+    def test_embedding_drift(self):
+        reference = np.array([[1.0, 0.0], [0.0, 2.0]])
+        drift = embedding_drift(reference, np.array([[2.0, 0.0], [1.0, 1.0]]))
+        self.assertAlmostEqual(drift["mean_cosine"], (1 + 0.5 ** 0.5) / 2)
+        self.assertAlmostEqual(drift["min_cosine"], 0.5 ** 0.5)
+
+    def test_entity_f1_matches_label_and_span(self):
+        reference = [[{"entity_group": "ORG", "start": 0, "end": 4}, {"entity_group": "LOC", "start": 8, "end": 14}]]
+        candidate = [[{"entity_group": "ORG", "start": 0, "end": 4}, {"entity_group": "ORG", "start": 8, "end": 14}]]
+        scores = entity_f1(reference, candidate)
+        self.assertEqual((scores["precision"], scores["recall"], scores["f1"]), (0.5, 0.5, 0.5))
+        self.assertEqual(entity_f1([[]], [[]])["f1"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
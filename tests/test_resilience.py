@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from resumegpt.app import create_app
+from resumegpt.config.config import Config
+from resumegpt.services.llm_client import LLMClientRegistry, ResilientChatModel
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.resilience import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, deadline_scope, is_retryable
+)
+
+from tests.fixtures import RESUME
+
+
+class ServiceUnavailable(Exception):
+    """Same class name as the Google API's 503 error."""
+
+
+class FakeBackend:
+    """Chat model that plays a script of latencies and errors, one step per call.
+
+    Each step is ``(latency, error)``; once the script runs out every call
+    answers after ``default_latency``.
+    """
+
+    def __init__(self, *script, default_latency=0.0):
+        self.script = list(script)
+        self.default_latency = default_latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self.calls += 1
+            return self.script.pop(0) if self.script else (self.default_latency, None)
+
+    def invoke(self, prompt):
+        latency, error = self._next()
+        time.sleep(latency)
+        if error is not None:
+            raise error
+        return SimpleNamespace(content=f"answer to {prompt}")
+
+    async def ainvoke(self, prompt):
+        latency, error = self._next()
+        await asyncio.sleep(latency)
+        if error is not None:
+            raise error
+        return SimpleNamespace(content=f"answer to {prompt}")
+
+    def stream(self, prompt):
+        latency, error = self._next()
+        time.sleep(latency)
+        if error is not None:
+            raise error
+        yield SimpleNamespace(content="answer ")
+        yield SimpleNamespace(content=f"to {prompt}")
+
+
+def resilient(backend, **kwargs):
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=100, reset_timeout=60))
+    kwargs.setdefault("hedging", False)
+    return ResilientChatModel(backend, **kwargs)
+
+
+class TestRetries(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(Config, LLM_RETRY_BASE_DELAY=0.01, LLM_RETRY_MAX_DELAY=0.02)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retries_transient_errors(self):
+        backend = FakeBackend((0, ServiceUnavailable("503")), (0, ConnectionError("reset")))
+        model = resilient(backend, max_attempts=3)
+        self.assertEqual(model.invoke("hi").content, "answer to hi")
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(model.retried, 2)
+
+    def test_does_not_retry_request_errors(self):
+        backend = FakeBackend((0, ValueError("bad prompt")))
+        model = resilient(backend, max_attempts=3)
+        with self.assertRaises(ValueError):
+            model.invoke("hi")
+        self.assertEqual(backend.calls, 1)
+
+    def test_gives_up_after_max_attempts(self):
+        backend = FakeBackend(*[(0, ServiceUnavailable("503"))] * 5)
+        with self.assertRaises(ServiceUnavailable):
+            resilient(backend, max_attempts=2).invoke("hi")
+        self.assertEqual(backend.calls, 2)
+
+    def test_slow_attempt_is_abandoned_and_retried(self):
+        backend = FakeBackend((1.0, None))
+        model = resilient(backend, attempt_timeout=0.1, max_attempts=2)
+        start = time.perf_counter()
+        self.assertEqual(model.invoke("hi").content, "answer to hi")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(model.timed_out, 1)
+
+    def test_deadline_bounds_total_time(self):
+        backend = FakeBackend(default_latency=1.0)
+        model = resilient(backend, deadline=5, attempt_timeout=5, max_attempts=3)
+        start = time.perf_counter()
+        with deadline_scope(0.2):
+            with self.assertRaises(DeadlineExceeded):
+                model.invoke("hi")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(backend.calls, 1)
+
+    def test_streamed_tailoring_has_a_deadline(self):
+        backend = FakeBackend(default_latency=1.0)
+        model = resilient(backend, deadline=5, attempt_timeout=5, max_attempts=3)
+        improver = ResumeImprover(model=model)
+        start = time.perf_counter()
+        with mock.patch.object(Config, "LLM_DEADLINE", 0.2):
+            with self.assertRaises(DeadlineExceeded):
+                list(improver.stream_resume(RESUME, "<p>Python developer</p>", use_cache=False))
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(backend.calls, 1)
+
+    def test_async_retries(self):
+        backend = FakeBackend((0, ServiceUnavailable("503")))
+        model = resilient(backend, max_attempts=2)
+        self.assertEqual(asyncio.run(model.ainvoke("hi")).content, "answer to hi")
+        self.assertEqual(backend.calls, 2)
+
+    def test_stream_retries_before_first_chunk(self):
+        backend = FakeBackend((0, ServiceUnavailable("503")))
+        model = resilient(backend, max_attempts=2)
+        self.assertEqual("".join(chunk.content for chunk in model.stream("hi")), "answer to hi")
+
+    def test_classifies_errors_by_name(self):
+        self.assertTrue(is_retryable(ServiceUnavailable()))
+        self.assertTrue(is_retryable(TimeoutError()))
+        self.assertFalse(is_retryable(DeadlineExceeded()))
+        self.assertFalse(is_retryable(KeyError()))
+
+
+class TestHedging(unittest.TestCase):
+    def test_hedge_wins_over_slow_first_request(self):
+        backend = FakeBackend((1.0, None), (0.0, None))
+        model = resilient(backend, hedging=True, hedge_delay=0.05)
+        start = time.perf_counter()
+        model.invoke("hi")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual((model.hedged, model.hedge_wins), (1, 1))
+
+    def test_no_hedge_when_first_answer_is_fast(self):
+        backend = FakeBackend(default_latency=0.0)
+        model = resilient(backend, hedging=True, hedge_delay=0.5)
+        model.invoke("hi")
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(model.hedged, 0)
+
+    def test_async_hedge_cancels_loser(self):
+        backend = FakeBackend((1.0, None), (0.0, None))
+        model = resilient(backend, hedging=True, hedge_delay=0.05)
+        start = time.perf_counter()
+        asyncio.run(model.ainvoke("hi"))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(model.hedge_wins, 1)
+
+    def test_hedge_delay_follows_observed_p95(self):
+        model = resilient(FakeBackend(), hedging=True, hedge_delay=10)
+        for _ in range(50):
+            model.latency.record(0.2)
+        self.assertAlmostEqual(model._hedge_after(), 0.2)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_failures_and_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        backend = FakeBackend(*[(0, ServiceUnavailable("503"))] * 2)
+        model = resilient(backend, breaker=breaker, max_attempts=1)
+        for _ in range(2):
+            with self.assertRaises(ServiceUnavailable):
+                model.invoke("hi")
+
+        with self.assertRaises(CircuitOpenError):
+            model.invoke("hi")
+        self.assertEqual(backend.calls, 2)
+        self.assertEqual(breaker.stats()["state"], CircuitBreaker.OPEN)
+
+    def test_half_open_trial_closes_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        backend = FakeBackend((0, ServiceUnavailable("503")))
+        model = resilient(backend, breaker=breaker, max_attempts=1)
+        with self.assertRaises(ServiceUnavailable):
+            model.invoke("hi")
+        with self.assertRaises(CircuitOpenError):
+            model.invoke("hi")
+
+        time.sleep(0.06)
+        self.assertEqual(model.invoke("hi").content, "answer to hi")
+        self.assertEqual(breaker.stats()["state"], CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.stats()["state"], CircuitBreaker.OPEN)
+
+    def test_endpoint_reports_unavailable(self):
+        app = create_app()
+        app.extensions["result_cache"] = None
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        app.extensions["llm_clients"] = LLMClientRegistry(
+            factory=lambda name, temperature: FakeBackend(), breaker=breaker
+        )
+        response = app.test_client().post("/api/tailor-resume", json={
+            "jobHtml": "<p>Python developer</p>",
+            "resumeData": {"name": "Jane", "skills": [], "experience": [], "education": []},
+        })
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
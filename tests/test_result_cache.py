@@ -0,0 +1,108 @@
+import os
+import tempfile
+import time
+import unittest
+
+from resumegpt.app import create_app
+from resumegpt.models.resume import Resume
+from resumegpt.services.llm_client import LLMClientRegistry
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.result_cache import TailoringCache
+
+from tests.fixtures import RESUME, fake_model, resume
+
+
+class TestTailoringCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = os.path.join(self.tmpdir.name, "cache", "results.sqlite3")
+
+    def test_key_normalizes_whitespace_only(self):
+        key = TailoringCache.make_key("<p>Python  dev</p>\n", "{}", "gemini", 0.7)
+        self.assertEqual(key, TailoringCache.make_key(" <p>Python dev</p>", "{}", "gemini", 0.7))
+        self.assertNotEqual(key, TailoringCache.make_key("<p>Python dev</p>", "{}", "gemini", 0.2))
+        self.assertNotEqual(key, TailoringCache.make_key("<p>Python dev</p>", "{}", "other", 0.7))
+
+    def test_memory_then_disk_tier(self):
+        cache = TailoringCache(db_path=self.db_path)
+        cache.set("k", {"a": 1})
+        self.assertEqual(cache.get("k"), {"a": 1})
+
+        # A new process sees the disk tier only
+        fresh = TailoringCache(db_path=self.db_path)
+        self.assertEqual(fresh.get("k"), {"a": 1})
+        self.assertEqual(fresh.get("k"), {"a": 1})
+        self.assertIsNone(fresh.get("missing"))
+        self.assertEqual(
+            {k: fresh.stats()[k] for k in ("memory_hits", "disk_hits", "misses")},
+            {"memory_hits": 1, "disk_hits": 1, "misses": 1},
+        )
+
+    def test_lru_bounds(self):
+        cache = TailoringCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+        small = TailoringCache(max_bytes=10)
+        small.set("big", "x" * 20)
+        self.assertEqual(small.stats()["memory_entries"], 0)
+
+    def test_ttl_expiry(self):
+        cache = TailoringCache(max_entries=0, db_path=self.db_path, ttl=0.05)
+        cache.set("k", 1)
+        self.assertEqual(cache.get("k"), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.evict_expired(), 1)
+
+    def test_returns_copies(self):
+        cache = TailoringCache()
+        cache.set("k", {"skills": ["Python"]})
+        cache.get("k")["skills"].append("Go")
+        self.assertEqual(cache.get("k"), {"skills": ["Python"]})
+
+
+class TestCachedTailoring(unittest.TestCase):
+    def setUp(self):
+        self.model = fake_model()
+        self.app = create_app()
+        self.app.extensions["llm_clients"] = LLMClientRegistry(factory=lambda name, temperature: self.model)
+        self.app.extensions["result_cache"] = TailoringCache()
+        self.client = self.app.test_client()
+
+    def _post(self, **extra):
+        return self.client.post("/api/tailor-resume", json={
+            "jobHtml": "<p>Python developer</p>",
+            "resumeData": RESUME,
+            **extra,
+        })
+
+    def test_repeat_request_skips_model(self):
+        first = self._post().get_json()
+        second = self._post().get_json()
+        self.assertEqual(first["data"], second["data"])
+        self.assertEqual(self.model.usage()["calls"], 1)
+
+        stats = self.client.get("/api/stats").get_json()["result_cache"]
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_bypass_flag(self):
+        self._post()
+        self._post(bypassCache=True)
+        self.assertEqual(self.model.usage()["calls"], 2)
+
+    def test_different_resume_misses(self):
+        improver = ResumeImprover(model=self.model, cache=TailoringCache())
+        improver.tailor(Resume(**RESUME), "<p>Python developer</p>")
+        improver.tailor(Resume(**resume(skills=["Go"])), "<p>Python developer</p>")
+        self.assertEqual(self.model.usage()["calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
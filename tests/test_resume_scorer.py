@@ -0,0 +1,289 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from resumegpt.app import create_app
+from resumegpt.models.job_post import JobSkills
+from resumegpt.services.resume_scorer import ResumeScorer, _resume_skill_list, _skills_text, normalize_skill
+from resumegpt.utils.model_cache import EMBEDDING_MODEL, ModelCache
+from resumegpt.utils.embeddings import mean_pooled
+
+from tests.test_quantization import TEXTS, tiny_bert
+
+# Keep the tests away from the on-disk store in the home directory
+STORE_PATCH = mock.patch("resumegpt.services.resume_scorer.shared_embedding_store", return_value=None)
+
+
+def setUpModule():
+    STORE_PATCH.start()
+
+
+def tearDownModule():
+    STORE_PATCH.stop()
+
+
+class CountingModel:
+    """Wraps a model, counting forward passes and the batch sizes they saw."""
+
+    def __init__(self, model):
+        self.model = model
+        self.batches = []
+
+    def __call__(self, **inputs):
+        self.batches.append(len(inputs["input_ids"]))
+        return self.model(**inputs)
+
+
+class TestEmbedMany(unittest.TestCase):
+    def setUp(self):
+        tokenizer, model = tiny_bert()
+        self.model = CountingModel(model)
+        self.models = ModelCache()
+        self.models.register(EMBEDDING_MODEL, lambda: (tokenizer, self.model))
+        self.scorer = ResumeScorer(models=self.models)
+
+    def test_padding_does_not_change_embeddings(self):
+        batched = self.scorer.embed_many(TEXTS)
+        alone = np.concatenate([ResumeScorer(models=self.models).embed_many([text]) for text in TEXTS])
+        np.testing.assert_allclose(batched, alone, atol=1e-5)
+
+    def test_returns_normalized_rows_in_input_order(self):
+        texts = [TEXTS[2], TEXTS[0], TEXTS[2], TEXTS[1]]
+        embeddings = self.scorer.embed_many(texts, batch_size=2)
+        self.assertEqual(embeddings.dtype, np.float32)
+        self.assertTrue(embeddings.flags["C_CONTIGUOUS"])
+        self.assertEqual(embeddings.shape, (4, 128))
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+        np.testing.assert_array_equal(embeddings[0], embeddings[2])
+        # Duplicates are embedded once
+        self.assertEqual(self.model.batches, [2, 1])
+
+    def test_matches_shared_pooling_helper(self):
+        tokenizer, _ = self.models.get(EMBEDDING_MODEL)
+        expected = mean_pooled(tokenizer, self.model, TEXTS, normalize=True)
+        np.testing.assert_allclose(self.scorer.embed_many(TEXTS), expected, atol=1e-5)
+
+    def test_empty_input(self):
+        self.assertEqual(self.scorer.embed_many([]).shape[0], 0)
+        self.assertEqual(self.model.batches, [])
+
+    def test_match_score_embeds_all_sections_in_one_pass(self):
+        resume = {
+            "skills": {},
+            "experiences": [{"highlights": ["write python software", "lead teams"]}],
+            "education": [{"school": "acme", "degrees": [{"names": ["software engineers"]}]}],
+        }
+        job = {"skills": {}, "requirements": ["python engineers", "lead teams in berlin"]}
+        resume["skills"] = ["python", "software"]
+        job["skills"] = {"technical_skills": ["Python", "teams"]}
+        scores = self.scorer.calculate_match_score(resume, job)
+        # Three section texts and the two resume skills plus the job skill without an exact match
+        self.assertEqual(self.model.batches, [6])
+        self.assertEqual(scores["skill_matches"][0]["resume_skill"], "python")
+        for name in ("experience_match", "education_match"):
+            self.assertGreaterEqual(scores[name], -1.0)
+            self.assertLessEqual(scores[name], 1.0)
+        self.assertAlmostEqual(
+            scores["experience_match"],
+            self.scorer._score_experience_match(resume["experiences"], job["requirements"]),
+            places=5,
+        )
+
+
+# Hand-made unit vectors, so expected similarities are known
+SKILL_VECTORS = {
+    "pytorch": [1.0, 0.0, 0.0],
+    "deep learning": [0.8, 0.6, 0.0],
+    "communication": [0.0, 0.0, 1.0],
+    "public speaking": [0.0, 0.6, 0.8],
+    "cobol": [0.0, 1.0, 0.0],
+}
+
+
+class FixedScorer(ResumeScorer):
+    def __init__(self):
+        super().__init__(models=ModelCache(), store=None)
+        self.calls = []
+
+    def embed_many(self, texts, batch_size=None):
+        self.calls.append(list(texts))
+        return np.array([SKILL_VECTORS[text] for text in texts], dtype=np.float32)
+
+
+class TestSkillsMatch(unittest.TestCase):
+    def test_exact_and_alias_matches_skip_the_model(self):
+        models = ModelCache()
+        models.register(EMBEDDING_MODEL, mock.Mock(side_effect=AssertionError("model loaded")))
+        scorer = ResumeScorer(models=models)
+        result = scorer.match_skills(
+            {"languages": ["Python", "JS"], "tools": ["k8s"]},
+            {"technical_skills": ["python", "JavaScript", "Kubernetes"]},
+        )
+        self.assertEqual(result["score"], 1.0)
+        self.assertEqual(
+            [(m["job_skill"], m["resume_skill"], m["exact"]) for m in result["matches"]],
+            [("python", "Python", True), ("JavaScript", "JS", True), ("Kubernetes", "k8s", True)],
+        )
+        self.assertEqual(models.stats()["loads"], 0)
+        self.assertEqual(normalize_skill("  Node.JS "), "node.js")
+
+    def test_semantic_matches_use_one_batch_for_all_categories(self):
+        scorer = FixedScorer()
+        result = scorer.match_skills(
+            [{"skills": ["PyTorch", "Communication"]}],
+            JobSkills(technical_skills=["Deep Learning", "COBOL", "pytorch"], non_technical_skills=["Public Speaking"]),
+        )
+        self.assertEqual(len(scorer.calls), 1)
+        self.assertCountEqual(
+            scorer.calls[0], ["pytorch", "communication", "deep learning", "cobol", "public speaking"]
+        )
+        technical = result["categories"]["technical_skills"]
+        self.assertEqual(technical["missing"], ["COBOL"])
+        self.assertAlmostEqual(technical["coverage"], 2 / 3)
+        self.assertAlmostEqual(technical["score"], (0.8 + 0.0 + 1.0) / 3, places=5)
+        matches = {m["job_skill"]: (m["resume_skill"], round(m["similarity"], 5)) for m in result["matches"]}
+        self.assertEqual(matches["Deep Learning"], ("PyTorch", 0.8))
+        self.assertEqual(matches["Public Speaking"], ("Communication", 0.8))
+        self.assertAlmostEqual(result["score"], (technical["score"] + 0.8) / 2, places=5)
+
+    def test_empty_sides(self):
+        scorer = FixedScorer()
+        self.assertEqual(scorer._score_skills_match([], {"technical_skills": ["cobol"]}), 0.0)
+        self.assertEqual(scorer._score_skills_match(["cobol"], {}), 1.0)
+        self.assertEqual(scorer.calls, [])
+
+
+class HashedScorer(ResumeScorer):
+    """Deterministic pseudo-random unit vectors per text, counting embed_many calls."""
+
+    def __init__(self):
+        super().__init__(models=ModelCache(), store=None)
+        self.calls = 0
+
+    def embed_many(self, texts, batch_size=None):
+        self.calls += 1
+        rows = [np.random.default_rng(abs(hash(text))).standard_normal(16) for text in texts]
+        rows = np.array(rows, dtype=np.float32).reshape(len(texts), 16)
+        return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def make_corpora(resume_count, job_count):
+    resumes = [
+        {
+            "skills": [f"skill {i % 7}", f"tool {i % 5}"],
+            "experiences": [{"highlights": [f"built system {i}"]}],
+            "education": [{"school": f"school {i % 3}", "degrees": [{"names": ["BSc"]}]}] if i % 4 else [],
+        }
+        for i in range(resume_count)
+    ]
+    jobs = [
+        {
+            "skills": {"technical_skills": [f"skill {j % 7}"]} if j % 5 else {},
+            "requirements": [f"requirement {j}"] if j % 6 else [],
+        }
+        for j in range(job_count)
+    ]
+    return resumes, jobs
+
+
+class TestRank(unittest.TestCase):
+    def brute_force(self, scorer, resumes, jobs):
+        """Overall scores from the per-section pair scores, resumes x jobs."""
+        overall = np.zeros((len(resumes), len(jobs)))
+        for i, resume in enumerate(resumes):
+            for j, job in enumerate(jobs):
+                job_skill_list = [s for skills in job["skills"].values() for s in skills]
+                if not job_skill_list:
+                    skills = 1.0
+                else:
+                    a, b = scorer.embed_many([_skills_text(_resume_skill_list(resume["skills"])), _skills_text(job_skill_list)])
+                    skills = float(a @ b)
+                overall[i, j] = (
+                    skills
+                    + scorer._score_experience_match(resume["experiences"], job["requirements"])
+                    + scorer._score_education_match(resume["education"], job["requirements"])
+                ) / 3
+        return overall
+
+    def test_matches_brute_force_in_both_directions(self):
+        scorer = HashedScorer()
+        resumes, jobs = make_corpora(23, 11)
+        expected = self.brute_force(scorer, resumes, jobs)
+
+        scorer.calls = 0
+        by_job = scorer.rank(resumes, jobs, top_k=5, chunk_size=4)
+        self.assertEqual(scorer.calls, 2)
+        self.assertEqual(len(by_job), 11)
+        for j, ranking in enumerate(by_job):
+            self.assertEqual([entry["index"] for entry in ranking], list(np.argsort(-expected[:, j], kind="stable")[:5]))
+            np.testing.assert_allclose([entry["overall_match"] for entry in ranking],
+                                       np.sort(expected[:, j])[::-1][:5], atol=1e-5)
+
+        by_resume = scorer.rank(resumes, jobs, top_k=3, by="resume", chunk_size=5)
+        self.assertEqual(len(by_resume), 23)
+        for i, ranking in enumerate(by_resume):
+            self.assertEqual([entry["index"] for entry in ranking], list(np.argsort(-expected[i], kind="stable")[:3]))
+
+    def test_chunking_does_not_change_results(self):
+        scorer = HashedScorer()
+        resumes, jobs = make_corpora(30, 9)
+        chunked = scorer.rank(resumes, jobs, top_k=4, chunk_size=2)
+        whole = scorer.rank(resumes, jobs, top_k=4, chunk_size=1000)
+        self.assertEqual([[e["index"] for e in r] for r in chunked], [[e["index"] for e in r] for r in whole])
+        np.testing.assert_allclose([[e["overall_match"] for e in r] for r in chunked],
+                                   [[e["overall_match"] for e in r] for r in whole], atol=1e-6)
+
+    def test_top_k_larger_than_corpus_and_bad_arguments(self):
+        scorer = HashedScorer()
+        resumes, jobs = make_corpora(3, 2)
+        ranking = scorer.rank(resumes, jobs, top_k=10)
+        self.assertEqual([len(r) for r in ranking], [3, 3])
+        self.assertEqual(scorer.rank([], jobs), [[], []])
+        with self.assertRaises(ValueError):
+            scorer.rank(resumes, jobs, by="company")
+        with self.assertRaises(ValueError):
+            scorer.rank(resumes, jobs, top_k=0)
+
+
+class TestRankEndpoint(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("resumegpt.services.api_handler.ResumeScorer", HashedScorer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = create_app()
+        self.client = self.app.test_client()
+
+    def test_ranks_resumes_per_job(self):
+        resumes, jobs = make_corpora(12, 3)
+        response = self.client.post("/api/rank", json={"resumes": resumes, "jobs": jobs, "topK": 4})
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body["by"], "job")
+        self.assertEqual([len(ranking) for ranking in body["rankings"]], [4, 4, 4])
+        self.assertEqual(body["rankings"], HashedScorer().rank(resumes, jobs, top_k=4))
+
+    def test_rejects_bad_requests(self):
+        resumes, jobs = make_corpora(2, 2)
+        for payload in ({"jobs": jobs}, {"resumes": resumes, "jobs": ["posting"]},
+                        {"resumes": resumes, "jobs": jobs, "by": "company"}):
+            self.assertEqual(self.client.post("/api/rank", json=payload).status_code, 400)
+
+    def test_reuses_one_scorer(self):
+        resumes, jobs = make_corpora(2, 2)
+        self.client.post("/api/rank", json={"resumes": resumes, "jobs": jobs})
+        scorer = self.app.extensions["resume_scorer"]
+        self.client.post("/api/rank", json={"resumes": resumes, "jobs": jobs})
+        self.assertIsInstance(scorer, HashedScorer)
+        self.assertIs(self.app.extensions["resume_scorer"], scorer)
+
+    def test_scoring_errors_are_json(self):
+        resumes, jobs = make_corpora(2, 2)
+        with mock.patch.object(HashedScorer, "rank", side_effect=RuntimeError("model failed to load")):
+            response = self.client.post("/api/rank", json={"resumes": resumes, "jobs": jobs})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json(), {"success": False, "error": "model failed to load"})
+
+
+if __name__ == "__main__":
+    unittest.main()
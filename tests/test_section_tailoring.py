@@ -0,0 +1,118 @@
+import json
+import re
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from resumegpt.models.resume import Resume, TailoredResume
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.single_flight import SingleFlight
+
+from tests.fixtures import resume
+
+
+RESUME = resume(experience=[
+    {"title": "Engineer", "company": "Acme", "description": "Built APIs for billing and payments"},
+    {"title": "Intern", "company": "Initech", "description": "Wrote tests"},
+])
+
+
+class SectionModel:
+    """Answers section prompts, tagging each entry so the merge can be checked.
+
+    The first experience entry answers last, so results arrive out of order.
+    """
+
+    def __init__(self, latency=0.1, fail_on=None):
+        self.latency = latency
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        kind = re.search(r"Resume section \((\w+)\)", prompt).group(1)
+        section = json.loads(prompt.split("):", 1)[1].split("Important Instructions")[0])
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency * (3 if section.get("company") == "Acme" else 1))
+        with self._lock:
+            self.active -= 1
+        if kind == self.fail_on:
+            raise RuntimeError(f"{kind} failed")
+
+        if kind == "skills":
+            value, score = list(reversed(section["skills"])), 90
+        else:
+            value = dict(section, description=section["description"] + " (tailored)")
+            score = 80 if kind == "experience" else 40
+        return SimpleNamespace(content=json.dumps({
+            kind: value, "match_score": score, "improvements": [f"Tailored {kind}", "Shared note"],
+        }))
+
+
+class TestSectionTailoring(unittest.TestCase):
+    def tailor(self, model, **kwargs):
+        improver = ResumeImprover(model=model, flights=SingleFlight(), mode="sections", **kwargs)
+        return improver.process_resume(RESUME, "<p>Python developer</p>")
+
+    def test_merges_sections_in_resume_order(self):
+        result = self.tailor(SectionModel())
+        TailoredResume(**result)
+
+        tailored = result["tailored_resume"]
+        self.assertEqual(tailored["name"], "Jane Doe")
+        self.assertEqual(tailored["skills"], ["Flask", "Python"])
+        self.assertEqual([exp["company"] for exp in tailored["experience"]], ["Acme", "Initech"])
+        self.assertTrue(tailored["education"][0]["description"].endswith("(tailored)"))
+        self.assertEqual(result["improvements"],
+                         ["Tailored skills", "Shared note", "Tailored experience", "Tailored education"])
+
+    def test_match_score_is_weighted_by_section_size(self):
+        score = self.tailor(SectionModel(latency=0))["match_score"]
+        # Between the education score (40) and the others (80-90), nearer the larger sections
+        self.assertGreater(score, 60)
+        self.assertLess(score, 85)
+
+    def test_sections_run_concurrently(self):
+        model = SectionModel(latency=0.1)
+        start = time.perf_counter()
+        self.tailor(model)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(model.prompts), 4)
+        self.assertEqual(model.peak, 4)
+        self.assertLess(elapsed, 0.5)
+
+    def test_failed_section_fails_the_resume(self):
+        with self.assertRaises(RuntimeError):
+            self.tailor(SectionModel(latency=0, fail_on="education"))
+
+    def test_streams_sections_as_they_finish(self):
+        improver = ResumeImprover(model=SectionModel(), flights=SingleFlight(), mode="sections")
+        events = list(improver.stream_resume(RESUME, "<p>Python developer</p>"))
+        names = [name for name, _ in events]
+
+        self.assertEqual(names[-4:], ["education", "match_score", "improvements", "result"])
+        experience = [payload for name, payload in events if name == "experience"]
+        # The slow first entry is emitted after the second one
+        self.assertEqual([entry["index"] for entry in experience], [1, 0])
+
+    def test_cache_key_depends_on_mode(self):
+        resume = Resume(**RESUME)
+        model = SectionModel()
+        monolithic = ResumeImprover(model=model, mode="monolithic")._request_key(resume, "x")
+        sections = ResumeImprover(model=model, mode="sections")._request_key(resume, "x")
+        self.assertNotEqual(monolithic, sections)
+
+    def test_rejects_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            ResumeImprover(model=SectionModel(), mode="parallel")
+
+
+if __name__ == "__main__":
+    unittest.main()
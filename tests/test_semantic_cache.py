@@ -0,0 +1,116 @@
+import hashlib
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from resumegpt.models.job_post import JobPost
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.semantic_cache import WORD_PATTERN, SemanticCache, minilm_embedder
+from resumegpt.utils.single_flight import SingleFlight
+
+from tests.fixtures import fake_model, resume
+
+
+def bag_of_words(text, dims=256):
+    """Hashed word counts: close in cosine when the wording is close."""
+    vector = np.zeros(dims, dtype=np.float32)
+    for word in WORD_PATTERN.findall(text.lower()):
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % dims] += 1
+    return vector
+
+
+POSTING = ("Backend Engineer at Initech. You will build Python services and REST APIs. "
+           "Must know SQL and PostgreSQL. Strong communication skills. Remote friendly team.")
+REPOSTED = POSTING + " Apply today!"
+OTHER = "Pastry chef wanted at a busy downtown bakery. Early mornings, croissants and bread."
+
+RESUME = resume(skills=["Go", "Python", "SQL"])
+
+
+class TestSemanticCache(unittest.TestCase):
+    def test_near_duplicate_hits(self):
+        cache = SemanticCache(bag_of_words, threshold=0.9)
+        cache.set(POSTING, "parsed", {"company": "Initech"})
+
+        self.assertEqual(cache.get(REPOSTED, "parsed"), {"company": "Initech"})
+        self.assertIsNone(cache.get(OTHER, "parsed"))
+        self.assertIsNone(cache.get(REPOSTED, "tailored:other-resume"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 1))
+
+    def test_low_word_overlap_overrides_embedding_match(self):
+        # An embedder that calls everything identical
+        cache = SemanticCache(lambda text: np.ones(4), threshold=0.9, min_overlap=0.6)
+        cache.set(POSTING, "parsed", "initech")
+
+        self.assertIsNone(cache.get(OTHER, "parsed"))
+        self.assertEqual(cache.stats()["false_positive_overrides"], 1)
+        # The other posting gets its own entry instead of overwriting
+        cache.set(OTHER, "parsed", "bakery")
+        self.assertEqual(cache.get(POSTING, "parsed"), "initech")
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_evicts_least_recently_used_posting(self):
+        cache = SemanticCache(bag_of_words, max_entries=2)
+        cache.set(POSTING, "k", 1)
+        cache.set(OTHER, "k", 2)
+        cache.get(POSTING, "k")
+        cache.set("Night shift warehouse forklift operator", "k", 3)
+
+        self.assertEqual(cache.get(POSTING, "k"), 1)
+        self.assertIsNone(cache.get(OTHER, "k"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["vector_bytes"], 2 * 256 * 4)
+
+    def test_bounds_values_per_posting(self):
+        cache = SemanticCache(bag_of_words, values_per_entry=2)
+        for key in ("a", "b", "c"):
+            cache.set(POSTING, key, key)
+        self.assertIsNone(cache.get(POSTING, "a"))
+        self.assertEqual(cache.get(POSTING, "c"), "c")
+
+
+class TestMiniLMEmbedder(unittest.TestCase):
+    def test_embeds_through_one_lazily_created_scorer(self):
+        with mock.patch("resumegpt.services.resume_scorer.ResumeScorer") as scorer_class:
+            scorer_class.return_value.embed_many.side_effect = lambda texts: np.ones((len(texts), 4))
+            embed = minilm_embedder()
+            scorer_class.assert_not_called()
+            embed(POSTING)
+            vector = embed(OTHER)
+
+        scorer_class.assert_called_once_with()
+        self.assertEqual(scorer_class.return_value.embed_many.call_args_list,
+                         [mock.call([POSTING]), mock.call([OTHER])])
+        self.assertEqual(vector.shape, (4,))
+
+
+class TestSemanticReuse(unittest.TestCase):
+    def test_job_post_reuses_near_duplicate_parse(self):
+        cache = SemanticCache(bag_of_words)
+        backend = fake_model()
+        first = JobPost(f"<p>{POSTING}</p>", llm=backend, flights=SingleFlight(), semantic_cache=cache)
+        parsed = first.parse_job_post(mode="structured")
+        calls = backend.usage()["calls"]
+
+        second = JobPost(f"<p>{REPOSTED}</p>", llm=backend, flights=SingleFlight(), semantic_cache=cache)
+        self.assertEqual(second.parse_job_post(mode="structured"), parsed)
+        self.assertEqual(backend.usage()["calls"], calls)
+        self.assertEqual(second.parsed_job.company, parsed["company"])
+
+    def test_tailoring_reused_only_for_same_resume(self):
+        cache = SemanticCache(bag_of_words)
+        backend = fake_model()
+        improver = ResumeImprover(model=backend, flights=SingleFlight(), semantic_cache=cache)
+        result = improver.process_resume(RESUME, f"<p>{POSTING}</p>")
+
+        self.assertEqual(improver.process_resume(RESUME, f"<div>{REPOSTED}</div>"), result)
+        self.assertEqual(backend.usage()["calls"], 1)
+
+        improver.process_resume(dict(RESUME, name="John Roe"), f"<div>{REPOSTED}</div>")
+        self.assertEqual(backend.usage()["calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
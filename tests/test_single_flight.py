@@ -0,0 +1,118 @@
+import threading
+import time
+import unittest
+
+from resumegpt.app import create_app
+from resumegpt.models.job_post import JobPost
+from resumegpt.services.llm_client import LLMClientRegistry
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.single_flight import SingleFlight
+
+from tests.fixtures import RESUME, fake_model
+
+
+def run_concurrently(fn, n):
+    results, errors = [], []
+    barrier = threading.Barrier(n)
+
+    def target():
+        barrier.wait()
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_shares_result_and_counts(self):
+        flights = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"value": 42}
+
+        results, errors = run_concurrently(lambda: flights.do("k", work), 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 42}] * 8)
+        self.assertFalse(errors)
+        self.assertEqual(flights.stats(), {"executed": 1, "coalesced": 7, "in_flight": 0})
+
+        # Each caller owns its copy
+        results[0]["value"] = 0
+        self.assertEqual(results[1]["value"], 42)
+
+    def test_shares_exception(self):
+        flights = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError("backend down")
+
+        results, errors = run_concurrently(lambda: flights.do("k", fail), 4)
+        self.assertFalse(results)
+        self.assertEqual([str(e) for e in errors], ["backend down"] * 4)
+
+    def test_key_is_released(self):
+        flights = SingleFlight()
+        flights.do("k", lambda: 1)
+        flights.do("k", lambda: 2)
+        self.assertEqual(flights.stats()["executed"], 2)
+
+
+class TestCoalescedTailoring(unittest.TestCase):
+    def test_concurrent_identical_requests_make_one_model_call(self):
+        model = fake_model(latency=0.2)
+        app = create_app()
+        app.extensions["llm_clients"] = LLMClientRegistry(factory=lambda name, temperature: model)
+        app.extensions["result_cache"] = None
+        before = app.test_client().get("/api/stats").get_json()["coalescing"]["coalesced"]
+
+        def post():
+            response = app.test_client().post("/api/tailor-resume", json={
+                "jobHtml": "<p>Python developer</p>",
+                "resumeData": RESUME,
+            })
+            return response.get_json()
+
+        results, errors = run_concurrently(post, 6)
+        self.assertFalse(errors)
+        self.assertEqual(model.usage()["calls"], 1)
+        self.assertTrue(all(result["data"] == results[0]["data"] for result in results))
+        after = app.test_client().get("/api/stats").get_json()["coalescing"]["coalesced"]
+        self.assertEqual(after - before, 5)
+
+    def test_different_postings_are_not_coalesced(self):
+        model = fake_model(latency=0.05)
+        improver = ResumeImprover(model=model, flights=SingleFlight())
+        counter = iter(range(100))
+        run_concurrently(lambda: improver.process_resume(RESUME, f"<p>Job {next(counter)}</p>"), 4)
+        self.assertEqual(model.usage()["calls"], 4)
+
+
+class TestCoalescedJobParsing(unittest.TestCase):
+    def test_concurrent_parses_share_extraction(self):
+        model = fake_model(latency=0.02)
+        flights = SingleFlight()
+        posting = "<div><h1>Engineer</h1><p>Python and SQL</p></div>"
+
+        results, errors = run_concurrently(
+            lambda: JobPost(posting, llm=model, flights=flights).parse_job_post(mode="serial"), 5
+        )
+        self.assertFalse(errors)
+        # One posting needs seven extraction calls, however many callers ask
+        self.assertEqual(model.usage()["calls"], 7)
+        self.assertEqual(flights.stats()["coalesced"], 4)
+        self.assertTrue(all(result == results[0] for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import json
+import unittest
+from types import SimpleNamespace
+from typing import List
+
+from resumegpt.app import create_app
+from resumegpt.models.resume import TailoredResume
+from resumegpt.services.llm_client import LLMClientRegistry
+from resumegpt.services.resume_improver import ResumeImprover
+from resumegpt.utils.json_stream import ANY, JSONStreamParser, SchemaDriftError, extract_json
+from resumegpt.utils.single_flight import SingleFlight
+
+from tests.fixtures import resume
+
+
+RESUME = resume(experience=[
+    {"title": "Engineer", "company": "Acme", "description": "Built APIs"},
+    {"title": "Intern", "company": "Initech", "description": "Wrote tests"},
+])
+
+RESPONSE = "```json\n" + json.dumps({
+    "tailored_resume": RESUME,
+    "match_score": 88,
+    "improvements": ["Highlighted Flask"],
+}, indent=2) + "\n```"
+
+
+class FakeStreamingModel:
+    """Chat model stand-in that streams a canned response in small chunks."""
+
+    def __init__(self, text, chunk_size=7):
+        self.text = text
+        self.chunk_size = chunk_size
+
+    def stream(self, prompt):
+        for i in range(0, len(self.text), self.chunk_size):
+            yield SimpleNamespace(content=self.text[i:i + self.chunk_size])
+
+
+class ScriptedStreamingModel:
+    """Streams one canned reply per call and records how many chunks were read."""
+
+    def __init__(self, *texts, chunk_size=7):
+        self.texts = list(texts)
+        self.chunk_size = chunk_size
+        self.chunks_read = []
+
+    def stream(self, prompt):
+        text = self.texts.pop(0)
+        self.chunks_read.append(0)
+        for i in range(0, len(text), self.chunk_size):
+            self.chunks_read[-1] += 1
+            yield SimpleNamespace(content=text[i:i + self.chunk_size])
+
+
+class TestJSONStreamParser(unittest.TestCase):
+    def feed_all(self, parser, text, chunk_size=3):
+        events = []
+        for i in range(0, len(text), chunk_size):
+            events.extend(parser.feed(text[i:i + chunk_size]))
+        return events
+
+    def test_emits_watched_sections_in_order(self):
+        parser = JSONStreamParser(watch=[
+            ("tailored_resume", "skills"),
+            ("tailored_resume", "experience", ANY),
+            ("match_score",),
+        ])
+        events = self.feed_all(parser, RESPONSE)
+
+        self.assertEqual(events[0], (("tailored_resume", "skills"), ["Python", "Flask"]))
+        self.assertEqual(events[1][0], ("tailored_resume", "experience", 0))
+        self.assertEqual(events[2][1]["company"], "Initech")
+        self.assertEqual(events[3], (("match_score",), 88))
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.result["tailored_resume"], RESUME)
+
+    def test_section_available_before_document_ends(self):
+        parser = JSONStreamParser(watch=[("tailored_resume", "skills")])
+        cut = RESPONSE.index("experience")
+        self.assertTrue(parser.feed(RESPONSE[:cut]))
+        self.assertFalse(parser.done)
+
+    def test_handles_escapes_and_scalars(self):
+        parser = JSONStreamParser(watch=[("a",), ("b",), ("c",)])
+        events = self.feed_all(parser, 'Sure! {"a": "x \\"}\\" y", "b": -1.5e2, "c": [true, null]}', 1)
+        self.assertEqual([value for _, value in events], ['x "}" y', -150.0, [True, None]])
+
+    def test_rejects_invalid_json(self):
+        parser = JSONStreamParser()
+        parser.feed('{"a": 1 "b": 2}')
+        self.assertFalse(parser.started)
+        with self.assertRaises(ValueError):
+            extract_json('{"a": 1 "b": 2}')
+
+    def test_rescans_after_braces_in_prose(self):
+        self.assertEqual(extract_json('prose {not json} {"a":1}'), {"a": 1})
+        reply = 'Here is {your} resume:\n```json\n' + RESPONSE + '\n```'
+        self.assertEqual(extract_json(reply, TailoredResume)["match_score"], 88)
+        # Across chunks too, with the watched sections of the real value
+        parser = JSONStreamParser(watch=[("a",)])
+        events = self.feed_all(parser, 'Use {a: 1} or {"a": [1, 2]}', 3)
+        self.assertEqual(events, [(("a",), [1, 2])])
+        self.assertEqual(parser.result, {"a": [1, 2]})
+
+    def test_schema_drift_detected_before_document_ends(self):
+        drifts = [
+            ('{"tailored_resume": {"name": "Jane", "skills": "Python', ("tailored_resume", "skills")),
+            ('{"tailored_resume": {"name": {"first"', ("tailored_resume", "name")),
+            ('{"match_score": 150,', ("match_score",)),
+            ('{"tailored_resume": {"experience": [{"title": "Engineer"}', ("tailored_resume", "experience", 0)),
+        ]
+        for text, path in drifts:
+            parser = JSONStreamParser(schema=TailoredResume)
+            with self.assertRaises(SchemaDriftError) as caught:
+                parser.feed(text)
+            self.assertEqual(caught.exception.path, path)
+
+    def test_unknown_keys_are_tolerated(self):
+        reply = RESPONSE.replace('"match_score"', '"summary": {"tone": ["formal", 1]}, "notes": null, "match_score"', 1)
+        parser = JSONStreamParser(schema=TailoredResume)
+        parser.feed(reply)
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.result["summary"], {"tone": ["formal", 1]})
+        self.assertEqual(extract_json(reply, TailoredResume)["match_score"], 88)
+
+    def test_extract_json_skips_fences_and_prose(self):
+        self.assertEqual(extract_json(RESPONSE + "\nLet me know {if} that helps", TailoredResume)["match_score"], 88)
+        self.assertEqual(extract_json('Here you go:\n```json\n["SQL", "Go"]\n```', List[str]), ["SQL", "Go"])
+        with self.assertRaises(ValueError):
+            extract_json('{"tailored_resume": {"skills": ["Python"]}', TailoredResume)
+
+    def test_extract_json_stops_reading_chunks(self):
+        chunks = iter(['{"match_score": 90}', ' trailing'])
+        self.assertEqual(extract_json(chunks), {"match_score": 90})
+        self.assertEqual(list(chunks), [' trailing'])
+
+
+class TestSchemaRetry(unittest.TestCase):
+    def test_drifting_reply_is_abandoned_and_retried(self):
+        drifting = '{"tailored_resume": {"name": "Jane Doe", "skills": "' + "x" * 500 + '"}}'
+        model = ScriptedStreamingModel(drifting, RESPONSE)
+        improver = ResumeImprover(model=model, flights=SingleFlight())
+
+        result = improver.process_resume(RESUME, "<p>Python developer</p>")
+
+        self.assertEqual(result["match_score"], 88)
+        # The drifting reply was dropped at the mistyped value, not read to the end
+        self.assertLess(model.chunks_read[0], 10)
+
+    def test_streamed_reply_without_json_is_retried(self):
+        model = ScriptedStreamingModel("Sorry, {I can't} help with that.", RESPONSE)
+        improver = ResumeImprover(model=model, flights=SingleFlight())
+
+        events = list(improver.stream_resume(RESUME, "<p>Python developer</p>", use_cache=False))
+
+        self.assertEqual(events[-1][0], "result")
+        self.assertEqual(len(model.chunks_read), 2)
+
+
+class TestStreamEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.extensions["result_cache"] = None
+
+    def _stream(self, text):
+        model = FakeStreamingModel(text)
+        self.app.extensions["llm_clients"] = LLMClientRegistry(factory=lambda name, temperature: model)
+        response = self.client.post(
+            "/api/tailor-resume/stream",
+            json={"jobHtml": "<p>Python developer</p>", "resumeData": RESUME},
+        )
+        body = response.get_data(as_text=True)
+        events = []
+        for frame in body.strip().split("\n\n"):
+            event, data = frame.split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+        return response, events
+
+    def test_streams_sections_then_result(self):
+        response, events = self._stream(RESPONSE)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        names = [name for name, _ in events]
+        self.assertEqual(names, ["skills", "experience", "experience", "education",
+                                 "match_score", "improvements", "result"])
+        self.assertEqual(events[2][1], {"index": 1, "entry": RESUME["experience"][1]})
+        self.assertEqual(events[-1][1]["match_score"], 88)
+
+    def test_reports_malformed_output(self):
+        _, events = self._stream('{"tailored_resume": {"skills": ["Python"]}')
+        self.assertEqual(events[-1][0], "error")
+
+    def test_rejects_missing_fields(self):
+        response = self.client.post("/api/tailor-resume/stream", json={"jobHtml": "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
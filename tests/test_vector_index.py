@@ -0,0 +1,288 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import yaml
+
+from resumegpt.app import create_app
+from resumegpt.models.job_post import JobPost
+from resumegpt.services.job_index import IndexNotReadyError, JobIndex, posting_text
+from resumegpt.utils.vector_index import IVFIndex
+
+
+def clustered(count, dim=16, clusters=8, seed=0):
+    """Unit vectors around a few random centres, like embeddings of related postings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim))
+    vectors = centres[rng.integers(0, clusters, count)] + 0.3 * rng.standard_normal((count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def brute_force(vectors, query, k):
+    return list(np.argsort(-(vectors @ query), kind="stable")[:k])
+
+
+class TestIVFIndex(unittest.TestCase):
+    def setUp(self):
+        self.vectors = clustered(600)
+        self.keys = [f"job-{i}" for i in range(len(self.vectors))]
+
+    def test_exact_before_training(self):
+        index = IVFIndex(16, train_threshold=1000)
+        index.add(self.keys, self.vectors)
+        self.assertFalse(index.trained)
+        query = self.vectors[3]
+        self.assertEqual([key for key, _ in index.search(query, 5)],
+                         [self.keys[i] for i in brute_force(self.vectors, query, 5)])
+
+    def test_trains_and_keeps_recall(self):
+        index = IVFIndex(16, nlist=8, nprobe=2, train_threshold=200)
+        for start in range(0, len(self.keys), 50):
+            index.add(self.keys[start:start + 50], self.vectors[start:start + 50])
+        self.assertTrue(index.trained)
+        self.assertEqual(index.stats()["lists"], 8)
+        self.assertEqual(len(index), 600)
+
+        recall = []
+        for i in range(0, 600, 30):
+            expected = {self.keys[j] for j in brute_force(self.vectors, self.vectors[i], 10)}
+            recall.append(len(expected & {key for key, _ in index.search(self.vectors[i], 10)}) / 10)
+        self.assertGreater(np.mean(recall), 0.9)
+        # Probing every list is exact
+        found = [key for key, _ in index.search(self.vectors[7], 10, nprobe=8)]
+        self.assertEqual(found, [self.keys[i] for i in brute_force(self.vectors, self.vectors[7], 10)])
+
+    def test_remove_and_replace(self):
+        index = IVFIndex(16, nlist=4, train_threshold=100)
+        index.add(self.keys, self.vectors)
+        self.assertEqual(index.remove(["job-5", "job-6", "missing"]), 2)
+        self.assertNotIn("job-5", index)
+        self.assertNotIn("job-5", [key for key, _ in index.search(self.vectors[5], 5, nprobe=4)])
+
+        index.add(["job-7"], self.vectors[100:101])
+        np.testing.assert_array_equal(index.get("job-7"), self.vectors[100])
+        self.assertEqual(len(index), 598)
+        # Every remaining key still maps to its own vector after the swaps
+        for i in (0, 8, 599):
+            np.testing.assert_array_equal(index.get(self.keys[i]), self.vectors[i])
+
+    def test_exclude_and_dimension_check(self):
+        index = IVFIndex(16)
+        index.add(self.keys[:20], self.vectors[:20])
+        found = index.search(self.vectors[0], 3, exclude=["job-0"])
+        self.assertEqual(len(found), 3)
+        self.assertNotIn("job-0", [key for key, _ in found])
+        with self.assertRaises(ValueError):
+            index.add(["x"], np.ones((1, 8)))
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        index = IVFIndex(16, nlist=8, nprobe=3, train_threshold=100)
+        index.add(self.keys, self.vectors)
+        index.remove(["job-1"])
+        path = os.path.join(directory, "index.npz")
+        index.save(path)
+
+        loaded = IVFIndex.load(path)
+        self.assertEqual(loaded.stats(), index.stats())
+        for i in (0, 42, 333):
+            self.assertEqual(loaded.search(self.vectors[i], 10), index.search(self.vectors[i], 10))
+        loaded.add(["new"], self.vectors[:1])
+        self.assertEqual(loaded.search(self.vectors[0], 2, exclude=["job-0"])[0][0], "new")
+
+
+class WordScorer:
+    """Bag-of-words stand-in for MiniLM, counting embedded texts."""
+
+    namespace = "words"
+    vocabulary = ["python", "backend", "nurse", "clinic", "design", "figma", "acme", "care"]
+
+    def __init__(self):
+        self.embedded = 0
+        self.texts = []
+
+    def embed_many(self, texts, batch_size=None):
+        self.embedded += len(texts)
+        self.texts.extend(texts)
+        rows = np.array([[text.lower().count(word) for word in self.vocabulary] for text in texts], dtype=np.float32)
+        rows += 0.01
+        return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+class BlockingScorer(WordScorer):
+    """Holds every embedding call until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def embed_many(self, texts, batch_size=None):
+        self.started.set()
+        self.release.wait(5)
+        return super().embed_many(texts, batch_size)
+
+
+def save_posting(directory, job_id, title, skills):
+    os.makedirs(os.path.join(directory, job_id))
+    with open(os.path.join(directory, job_id, "job.yaml"), "w") as f:
+        yaml.safe_dump({"company": "Acme", "job_title": title,
+                        "skills": {"technical_skills": skills}, "requirements": {"duties": []}}, f)
+
+
+class TestJobIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.data_dir = os.path.join(self.directory, "data")
+        self.index_path = os.path.join(self.directory, "cache", "job_index.npz")
+        save_posting(self.data_dir, "job_submission_1", "Backend engineer", ["python", "backend"])
+        save_posting(self.data_dir, "job_submission_2", "Clinic nurse", ["care", "clinic"])
+        save_posting(self.data_dir, "job_submission_3", "Python developer", ["python"])
+        os.makedirs(os.path.join(self.data_dir, "other"))
+
+    def make_index(self, scorer=None):
+        jobs = JobIndex(self.data_dir, self.index_path, scorer=scorer or WordScorer(), sync_interval=3600)
+        self.addCleanup(jobs.close)
+        return jobs
+
+    def test_posting_text(self):
+        self.assertEqual(
+            posting_text({"job_title": "Nurse", "company": None, "skills": {"technical_skills": ["care "]},
+                          "requirements": {"duties": ["night shifts"]}}),
+            "Nurse. care. night shifts",
+        )
+
+    def test_search_and_similar_to(self):
+        jobs = self.make_index()
+        jobs.sync()
+        results = jobs.search("python backend", k=2)
+        self.assertEqual([r["jobId"] for r in results], ["job_submission_1", "job_submission_3"])
+        self.assertEqual(results[0]["jobTitle"], "Backend engineer")
+        self.assertEqual(jobs.similar_to("job_submission_1", k=1)[0]["jobId"], "job_submission_3")
+        self.assertIsNone(jobs.similar_to("job_submission_9"))
+
+    def test_sync_is_incremental_and_persistent(self):
+        scorer = WordScorer()
+        jobs = self.make_index(scorer)
+        self.assertEqual(jobs.sync(), {"added": 3, "removed": 0})
+        save_posting(self.data_dir, "job_submission_4", "Product designer", ["figma", "design"])
+        shutil.rmtree(os.path.join(self.data_dir, "job_submission_2"))
+        self.assertEqual(jobs.sync(), {"added": 1, "removed": 1})
+        self.assertEqual(scorer.embedded, 4)
+
+        restarted = WordScorer()
+        reloaded = self.make_index(restarted)
+        self.assertEqual(reloaded.sync(), {"added": 0, "removed": 0})
+        self.assertEqual(restarted.embedded, 0)
+        self.assertEqual(reloaded.similar_to("job_submission_4", k=5)[-1]["jobId"], "job_submission_1")
+        self.assertEqual(reloaded.stats()["postings"], 3)
+
+    def test_queries_do_not_wait_for_a_sync(self):
+        scorer = BlockingScorer()
+        scorer.release.set()
+        jobs = self.make_index(scorer)
+        jobs.sync()
+        scorer.release.clear()
+        save_posting(self.data_dir, "job_submission_4", "Product designer", ["figma", "design"])
+        syncing = threading.Thread(target=jobs.sync)
+        syncing.start()
+        self.addCleanup(syncing.join)
+        self.addCleanup(scorer.release.set)
+        self.assertTrue(scorer.started.wait(5))
+
+        started = time.monotonic()
+        self.assertEqual(jobs.similar_to("job_submission_1", k=1)[0]["jobId"], "job_submission_3")
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(jobs.stats()["postings"], 3)
+
+    def test_first_query_starts_background_syncs(self):
+        jobs = JobIndex(self.data_dir, self.index_path, scorer=WordScorer(), sync_interval=0.05)
+        self.addCleanup(jobs.close)
+        jobs.search("python backend")
+        save_posting(self.data_dir, "job_submission_4", "Product designer", ["figma", "design"])
+        deadline = time.monotonic() + 5
+        while jobs.stats()["postings"] < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(jobs.stats()["postings"], 4)
+        self.assertTrue(os.path.exists(self.index_path))
+
+    def test_similar_to_is_not_ready_before_the_first_sync(self):
+        scorer = BlockingScorer()
+        self.addCleanup(scorer.release.set)
+        jobs = self.make_index(scorer)
+        with self.assertRaises(IndexNotReadyError):
+            jobs.similar_to("job_submission_1")
+        self.assertTrue(scorer.started.wait(5))
+
+        scorer.release.set()
+        deadline = time.monotonic() + 5
+        while jobs.stats()["last_sync_age"] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(jobs.similar_to("job_submission_1", k=1)[0]["jobId"], "job_submission_3")
+        self.assertIsNone(jobs.similar_to("job_submission_9"))
+
+    def test_rebuilds_when_the_model_changes(self):
+        self.make_index().sync()
+        scorer = WordScorer()
+        scorer.namespace = "other-model"
+        self.assertEqual(self.make_index(scorer).sync()["added"], 3)
+
+
+class TestSimilarJobsEndpoint(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        save_posting(directory, "job_submission_1", "Backend engineer", ["python", "backend"])
+        save_posting(directory, "job_submission_2", "Clinic nurse", ["care", "clinic"])
+        app = create_app()
+        self.scorer = WordScorer()
+        app.extensions["job_index"] = JobIndex(directory, "", scorer=self.scorer)
+        app.extensions["job_index"].sync()
+        self.addCleanup(app.extensions["job_index"].close)
+        self.client = app.test_client()
+
+    def test_by_job_id(self):
+        response = self.client.get("/api/similar-jobs?jobId=job_submission_1&k=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["jobId"] for r in response.get_json()["results"]], ["job_submission_2"])
+
+    def test_html_query_makes_no_model_calls(self):
+        posting = ("<h2>Clinic nurse</h2><ul><li>Patient care at our clinic</li></ul>"
+                   "<p>We offer medical, dental and vision insurance.</p>")
+        with mock.patch("resumegpt.services.llm_backends.create_chat_model") as create, \
+                mock.patch.object(JobPost, "parse_job_post") as parse:
+            for _ in range(2):
+                response = self.client.post("/api/similar-jobs", json={"jobHtml": posting, "k": 1})
+                self.assertEqual(response.get_json()["results"][0]["jobId"], "job_submission_2")
+        create.assert_not_called()
+        parse.assert_not_called()
+        self.assertEqual(self.scorer.texts[-1], "Clinic nurse. Patient care at our clinic")
+
+    def test_cold_index_asks_to_retry(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        save_posting(directory, "job_submission_1", "Backend engineer", ["python", "backend"])
+        scorer = BlockingScorer()
+        cold = JobIndex(directory, "", scorer=scorer)
+        self.addCleanup(cold.close)
+        self.addCleanup(scorer.release.set)
+        app = create_app()
+        app.extensions["job_index"] = cold
+        response = app.test_client().get("/api/similar-jobs?jobId=job_submission_1")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "5")
+
+    def test_errors(self):
+        self.assertEqual(self.client.get("/api/similar-jobs?jobId=job_submission_9").status_code, 404)
+        self.assertEqual(self.client.post("/api/similar-jobs", json={}).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
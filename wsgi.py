@@ -1,4 +1,46 @@
-from app import app
+import gc
+import os
+import threading
+
+from resumegpt.app import create_app
+from resumegpt.config.config import Config
+from resumegpt.utils.model_cache import MODEL_CACHE
+
+
+class PerProcessApp:
+    """WSGI entry point that builds the Flask app in the process serving requests.
+
+    With ``gunicorn --preload`` this module is imported in the master, and
+    the app's worker threads, thread pools and LLM clients would not survive
+    the fork into the workers. Only the models are loaded before the fork.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._app = create_app()
+                    self._pid = os.getpid()
+        return self._app
+
+    def __call__(self, environ, start_response):
+        return self.get()(environ, start_response)
+
+
+if Config.MODEL_PRELOAD:
+    # Run with `gunicorn --preload` so this happens once in the master and the
+    # forked workers share the weights copy-on-write
+    MODEL_CACHE.preload()
+    # Keep the collector from writing to the shared objects in every worker
+    gc.freeze()
+    app = PerProcessApp()
+else:
+    app = create_app()
 
 if __name__ == "__main__":
-    app.run() 
\ No newline at end of file
+    (app.get() if isinstance(app, PerProcessApp) else app).run()